@@ -0,0 +1,7 @@
+from consts.manage_images import BLACKSKY_SUB_IMAGE_SIZE
+
+BLACKSKY_BACKGROUND_MODE = "in_memory"
+BLACKSKY_BACKGROUND_STRIP_HEIGHT = 1024
+BLACKSKY_BACKGROUND_OVERVIEW_DECIMATION = 16
+BLACKSKY_BACKGROUND_REFINE_TILE_SIZE = 256
+BLACKSKY_BACKGROUND_CELL_SIZE = BLACKSKY_SUB_IMAGE_SIZE
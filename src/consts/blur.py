@@ -2,3 +2,11 @@ BLACKSKY_LAPLACIAN_THRESHOLD_VALUES = [1000, 2100, 3000]
 BLACKSKY_ROBERT_THRESHOLD_VALUES = [800, 3000, 4000]
 BLACKSKY_SOBEL_THRESHOLD_VALUES = [250, 500, 1500]
 BLACKSKY_BLUR_PERCENTAGE_THRESHOLD_VALUE = 20
+BLACKSKY_BLUR_ENGINE = "per_tile"
+BLACKSKY_BLUR_DECISION = "full"
+BLACKSKY_BLUR_SAMPLING_STRATA = 4
+BLACKSKY_BLUR_SAMPLING_SEED = 0
+BLACKSKY_BLUR_CONFIDENCE_Z_SCORE = 2.576
+BLACKSKY_BLUR_MIN_SAMPLES = 20
+BLACKSKY_BLUR_OPERATOR_PRECISION = "float32"
+BLACKSKY_BLUR_CASCADE = True
@@ -1,2 +1,3 @@
 SLOPE_DIFFERENCE_THRESHOLD_VALUE = 0.25
 BLACKSKY_EPSILON_COEFFICIENT = 0.01
+BLACKSKY_CUTTING_MASK_DECIMATION = 4
@@ -1 +1,2 @@
 BLACKSKY_SUB_IMAGE_SIZE = 150
+BLACKSKY_SNAP_SUB_IMAGE_TO_BLOCK = False
@@ -0,0 +1,4 @@
+POLYGON_ENGINE = "grid"
+POLYGON_SIMPLIFY_TOLERANCE = 0
+POLYGON_SIZE_BUDGET = 1024 * 1024
+POLYGON_FALLBACK = "rle"
@@ -2,3 +2,6 @@ BLACKSKY_SATURATION_THRESHOLD_VALUE = 245
 BLACKSKY_SATURATION_SQUARE_PERCENT = 70
 BLACKSKY_SATURATION_DISRUPTION_PERCENT = 0.05
 BLACKSKY_GRID_SIZE = 8
+BLACKSKY_SATURATION_ENGINE = "grid"
+BLACKSKY_SATURATION_MODE = "strips"
+BLACKSKY_SATURATION_STRIP_HEIGHT = 1024
@@ -6,3 +6,8 @@ BLACKSKY_BLUR_THRESHOLD_VALUE = 1.8
 DECAY_FACTOR = 0.01
 COORDINATES_OF_BLOCK = (50, 50)
 BLOCK_SIZE = (100, 100)
+BLACKSKY_SMEAR_ENGINE = "batched"
+BLACKSKY_SMEAR_FFT_WORKERS = -1
+BLACKSKY_SMEAR_SPECTRAL_BACKEND = "fft"
+BLACKSKY_SMEAR_PARITY_SAMPLES = 8
+BLACKSKY_SMEAR_DECISION = "full"
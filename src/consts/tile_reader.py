@@ -0,0 +1,2 @@
+BLACKSKY_TILE_READER_BACKEND = "memmap"
+BLACKSKY_TILE_PREFETCH_DEPTH = 2
@@ -1,12 +1,17 @@
+import json
+import zlib
 from datetime import datetime
 from typing import Any, Dict
 
 from bson.objectid import ObjectId
+from gridfs import GridFS
 from pymongo import errors
 from pymongo.database import Database
 
+from consts.polygon import POLYGON_FALLBACK, POLYGON_SIMPLIFY_TOLERANCE, POLYGON_SIZE_BUDGET
 from utils.env.get_env import get_env
 from utils.logger.write import get_logger
+from utils.polygon.encoding import encode_polygon
 
 env = get_env()
 logger = get_logger()
@@ -59,8 +64,24 @@ def add_disruption(
         raise ValueError(error_log) from error
     try:
         collection_name = env.collection_name
-        update_mongodb(db, collection_name, {"_id": _id}, {disruption_name: polygon})
+        disruption = disruption_value(db, disruption_name, polygon)
+        update_mongodb(db, collection_name, {"_id": _id}, {disruption_name: disruption})
     except Exception as error:
         error_log = "Failed to add disruptoin"
         logger.error(error_log, exc_info=True)
         raise Exception(error_log) from error
+
+
+def disruption_value(db: Database, disruption_name: str, polygon: Any) -> Any:
+    # Keeps every disruption write under the Mongo document limit: polygons that do not fit
+    # the size budget inline are written to GridFS and the image document keeps a reference.
+    if not isinstance(polygon, dict):
+        return polygon
+    encoded_polygon = encode_polygon(
+        polygon, POLYGON_SIMPLIFY_TOLERANCE, POLYGON_SIZE_BUDGET, POLYGON_FALLBACK
+    )
+    if encoded_polygon is not None:
+        return encoded_polygon
+    file_id = GridFS(db).put(zlib.compress(json.dumps(polygon).encode()), filename=disruption_name)
+    logger.info(f"The {disruption_name} polygon is over the size budget, stored in GridFS")
+    return {"type": "GridFSPolygon", "file_id": file_id}
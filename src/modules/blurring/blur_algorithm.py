@@ -1,25 +1,105 @@
-import os
-from itertools import product
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
 
 import cv2
 import numpy as np
-import rasterio
 
 from db_connections.disruptions_enum import Disruptions
 from db_connections.update_object import add_disruption
-from modules.blurring.laplacian_algorithm import laplacian_data
-from modules.blurring.robert_algorithm import robert_data
-from modules.blurring.sobel_algorithm import sobel_data
+from modules.blurring.blur_cascade import BlurCascade, BlurOperator
+from modules.blurring.laplacian_algorithm import (
+    laplacian_data,
+    laplacian_data_float32,
+    laplacian_grid,
+)
+from modules.blurring.robert_algorithm import robert_data, robert_data_float32, robert_grid
+from modules.blurring.sobel_algorithm import sobel_data, sobel_data_float32, sobel_grid
 from utils.consts.consts_by_satellite_name import get_consts_blur
+from utils.images.background_index import BackgroundIndex
 from utils.images.image_background import is_background_sub_image
-from utils.images.manage_sub_image import extract_sub_image_array
+from utils.images.manage_sub_image import TileReader
+from utils.images.sequential_sampling import SequentialDecision, stratified_order
+from utils.images.tile_mosaic import MosaicBuffers, padded_tile_mosaic
+from utils.images.tile_pipeline import TileDetector, sub_tiles
+from utils.images.tile_plan import detector_tile_size, plan_tiles
 from utils.logger.write import get_logger
 from utils.polygon.polygon import create_polygon
 
 logger = get_logger()
 
 
+class BlurTileDetector(TileDetector):
+    def __init__(
+        self, tile_reader: TileReader, satellite_name: str, background_index: BackgroundIndex
+    ) -> None:
+        super().__init__()
+        self.consts = get_consts_blur(satellite_name)
+        self.consts["sub_image_size"] = detector_tile_size(
+            self.consts["sub_image_size"], self.consts["snap_to_block"], tile_reader.block_shape
+        )
+        self.tile_size = self.consts["sub_image_size"]
+        self.background_index = background_index
+        self.blurred_squares: List[Tuple[Tuple[int, int], Tuple[int, int]]] = []
+        self.sum_pixels = 0
+        self.sum_blurred_pixels = 0
+        self.cascade = None
+        if self.consts["cascade"]:
+            laplacian, robert, sobel = blur_operators(self.consts["operator_precision"])
+            self.cascade = BlurCascade(
+                {"laplacian": laplacian, "robert": robert, "sobel": sobel}, self.consts
+            )
+
+    def check_tile(self, x: int, y: int, color_tile: np.ndarray, gray_tile: np.ndarray) -> None:
+        sub_images = [
+            (sub_x, sub_y, gray_image)
+            for sub_x, sub_y, gray_image in sub_tiles(x, y, gray_tile, self.tile_size)
+            if not is_background_sub_image(
+                self.background_index, sub_x, sub_y, gray_image.shape[1], gray_image.shape[0]
+            )
+        ]
+        if not sub_images:
+            return
+        blurred_tiles = None
+        if self.consts["engine"] == "vectorized":
+            blurred_tiles = detect_blurred_tiles(gray_tile, self.tile_size, self.consts)
+        for sub_x, sub_y, gray_image in sub_images:
+            if blurred_tiles is None and self.cascade is not None:
+                is_blurred = self.cascade.is_blurred(gray_image)
+            elif blurred_tiles is None:
+                is_blurred = detect_blurred_image(gray_image, self.consts)
+            else:
+                is_blurred = blurred_tiles[
+                    (sub_y - y) // self.tile_size, (sub_x - x) // self.tile_size
+                ]
+            sub_image_pixels, sub_image_blur_pixels = count_blur_sub_image(
+                gray_image.shape, sub_x, sub_y, self.blurred_squares, is_blurred
+            )
+            self.sum_pixels += sub_image_pixels
+            self.sum_blurred_pixels += sub_image_blur_pixels
+            if self.is_blur_percentage_exceeded():
+                self.done = True
+                return
+
+    def is_blur_percentage_exceeded(self) -> bool:
+        return (
+            self.sum_pixels > 0
+            and (self.sum_blurred_pixels / self.sum_pixels * 100)
+            > self.consts["percentage_threshold_value"]
+        )
+
+    def report(self, db: Any, image_id: str, image_path: str) -> None:
+        try:
+            number_damaged_pixels = self.sum_blurred_pixels / self.sum_pixels * 100
+            if number_damaged_pixels > self.consts["percentage_threshold_value"]:
+                polygon = create_polygon(self.blurred_squares)
+                add_disruption(db, image_id, Disruptions.BLUR.value, polygon)
+            if self.cascade is not None:
+                logger.info(f"Blur cascade on {image_path}: {self.cascade}")
+            logger.info(f"Blur check passed successfully on {image_path}")
+        except Exception:
+            error_log = f"Failing to check blur in the {image_path}"
+            logger.error(error_log, exc_info=True)
+
+
 def blur_disruption(
     db: Any,
     image_path: str,
@@ -30,20 +110,11 @@ def blur_disruption(
 ) -> None:
     try:
         blurred_squares: List[Tuple[Tuple[int, int], Tuple[int, int]]] = []
-        image_folder, file_name = os.path.split(image_path)
-        image_name, extension = os.path.splitext(file_name)
-        image = rasterio.open(image_path)
-        width, height = image.width, image.height
-        image.close()
         if is_blur_image(
-            image_folder,
-            image_name,
-            extension,
-            width,
-            height,
+            kwargs["tile_reader"],
             blurred_squares,
             satellite_name,
-            kwargs["background_mask"],
+            kwargs["background_index"],
         ):
             polygon = create_polygon(blurred_squares)
             add_disruption(db, image_id, Disruptions.BLUR.value, polygon)
@@ -54,33 +125,48 @@ def blur_disruption(
 
 
 def is_blur_image(
-    image_folder: str,
-    image_name: str,
-    extension: str,
-    width: int,
-    height: int,
+    tile_reader: TileReader,
     blurred_squares: List[Tuple[Tuple[int, int], Tuple[int, int]]],
     satellite_name: str,
-    background_mask: np.ndarray,
+    background_index: BackgroundIndex,
 ) -> bool:
-    sum_pixels = 0
-    sum_blurred_pixels = 0
     consts = get_consts_blur(satellite_name)
-    image_path = os.path.join(image_folder, f"{image_name}{extension}")
-    grid = product(
-        range(0, width, consts["sub_image_size"]),
-        range(0, height, consts["sub_image_size"]),
+    consts["sub_image_size"] = detector_tile_size(
+        consts["sub_image_size"], consts["snap_to_block"], tile_reader.block_shape
+    )
+    grid = plan_tiles(
+        tile_reader.width, tile_reader.height, consts["sub_image_size"], tile_reader.block_shape
     )
+    match consts["decision"]:
+        case "full":
+            return is_blur_by_full_scan(
+                tile_reader, grid, blurred_squares, consts, background_index
+            )
+        case "sequential":
+            return is_blur_by_sampling(
+                tile_reader, list(grid), blurred_squares, consts, background_index
+            )
+        case _:
+            raise ValueError(f"The blur decision: {consts['decision']} is not supported.")
+
+
+def is_blur_by_full_scan(
+    tile_reader: TileReader,
+    grid: Iterable[Tuple[int, int]],
+    blurred_squares: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+    consts: Dict[str, Any],
+    background_index: BackgroundIndex,
+) -> bool:
+    sum_pixels = 0
+    sum_blurred_pixels = 0
     for x, y in grid:
         sub_image_pixels, sub_image_blur_pixels = blur_sub_image_algorithm(
-            image_path,
-            width,
-            height,
+            tile_reader,
             x,
             y,
             blurred_squares,
             consts,
-            background_mask,
+            background_index,
         )
         sum_pixels += sub_image_pixels
         sum_blurred_pixels += sub_image_blur_pixels
@@ -95,29 +181,88 @@ def is_blur_image(
     return number_damaged_pixels > consts["percentage_threshold_value"]
 
 
+def is_blur_by_sampling(
+    tile_reader: TileReader,
+    grid: List[Tuple[int, int]],
+    blurred_squares: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+    consts: Dict[str, Any],
+    background_index: BackgroundIndex,
+) -> bool:
+    # Checks the tiles in a stratified random order and stops as soon as the sample settles the
+    # blurred fraction on one side of the threshold. Only images in the ambiguous band are
+    # scanned completely, and decided by their pixels as in the full scan.
+    sum_pixels = 0
+    sum_blurred_pixels = 0
+    decision = SequentialDecision(
+        consts["percentage_threshold_value"], consts["confidence_z_score"], consts["min_samples"]
+    )
+    order = stratified_order(
+        grid,
+        tile_reader.width,
+        tile_reader.height,
+        consts["sampling_strata"],
+        consts["sampling_seed"],
+    )
+    for x, y in order:
+        sub_image_pixels, sub_image_blur_pixels = blur_sub_image_algorithm(
+            tile_reader,
+            x,
+            y,
+            blurred_squares,
+            consts,
+            background_index,
+        )
+        if not sub_image_pixels:
+            continue
+        sum_pixels += sub_image_pixels
+        sum_blurred_pixels += sub_image_blur_pixels
+        decision.add(sub_image_blur_pixels > 0)
+        if decision.decision is not None:
+            logger.info(
+                f"Blur decided after {decision.samples} of {len(grid)} tiles: {decision.decision}"
+            )
+            return decision.decision
+
+    number_damaged_pixels = sum_blurred_pixels / sum_pixels * 100
+    return number_damaged_pixels > consts["percentage_threshold_value"]
+
+
 def blur_sub_image_algorithm(
-    image_path: str,
-    width: int,
-    height: int,
+    tile_reader: TileReader,
     x: int,
     y: int,
     blurred_squares: List[Tuple[Tuple[int, int], Tuple[int, int]]],
     consts: dict,
-    background_mask: np.ndarray,
+    background_index: BackgroundIndex,
 ) -> Tuple[int, int]:
-    width_sub_image = min(x + consts["sub_image_size"], width) - x
-    height_sub_image = min(y + consts["sub_image_size"], height) - y
-    if is_background_sub_image(background_mask, x, y, width_sub_image, height_sub_image):
+    width_sub_image = min(x + consts["sub_image_size"], tile_reader.width) - x
+    height_sub_image = min(y + consts["sub_image_size"], tile_reader.height) - y
+    if is_background_sub_image(background_index, x, y, width_sub_image, height_sub_image):
         return 0, 0
-    sub_image = extract_sub_image_array(
-        image_path,
-        x,
-        y,
-        width_sub_image,
-        height_sub_image,
-    )
+    sub_image = tile_reader.read(x, y, width_sub_image, height_sub_image)
     gray_image = cv2.cvtColor(sub_image, cv2.COLOR_RGB2GRAY)
+    return check_blur_sub_image(gray_image, x, y, blurred_squares, consts)
+
+
+def check_blur_sub_image(
+    gray_image: np.ndarray,
+    x: int,
+    y: int,
+    blurred_squares: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+    consts: dict,
+) -> Tuple[int, int]:
     is_blurred = detect_blurred_image(gray_image, consts)
+    return count_blur_sub_image(gray_image.shape, x, y, blurred_squares, is_blurred)
+
+
+def count_blur_sub_image(
+    shape: Tuple[int, int],
+    x: int,
+    y: int,
+    blurred_squares: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+    is_blurred: bool,
+) -> Tuple[int, int]:
+    height_sub_image, width_sub_image = shape
     if is_blurred:
         blurred_squares.append([(x, y), (x + width_sub_image, y + height_sub_image)])
         return width_sub_image * height_sub_image, width_sub_image * height_sub_image
@@ -125,7 +270,65 @@ def blur_sub_image_algorithm(
 
 
 def detect_blurred_image(image: np.ndarray, consts: Dict[str, float]) -> bool:
-    blurred_laplacian = laplacian_data(image, consts["laplacian_threshold_values"])
-    blurred_robert = robert_data(image, consts["robert_threshold_values"])
-    blurred_sobel = sobel_data(image, consts["sobel_threshold_values"])
+    laplacian, robert, sobel = blur_operators(consts["operator_precision"])
+    blurred_laplacian = laplacian(image, consts["laplacian_threshold_values"])
+    blurred_robert = robert(image, consts["robert_threshold_values"])
+    blurred_sobel = sobel(image, consts["sobel_threshold_values"])
     return (blurred_laplacian + blurred_robert + blurred_sobel) > 1
+
+
+def blur_operators(operator_precision: str) -> Tuple[BlurOperator, BlurOperator, BlurOperator]:
+    # float32 works on int16 and float32 responses, a quarter to a half of the float64
+    # memory traffic, and gives the same votes up to float rounding.
+    match operator_precision:
+        case "float64":
+            return laplacian_data, robert_data, sobel_data
+        case "float32":
+            return laplacian_data_float32, robert_data_float32, sobel_data_float32
+        case _:
+            raise ValueError(f"The blur operator precision: {operator_precision} is not supported.")
+
+
+def operator_dtype(operator_precision: str) -> type:
+    match operator_precision:
+        case "float64":
+            return np.float64
+        case "float32":
+            return np.float32
+        case _:
+            raise ValueError(f"The blur operator precision: {operator_precision} is not supported.")
+
+
+def detect_blurred_tiles(
+    gray_image: np.ndarray, tile_size: int, consts: Dict[str, Any]
+) -> np.ndarray:
+    # Scores every tile of the image at once. Each row of full tiles shares one operator pass
+    # over a padded mosaic strip; the cut tiles on the right and bottom edges are scored one
+    # by one.
+    height, width = gray_image.shape
+    rows, cols = -(-height // tile_size), -(-width // tile_size)
+    blurred_tiles = np.zeros((rows, cols), dtype=bool)
+    full_rows, full_cols = height // tile_size, width // tile_size
+    if full_rows and full_cols:
+        buffers = MosaicBuffers(
+            (tile_size + 2, full_cols * (tile_size + 2)),
+            operator_dtype(consts["operator_precision"]),
+        )
+        for row in range(full_rows):
+            strip = gray_image[row * tile_size : (row + 1) * tile_size]
+            mosaic = padded_tile_mosaic(strip, tile_size)
+            votes = (
+                laplacian_grid(mosaic, tile_size, consts["laplacian_threshold_values"], buffers)
+                + robert_grid(mosaic, tile_size, consts["robert_threshold_values"], buffers)
+                + sobel_grid(mosaic, tile_size, consts["sobel_threshold_values"], buffers)
+            )
+            blurred_tiles[row, :full_cols] = votes[0] > 1
+    for row in range(rows):
+        for col in range(cols):
+            if row < full_rows and col < full_cols:
+                continue
+            tile = gray_image[
+                row * tile_size : (row + 1) * tile_size, col * tile_size : (col + 1) * tile_size
+            ]
+            blurred_tiles[row, col] = detect_blurred_image(tile, consts)
+    return blurred_tiles
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+BlurOperator = Callable[[np.ndarray, List[float]], int]
+
+# Every voter votes between -1 and 2, and an image is blurred when the votes sum above 1.
+MIN_VOTE = -1
+MAX_VOTE = 2
+BLUR_VOTES_THRESHOLD = 1
+
+
+@dataclass
+class VoterStats:
+    name: str
+    calls: int = 0
+    skips: int = 0
+    seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        if self.calls == 0:
+            return 0
+        return self.seconds / self.calls
+
+    @property
+    def skip_rate(self) -> float:
+        if self.calls + self.skips == 0:
+            return 0
+        return self.skips / (self.calls + self.skips)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: calls={self.calls} skip_rate={self.skip_rate:.1%} "
+            f"mean_ms={self.mean_seconds * 1000:.3f}"
+        )
+
+
+class BlurCascade:
+    # Runs the blur voters cheapest first, by their measured mean cost, and stops as soon as
+    # the remaining votes can no longer move the sum across the threshold either way. The
+    # verdict is always the one detect_blurred_image would give.
+    def __init__(self, voters: Dict[str, BlurOperator], consts: Dict[str, Any]) -> None:
+        self.voters = voters
+        self.consts = consts
+        self.stats = {name: VoterStats(name) for name in voters}
+
+    def is_blurred(self, image: np.ndarray) -> bool:
+        order = sorted(self.voters, key=lambda name: self.stats[name].mean_seconds)
+        votes = 0
+        for index, name in enumerate(order):
+            remaining = len(order) - index
+            if votes + remaining * MIN_VOTE > BLUR_VOTES_THRESHOLD:
+                return self.skip(order[index:], True)
+            if votes + remaining * MAX_VOTE <= BLUR_VOTES_THRESHOLD:
+                return self.skip(order[index:], False)
+            start = perf_counter()
+            votes += self.voters[name](image, self.consts[f"{name}_threshold_values"])
+            self.stats[name].seconds += perf_counter() - start
+            self.stats[name].calls += 1
+        return votes > BLUR_VOTES_THRESHOLD
+
+    def skip(self, names: List[str], is_blurred: bool) -> bool:
+        for name in names:
+            self.stats[name].skips += 1
+        return is_blurred
+
+    def __str__(self) -> str:
+        return ", ".join(str(stats) for stats in self.stats.values())
@@ -1,4 +1,7 @@
-from typing import List
+from typing import List, Tuple
+
+import cv2
+import numpy as np
 
 
 def decide_if_blur(
@@ -15,3 +18,19 @@ def decide_if_blur(
         return 1
     else:
         return 2
+
+
+def decide_if_blur_grid(
+    maximum: np.ndarray, average: np.ndarray, variance: np.ndarray, threshold_values: List[float]
+) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = ((maximum - average) / variance) * 1000
+    votes = np.digitize(values, threshold_values) - 1
+    return np.where(variance == 0, 0, votes)
+
+
+def response_statistics(response: np.ndarray) -> Tuple[float, float, float]:
+    # Maximum, mean and variance of an operator response in two passes over it.
+    _, maximum, _, _ = cv2.minMaxLoc(response)
+    average, standard_deviation = cv2.meanStdDev(response)
+    return maximum, average[0, 0], standard_deviation[0, 0] ** 2
@@ -3,7 +3,8 @@ from typing import List
 import cv2
 import numpy as np
 
-from modules.blurring.is_blur import decide_if_blur
+from modules.blurring.is_blur import decide_if_blur, decide_if_blur_grid, response_statistics
+from utils.images.tile_mosaic import MosaicBuffers, tile_statistics
 
 
 def laplacian_data(image: np.ndarray, threshold_values: List[float]) -> int:
@@ -13,3 +14,19 @@ def laplacian_data(image: np.ndarray, threshold_values: List[float]) -> int:
     average = np.mean(laplacian)
     variance = np.var(laplacian)
     return decide_if_blur(maximum, average, variance, threshold_values)
+
+
+def laplacian_data_float32(image: np.ndarray, threshold_values: List[float]) -> int:
+    # The Laplacian of a uint8 image is an exact int16; the uint8 cast wraps like the
+    # float64 version.
+    laplacian = cv2.Laplacian(image, cv2.CV_16S)
+    laplacian = np.absolute(laplacian).astype(np.uint8)
+    return decide_if_blur(*response_statistics(laplacian), threshold_values)
+
+
+def laplacian_grid(
+    mosaic: np.ndarray, tile_size: int, threshold_values: List[float], buffers: MosaicBuffers
+) -> np.ndarray:
+    laplacian = cv2.Laplacian(mosaic, buffers.depth, dst=buffers.first)
+    laplacian = np.absolute(laplacian, out=laplacian).astype(np.uint8)
+    return decide_if_blur_grid(*tile_statistics(laplacian, tile_size), threshold_values)
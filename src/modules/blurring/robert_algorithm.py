@@ -3,7 +3,8 @@ from typing import List
 import cv2
 import numpy as np
 
-from modules.blurring.is_blur import decide_if_blur
+from modules.blurring.is_blur import decide_if_blur, decide_if_blur_grid, response_statistics
+from utils.images.tile_mosaic import MosaicBuffers, gradient_magnitude, tile_statistics
 
 
 def robert_data(image: np.ndarray, threshold_values: List[float]) -> int:
@@ -16,3 +17,23 @@ def robert_data(image: np.ndarray, threshold_values: List[float]) -> int:
     average = np.mean(robert_result)
     variance = np.var(robert_result)
     return decide_if_blur(maximum, average, variance, threshold_values)
+
+
+def robert_data_float32(image: np.ndarray, threshold_values: List[float]) -> int:
+    kernel_x = np.array([[1, 0], [0, -1]], dtype=np.float32)
+    kernel_y = np.array([[0, 1], [-1, 0]], dtype=np.float32)
+    gradient_x = cv2.filter2D(image, cv2.CV_32F, kernel_x)
+    gradient_y = cv2.filter2D(image, cv2.CV_32F, kernel_y)
+    robert_result = cv2.magnitude(gradient_x, gradient_y, gradient_x)
+    return decide_if_blur(*response_statistics(robert_result), threshold_values)
+
+
+def robert_grid(
+    mosaic: np.ndarray, tile_size: int, threshold_values: List[float], buffers: MosaicBuffers
+) -> np.ndarray:
+    kernel_x = np.array([[1, 0], [0, -1]])
+    kernel_y = np.array([[0, 1], [-1, 0]])
+    gradient_x = cv2.filter2D(mosaic, buffers.depth, kernel_x, dst=buffers.first)
+    gradient_y = cv2.filter2D(mosaic, buffers.depth, kernel_y, dst=buffers.second)
+    robert_result = gradient_magnitude(gradient_x, gradient_y)
+    return decide_if_blur_grid(*tile_statistics(robert_result, tile_size), threshold_values)
@@ -3,7 +3,8 @@ from typing import List
 import cv2
 import numpy as np
 
-from modules.blurring.is_blur import decide_if_blur
+from modules.blurring.is_blur import decide_if_blur, decide_if_blur_grid, response_statistics
+from utils.images.tile_mosaic import MosaicBuffers, gradient_magnitude, tile_statistics
 
 
 def sobel_data(image: np.ndarray, threshold_values: List[float]) -> int:
@@ -14,3 +15,19 @@ def sobel_data(image: np.ndarray, threshold_values: List[float]) -> int:
     average = np.mean(sobel_result)
     variance = np.var(sobel_result)
     return decide_if_blur(maximum, average, variance, threshold_values)
+
+
+def sobel_data_float32(image: np.ndarray, threshold_values: List[float]) -> int:
+    sobelx = cv2.Sobel(image, cv2.CV_32F, 1, 0)
+    sobely = cv2.Sobel(image, cv2.CV_32F, 0, 1)
+    sobel_result = cv2.magnitude(sobelx, sobely, sobelx)
+    return decide_if_blur(*response_statistics(sobel_result), threshold_values)
+
+
+def sobel_grid(
+    mosaic: np.ndarray, tile_size: int, threshold_values: List[float], buffers: MosaicBuffers
+) -> np.ndarray:
+    sobelx = cv2.Sobel(mosaic, buffers.depth, 1, 0, dst=buffers.first)
+    sobely = cv2.Sobel(mosaic, buffers.depth, 0, 1, dst=buffers.second)
+    sobel_result = gradient_magnitude(sobelx, sobely)
+    return decide_if_blur_grid(*tile_statistics(sobel_result, tile_size), threshold_values)
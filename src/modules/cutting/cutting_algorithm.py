@@ -26,7 +26,8 @@ def cutting_disruption(
 ) -> None:
     try:
         consts = get_consts_cutting_image(satellite_name)
-        if is_cut(kwargs["background_mask"], json_file_path, shape, consts):
+        background_mask = kwargs["background_index"].decimated_mask(consts["mask_decimation"])
+        if is_cut(background_mask, json_file_path, shape, consts):
             add_disruption(db, image_id, Disruptions.CUT_IMAGE.value)
         logger.info(f"Cutting check passed successfully on {image_path}")
     except Exception:
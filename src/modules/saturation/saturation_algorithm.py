@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Callable, Dict, List, Tuple, Union
 
 import cv2
 import numpy as np
@@ -7,12 +7,51 @@ from pymongo.database import Database
 
 from db_connections.disruptions_enum import Disruptions
 from db_connections.update_object import add_disruption
-from utils.consts.consts_by_satellite_name import get_consts_saturation
+from utils.consts.consts_by_satellite_name import get_consts_saturation, get_consts_tile_reader
+from utils.images.manage_sub_image import TileReader, open_tile_reader
+from utils.images.summed_area import window_sum
+from utils.images.tile_pipeline import TileDetector, sub_tiles
 from utils.logger.write import get_logger
 from utils.polygon.polygon import create_polygon
 
 logger = get_logger()
 
+SaturationEngine = Callable[..., Tuple[int, List[List[Tuple[int, int]]]]]
+
+
+class SaturationTileDetector(TileDetector):
+    def __init__(self, tile_reader: TileReader, satellite_name: str) -> None:
+        super().__init__()
+        self.consts = get_consts_saturation(satellite_name)
+        self.tile_size = self.consts["grid_size"]
+        self.total_pixels = tile_reader.width * tile_reader.height
+        self.saturated_squares: List[List[Tuple[int, int]]] = []
+        self.sum_saturated_pixels = 0
+        self.rgb_consts = rgb_consts(self.consts)
+
+    def check_tile(self, x: int, y: int, color_tile: np.ndarray, gray_tile: np.ndarray) -> None:
+        if self.consts["engine"] == "grid":
+            saturated_pixels, saturated_squares = saturation_grid(color_tile, self.rgb_consts, x, y)
+            self.sum_saturated_pixels += saturated_pixels
+            self.saturated_squares.extend(saturated_squares)
+            return
+        bgr_tile = color_tile[..., ::-1]
+        for square_x, square_y, square in sub_tiles(x, y, bgr_tile, self.tile_size):
+            self.sum_saturated_pixels += check_saturated_square(
+                square, square_x, square_y, self.saturated_squares, self.consts
+            )
+
+    def report(self, db: Database, image_id: ObjectId, image_path: str) -> None:
+        try:
+            saturation_percentage = percent(self.sum_saturated_pixels, self.total_pixels)
+            if saturation_percentage >= self.consts["disruption_percent"]:
+                polygon = create_polygon(self.saturated_squares)
+                add_disruption(db, image_id, Disruptions.SATURATION.value, polygon)
+            logger.info(f"Saturation check passed successfully on {image_path}")
+        except Exception:
+            error_log = f"Failing to check saturation in the {image_path}"
+            logger.error(error_log, exc_info=True)
+
 
 def saturation_disruption(
     db: Database,
@@ -23,8 +62,19 @@ def saturation_disruption(
     **kwargs: Any,
 ) -> None:
     try:
-        image = cv2.imread(image_path)
-        saturated_image, saturated_squares = saturation_check(image, satellite_name)
+        consts = get_consts_saturation(satellite_name)
+        match consts["mode"]:
+            case "in_memory":
+                image = cv2.imread(image_path)
+                saturated_image, saturated_squares = saturation_check(image, satellite_name)
+            case "strips":
+                backend = get_consts_tile_reader(satellite_name)["backend"]
+                with open_tile_reader(image_path, backend) as tile_reader:
+                    saturated_image, saturated_squares = saturation_check_by_strips(
+                        tile_reader, consts
+                    )
+            case _:
+                raise ValueError(f"The saturation mode: {consts['mode']} is not supported.")
         if saturated_image:
             polygon = create_polygon(saturated_squares)
             add_disruption(db, image_id, Disruptions.SATURATION.value, polygon)
@@ -38,27 +88,116 @@ def saturation_check(
     image: np.ndarray, satellite_name: str
 ) -> Tuple[bool, List[List[Tuple[int, int]]]]:
     consts = get_consts_saturation(satellite_name)
-    saturated_pixels, saturated_squares = saturation_check_use_grid(image, consts)
+    saturated_pixels, saturated_squares = saturation_engine(consts["engine"])(image, consts)
     saturated_image = is_saturation_image(image, saturated_pixels, consts["disruption_percent"])
     return saturated_image, saturated_squares
 
 
+def saturation_check_by_strips(
+    tile_reader: TileReader, consts: Dict[str, Any]
+) -> Tuple[bool, List[List[Tuple[int, int]]]]:
+    # Reads the scene in full-width strips whose height is a multiple of the grid size, so
+    # no square spans two strips and only one strip is held at a time.
+    strip_height = max(consts["strip_height"] // consts["grid_size"], 1) * consts["grid_size"]
+    strip_consts = rgb_consts(consts)
+    check_strip = saturation_engine(consts["engine"])
+    sum_saturated_pixels = 0
+    saturated_squares: List[List[Tuple[int, int]]] = []
+    for y in range(0, tile_reader.height, strip_height):
+        strip = tile_reader.read(0, y, tile_reader.width, min(strip_height, tile_reader.height - y))
+        saturated_pixels, strip_squares = check_strip(strip, strip_consts, 0, y)
+        sum_saturated_pixels += saturated_pixels
+        saturated_squares.extend(strip_squares)
+    saturation_percentage = percent(sum_saturated_pixels, tile_reader.width * tile_reader.height)
+    return saturation_percentage >= consts["disruption_percent"], saturated_squares
+
+
 def saturation_check_use_grid(
-    image: np.ndarray, consts: Dict[str, Union[int, float]]
+    image: np.ndarray, consts: Dict[str, Union[int, float]], x: int = 0, y: int = 0
 ) -> Tuple[int, List[List[Tuple[int, int]]]]:
+    # x and y place the image in the full scene, as in saturation_grid.
     height, width, _ = image.shape
     sum_saturated_pixels = 0
     saturated_squares = []
     coordinates = (
-        (x, y)
-        for y in range(0, height, consts["grid_size"])
-        for x in range(0, width, consts["grid_size"])
+        (square_x, square_y)
+        for square_y in range(0, height, consts["grid_size"])
+        for square_x in range(0, width, consts["grid_size"])
     )
-    for x, y in coordinates:
-        sum_saturated_pixels += saturated_square(image, x, y, saturated_squares, consts)
+    for square_x, square_y in coordinates:
+        sum_saturated_pixels += saturated_square(
+            image, square_x, square_y, saturated_squares, consts
+        )
+    saturated_squares = [
+        [(x1 + x, y1 + y), (x2 + x, y2 + y)] for (x1, y1), (x2, y2) in saturated_squares
+    ]
     return sum_saturated_pixels, saturated_squares
 
 
+def saturation_grid(
+    image: np.ndarray, consts: Dict[str, Any], x: int = 0, y: int = 0
+) -> Tuple[int, List[List[Tuple[int, int]]]]:
+    # saturation_check_use_grid in one pass: the saturated pixels of every square, cut ones on
+    # the edges included, are counted from a summed-area table of the saturation mask. x and y
+    # place the image in the full scene.
+    grid_size = consts["grid_size"]
+    height, width = image.shape[:2]
+    saturated_counts = cv2.integral(saturation_mask(image, consts["threshold_value"]))
+    square_ys = np.arange(0, height, grid_size)[:, np.newaxis]
+    square_xs = np.arange(0, width, grid_size)
+    square_heights = np.minimum(square_ys + grid_size, height) - square_ys
+    square_widths = np.minimum(square_xs + grid_size, width) - square_xs
+    saturated_pixels = window_sum(
+        saturated_counts, square_xs, square_ys, square_widths, square_heights
+    )
+    is_saturated = (
+        saturated_pixels / (square_heights * square_widths) * 100 >= consts["square_percent"]
+    )
+    square_rows, square_cols = np.nonzero(is_saturated)
+    saturated_squares = [
+        [(x + square_x, y + square_y), (x + square_x + grid_size, y + square_y + grid_size)]
+        for square_y, square_x in zip(
+            (square_rows * grid_size).tolist(), (square_cols * grid_size).tolist()
+        )
+    ]
+    return int(saturated_pixels[is_saturated].sum()), saturated_squares
+
+
+def saturation_mask(image: np.ndarray, threshold_value: Any) -> np.ndarray:
+    # 1 where every channel is above its threshold. Integer images go through one cv2.inRange
+    # pass; as it clips its bounds to the image type, thresholds past the largest value are
+    # handled first.
+    thresholds = channel_thresholds(threshold_value)
+    if image.dtype not in (np.uint8, np.uint16):
+        return np.all(image > thresholds, axis=-1).view(np.uint8)
+    largest_value = np.iinfo(image.dtype).max
+    if np.any(thresholds >= largest_value):
+        return np.zeros(image.shape[:2], dtype=np.uint8)
+    lower_bounds = tuple((np.floor(thresholds) + 1).tolist())
+    saturated = cv2.inRange(image, lower_bounds, (largest_value,) * 3)
+    return np.bitwise_and(saturated, 1, out=saturated)
+
+
+def channel_thresholds(threshold_value: Any) -> np.ndarray:
+    return np.broadcast_to(np.asarray(threshold_value, dtype=np.float64), (3,))
+
+
+def rgb_consts(consts: Dict[str, Any]) -> Dict[str, Any]:
+    # The thresholds are given in the BGR order cv2.imread loads the image in, so the grid
+    # engine, which reads tiles in their RGB order, gets them reversed.
+    return dict(consts, threshold_value=channel_thresholds(consts["threshold_value"])[::-1])
+
+
+def saturation_engine(engine: str) -> SaturationEngine:
+    match engine:
+        case "per_square":
+            return saturation_check_use_grid
+        case "grid":
+            return saturation_grid
+        case _:
+            raise ValueError(f"The saturation engine: {engine} is not supported.")
+
+
 def saturated_square(
     image: np.ndarray,
     x: int,
@@ -67,6 +206,16 @@ def saturated_square(
     consts: Dict[str, int],
 ) -> int:
     square = image[y : y + consts["grid_size"], x : x + consts["grid_size"]]
+    return check_saturated_square(square, x, y, saturated_squares, consts)
+
+
+def check_saturated_square(
+    square: np.ndarray,
+    x: int,
+    y: int,
+    saturated_squares: List[List[Tuple[int, int]]],
+    consts: Dict[str, int],
+) -> int:
     saturated_pixels = calculate_saturation(square, consts["threshold_value"])
     if percent(saturated_pixels, square.size / 3) >= consts["square_percent"]:
         saturated_squares.append([(x, y), (x + consts["grid_size"], y + consts["grid_size"])])
@@ -1,11 +1,15 @@
-from typing import Union
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
+import scipy.fft
 
 from consts.smear import BLOCK_SIZE, COORDINATES_OF_BLOCK
 from consts.smear import DECAY_FACTOR as decay_factor
 
+DecayBatch = Callable[[np.ndarray, int], List[Optional[float]]]
+
 
 def compare_decay(image: np.ndarray) -> None:
     general_spectrogram_decay = general_decay(image)
@@ -27,13 +31,21 @@ def spectrogram_FFT(image: np.ndarray) -> np.ndarray:
 
 
 def vertical_decay(spectrogram: np.ndarray) -> np.ndarray:
-    rows, cols = spectrogram.shape
+    rows, cols = spectrogram.shape[-2:]
+    return spectrogram * decay_weights(rows, cols, decay_factor)
+
+
+@lru_cache(maxsize=16)
+def decay_weights(rows: int, cols: int, factor: float) -> np.ndarray:
+    # Almost every tile has the same shape, so the weights are built once per geometry.
+    # The cached array is shared between calls and is therefore read-only.
     vertical_frequencies = np.fft.fftfreq(rows).reshape(-1, 1)
     horizontal_frequencies = np.fft.fftfreq(cols).reshape(1, -1)
-    vertical_decay = 1 / (1 + decay_factor * (vertical_frequencies**2))
-    horizontal_decay = 1 / (1 + decay_factor * (horizontal_frequencies**2))
+    vertical_decay = 1 / (1 + factor * (vertical_frequencies**2))
+    horizontal_decay = 1 / (1 + factor * (horizontal_frequencies**2))
     total_decay = vertical_decay * horizontal_decay
-    return spectrogram * total_decay
+    total_decay.setflags(write=False)
+    return total_decay
 
 
 def block_decay(image: np.ndarray, general_spectrogram: np.ndarray) -> Union[int, np.ndarray]:
@@ -45,3 +57,164 @@ def block_decay(image: np.ndarray, general_spectrogram: np.ndarray) -> Union[int
     resized_spectrogram = cv2.resize(spectrogram, general_spectrogram.shape[::-1])
     decay = vertical_decay(resized_spectrogram)
     return decay
+
+
+def compare_decay_batch(images: np.ndarray, workers: int) -> List[Optional[float]]:
+    # The compare_decay of every image in a (tiles, rows, cols) stack, with one FFT call for
+    # all the general spectrograms and one for all the blocks.
+    general_spectrogram_decay = vertical_decay(spectrogram_FFT_batch(images, workers))
+    x, y = COORDINATES_OF_BLOCK
+    blocks = images[:, y : y + BLOCK_SIZE[1], x : x + BLOCK_SIZE[0]]
+    if blocks.shape[1] == 0:
+        return [None] * len(images)
+    general_shape = general_spectrogram_decay.shape[:0:-1]
+    resized_spectrograms = np.stack(
+        [
+            cv2.resize(spectrogram, general_shape)
+            for spectrogram in spectrogram_FFT_batch(blocks, workers)
+        ]
+    )
+    block_spectrogram_decay = vertical_decay(resized_spectrograms)
+    decay_ratios = np.mean(np.abs(general_spectrogram_decay - block_spectrogram_decay), axis=(1, 2))
+    return decay_ratios.tolist()
+
+
+def spectrogram_FFT_batch(images: np.ndarray, workers: int) -> np.ndarray:
+    # Shifting the magnitudes moves half the bytes of shifting the complex spectrum.
+    spectrograms = np.abs(scipy.fft.fft2(images, axes=(-2, -1), workers=workers))
+    return scipy.fft.fftshift(spectrograms, axes=(-2, -1))
+
+
+def compare_decay_rfft(image: np.ndarray) -> Optional[float]:
+    return compare_decay_rfft_batch(image[np.newaxis], 1)[0]
+
+
+def compare_decay_rfft_batch(images: np.ndarray, workers: int) -> List[Optional[float]]:
+    # Approximates compare_decay_batch on the half spectrum of the real input. The block
+    # spectrum is sampled at the tile's normalized frequencies through cached linear
+    # interpolation maps instead of being resized, and the mirrored half of the spectrum is
+    # counted through the weights.
+    rows, cols = images.shape[1:]
+    x, y = COORDINATES_OF_BLOCK
+    blocks = images[:, y : y + BLOCK_SIZE[1], x : x + BLOCK_SIZE[0]]
+    if blocks.shape[1] == 0:
+        return [None] * len(images)
+    general_spectrograms = half_spectrogram_FFT(images, workers)
+    block_spectrograms = half_spectrogram_FFT(blocks, workers)
+    first_rows, second_rows, row_weights, first_cols, second_cols, col_weights = half_resample_maps(
+        *blocks.shape[1:], rows, cols
+    )
+    resampled_rows = (
+        block_spectrograms[:, first_rows] * (1 - row_weights)
+        + block_spectrograms[:, second_rows] * row_weights
+    )
+    resampled_spectrograms = (
+        resampled_rows[..., first_cols] * (1 - col_weights)
+        + resampled_rows[..., second_cols] * col_weights
+    )
+    differences = np.abs(general_spectrograms - resampled_spectrograms)
+    weights = half_decay_weights(rows, cols, decay_factor)
+    return np.einsum("nij,ij->n", differences, weights).tolist()
+
+
+def half_spectrogram_FFT(images: np.ndarray, workers: int) -> np.ndarray:
+    # The rows are shifted like spectrogram_FFT, the columns keep the rfft2 order from the
+    # zero frequency to the Nyquist one.
+    spectrograms = np.abs(scipy.fft.rfft2(images, axes=(-2, -1), workers=workers))
+    return scipy.fft.fftshift(spectrograms, axes=-2)
+
+
+@lru_cache(maxsize=16)
+def half_decay_weights(rows: int, cols: int, factor: float) -> np.ndarray:
+    # vertical_decay weights of the half spectrum, with every column that stands for its
+    # mirrored one counted twice and the mean over the full spectrum folded in.
+    half_cols = cols // 2 + 1
+    weights = np.fft.ifftshift(decay_weights(rows, cols, factor), axes=1)[:, :half_cols]
+    column_counts = np.full(half_cols, 2.0)
+    column_counts[0] = 1
+    if cols % 2 == 0:
+        column_counts[-1] = 1
+    half_weights = weights * column_counts / (rows * cols)
+    half_weights.setflags(write=False)
+    return half_weights
+
+
+@lru_cache(maxsize=16)
+def half_resample_maps(
+    block_rows: int, block_cols: int, rows: int, cols: int
+) -> Tuple[np.ndarray, ...]:
+    # Neighbour indices and linear weights that sample a half block spectrum at the
+    # normalized frequencies of a half tile spectrum.
+    row_positions = block_rows // 2 + (np.arange(rows) - rows // 2) * block_rows / rows
+    col_positions = np.arange(cols // 2 + 1) * block_cols / cols
+    first_rows, second_rows, row_weights = interpolation_map(row_positions, block_rows)
+    return (
+        first_rows,
+        second_rows,
+        row_weights[:, np.newaxis],
+        *interpolation_map(col_positions, block_cols // 2 + 1),
+    )
+
+
+def interpolation_map(
+    positions: np.ndarray, length: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    positions = np.clip(positions, 0, length - 1)
+    first_indices = np.floor(positions).astype(np.intp)
+    second_indices = np.minimum(first_indices + 1, length - 1)
+    weights = positions - first_indices
+    return first_indices, second_indices, weights
+
+
+def decay_batch_function(spectral_backend: str) -> DecayBatch:
+    match spectral_backend:
+        case "fft":
+            return compare_decay_batch
+        case "rfft":
+            return compare_decay_rfft_batch
+        case _:
+            raise ValueError(f"The smear spectral backend: {spectral_backend} is not supported.")
+
+
+class DecayParityCheck:
+    # Checks the first decay ratios of an image from an approximate backend against
+    # compare_decay and hands the reference ratios back in their place. failed is set once a
+    # ratio lands on the other side of the smear threshold than its reference, since a steady
+    # relative bias only matters where it flips the decision.
+    def __init__(self, samples: int, threshold_value: float) -> None:
+        self.samples_left = samples
+        self.threshold_value = threshold_value
+        self.max_difference = 0.0
+        self.flipped_decisions = 0
+        self.failed = False
+
+    def check(
+        self, images: np.ndarray, decay_ratios: List[Optional[float]]
+    ) -> List[Optional[float]]:
+        checked_ratios = list(decay_ratios)
+        for index in range(min(self.samples_left, len(images))):
+            reference = compare_decay(images[index])
+            self.max_difference = max(
+                self.max_difference, relative_difference(decay_ratios[index], reference)
+            )
+            if is_smeared_decay(decay_ratios[index], self.threshold_value) != is_smeared_decay(
+                reference, self.threshold_value
+            ):
+                self.flipped_decisions += 1
+            checked_ratios[index] = reference
+        self.samples_left = max(self.samples_left - len(images), 0)
+        if self.flipped_decisions:
+            self.failed = True
+        return checked_ratios
+
+
+def is_smeared_decay(decay_ratio: Optional[float], threshold_value: float) -> bool:
+    return bool(decay_ratio) and decay_ratio < threshold_value
+
+
+def relative_difference(decay_ratio: Optional[float], reference: Optional[float]) -> float:
+    if not reference:
+        return 0.0 if not decay_ratio else np.inf
+    if decay_ratio is None:
+        return np.inf
+    return abs(decay_ratio - reference) / reference
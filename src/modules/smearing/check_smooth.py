@@ -1,21 +1,72 @@
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 import cv2
 import numpy as np
 
+from utils.images.summed_area import SummedAreaTable
+from utils.images.tile_mosaic import padded_tile_mosaic
+
+# The 5x5 Sobel and Gaussian kernels reach two pixels past the tile.
+SMOOTH_TILE_BORDER = 2
+
+
+class SmoothnessMap:
+    # The gradient energy, Laplacian variance and Gaussian blur difference of every full tile
+    # of a gray image, read from summed-area tables built in one pass. Every tile is padded on
+    # its own, so the values match the per-tile functions below. The responses are integers
+    # computed in 16 bits, and the Laplacian squares stay below 2**24, so float32 holds them
+    # exactly.
+    def __init__(self, gray_image: np.ndarray, tile_size: int) -> None:
+        self.tile_size = tile_size
+        self.rows = gray_image.shape[0] // tile_size
+        self.cols = gray_image.shape[1] // tile_size
+        if not (self.rows and self.cols):
+            return
+        mosaic = padded_tile_mosaic(gray_image, tile_size, SMOOTH_TILE_BORDER)
+        grad_x = np.abs(cv2.Sobel(mosaic, cv2.CV_16S, 1, 0, ksize=5))
+        grad_y = np.abs(cv2.Sobel(mosaic, cv2.CV_16S, 0, 1, ksize=5))
+        self.gradient = SummedAreaTable(np.add(grad_x, grad_y, out=grad_x))
+        laplacian = cv2.Laplacian(mosaic, cv2.CV_16S)
+        squared_laplacian = np.square(laplacian, dtype=np.float32)
+        self.laplacian = SummedAreaTable(laplacian, squared_laplacian)
+        blurred = cv2.GaussianBlur(mosaic, (5, 5), 0)
+        self.blur_difference = SummedAreaTable(cv2.absdiff(mosaic, blurred))
+
+    def values(self, x: int, y: int) -> Optional[Tuple[float, float, float]]:
+        row, col = y // self.tile_size, x // self.tile_size
+        if row >= self.rows or col >= self.cols:
+            return None
+        padded_size = self.tile_size + 2 * SMOOTH_TILE_BORDER
+        mosaic_x = col * padded_size + SMOOTH_TILE_BORDER
+        mosaic_y = row * padded_size + SMOOTH_TILE_BORDER
+        window = (mosaic_x, mosaic_y, self.tile_size, self.tile_size)
+        return (
+            self.gradient.mean(*window),
+            self.laplacian.variance(*window),
+            self.blur_difference.mean(*window),
+        )
+
 
 def is_smooth_region(image: np.ndarray, consts: Dict[str, float]) -> bool:
     sobel_value = gradient_energy(image)
 
+    if not consts["sobel_value"] <= sobel_value <= consts["sobel_value"] * 2:
+        return sobel_value < consts["sobel_value"]
+
+    laplacian_value = variance_of_laplacian(image)
+    blur_diff = gaussian_blur_difference(image)
+    return decide_if_smooth(sobel_value, laplacian_value, blur_diff, consts)
+
+
+def decide_if_smooth(
+    sobel_value: float, laplacian_value: float, blur_diff: float, consts: Dict[str, float]
+) -> bool:
     if sobel_value < consts["sobel_value"]:
         return True
 
     if sobel_value > consts["sobel_value"] * 2:
         return False
 
-    laplacian_value = variance_of_laplacian(image)
-    blur_diff = gaussian_blur_difference(image)
-
     if laplacian_value < consts["laplacian_value"] and blur_diff < consts["blur_value"]:
         return True
 
@@ -1,24 +1,161 @@
-import os
-from itertools import product
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
-import rasterio
 
 from db_connections.disruptions_enum import Disruptions
 from db_connections.update_object import add_disruption
-from modules.smearing.check_smeared_image import compare_decay
-from modules.smearing.check_smooth import is_smooth_region
+from modules.smearing.check_smeared_image import (
+    DecayParityCheck,
+    compare_decay,
+    compare_decay_batch,
+    decay_batch_function,
+    is_smeared_decay,
+)
+from modules.smearing.check_smooth import SmoothnessMap, decide_if_smooth, is_smooth_region
 from utils.consts.consts_by_satellite_name import get_consts_smear
+from utils.images.background_index import BackgroundIndex
 from utils.images.image_background import is_background_sub_image
-from utils.images.manage_sub_image import extract_sub_image_array
+from utils.images.manage_sub_image import TileReader
+from utils.images.sequential_sampling import BoundedFraction
+from utils.images.tile_pipeline import TileDetector, sub_tiles
+from utils.images.tile_plan import detector_tile_size, plan_tiles
 from utils.logger.write import get_logger
 from utils.polygon.polygon import create_polygon
 
 logger = get_logger()
 
 
+class SmearTileDetector(TileDetector):
+    def __init__(
+        self, tile_reader: TileReader, satellite_name: str, background_index: BackgroundIndex
+    ) -> None:
+        super().__init__()
+        self.consts = get_consts_smear(satellite_name)
+        self.consts["size"] = detector_tile_size(
+            self.consts["size"], self.consts["snap_to_block"], tile_reader.block_shape
+        )
+        self.tile_size = self.consts["size"]
+        self.background_index = background_index
+        self.spectral_backend = self.consts["spectral_backend"]
+        self.parity_check = DecayParityCheck(
+            self.consts["parity_samples"], self.consts["threshold_value"]
+        )
+        self.smeared_squares: List[List[Tuple[int, int]]] = []
+        self.sum_pixels = 0
+        self.sum_smeared_pixels = 0
+        self.checked_sub_images = 0
+        self.avoided_decays = 0
+        self.stops_early = stops_early(self.consts["decision"])
+        self.smear_fraction = BoundedFraction(
+            self.consts["percentage_threshold_value"], tile_reader.width * tile_reader.height
+        )
+
+    def check_tile(self, x: int, y: int, color_tile: np.ndarray, gray_tile: np.ndarray) -> None:
+        sum_pixels, sum_smeared_pixels = self.check_sub_images(x, y, gray_tile)
+        self.sum_pixels += sum_pixels
+        self.sum_smeared_pixels += sum_smeared_pixels
+        if self.stops_early:
+            self.smear_fraction.add(gray_tile.size, sum_pixels, sum_smeared_pixels)
+            self.done = self.smear_fraction.decision is not None
+
+    def check_sub_images(self, x: int, y: int, gray_tile: np.ndarray) -> Tuple[int, int]:
+        sum_pixels = 0
+        sum_smeared_pixels = 0
+        sub_images = [
+            (sub_x, sub_y, gray_image)
+            for sub_x, sub_y, gray_image in sub_tiles(x, y, gray_tile, self.tile_size)
+            if not is_background_sub_image(
+                self.background_index, sub_x, sub_y, gray_image.shape[1], gray_image.shape[0]
+            )
+        ]
+        if not sub_images:
+            return 0, 0
+        smoothness_map = SmoothnessMap(gray_tile, self.tile_size)
+        smoothness = {
+            (sub_x, sub_y): smoothness_map.values(sub_x - x, sub_y - y)
+            for sub_x, sub_y, _ in sub_images
+        }
+        rough_sub_images = [
+            (sub_x, sub_y, gray_image)
+            for sub_x, sub_y, gray_image in sub_images
+            if not is_smooth_tile(smoothness[(sub_x, sub_y)], self.consts)
+        ]
+        self.checked_sub_images += len(sub_images)
+        self.avoided_decays += len(sub_images) - len(rough_sub_images)
+        decays = {}
+        if self.consts["engine"] == "batched":
+            decays = self.batch_decays(rough_sub_images)
+        for sub_x, sub_y, gray_image in sub_images:
+            sub_image_pixels, sub_image_smear_pixels = check_smear_sub_image(
+                gray_image,
+                sub_x,
+                sub_y,
+                self.smeared_squares,
+                self.consts,
+                smoothness[(sub_x, sub_y)],
+                decays.get((sub_x, sub_y)),
+            )
+            sum_pixels += sub_image_pixels
+            sum_smeared_pixels += sub_image_smear_pixels
+        return sum_pixels, sum_smeared_pixels
+
+    def batch_decays(
+        self, sub_images: List[Tuple[int, int, np.ndarray]]
+    ) -> Dict[Tuple[int, int], Optional[float]]:
+        # One FFT call for all the full sub-images of the tile; cut ones are left to
+        # compare_decay.
+        full_sub_images = [
+            (sub_x, sub_y, gray_image)
+            for sub_x, sub_y, gray_image in sub_images
+            if gray_image.shape == (self.tile_size, self.tile_size)
+        ]
+        if not full_sub_images:
+            return {}
+        images = np.stack([gray_image for _, _, gray_image in full_sub_images])
+        if self.spectral_backend == "fft":
+            decay_ratios = compare_decay_batch(images, self.consts["fft_workers"])
+        else:
+            decay_batch = decay_batch_function(self.spectral_backend)
+            decay_ratios = self.check_parity(
+                images, decay_batch(images, self.consts["fft_workers"])
+            )
+        return {
+            (sub_x, sub_y): decay_ratio
+            for (sub_x, sub_y, _), decay_ratio in zip(full_sub_images, decay_ratios)
+        }
+
+    def check_parity(
+        self, images: np.ndarray, decay_ratios: List[Optional[float]]
+    ) -> List[Optional[float]]:
+        decay_ratios = self.parity_check.check(images, decay_ratios)
+        if not self.parity_check.failed:
+            return decay_ratios
+        logger.warning(
+            f"The {self.spectral_backend} smear backend flipped "
+            f"{self.parity_check.flipped_decisions} sampled smear decisions "
+            f"({self.parity_check.max_difference:.1%} off compare_decay), "
+            "using fft for the rest of the image"
+        )
+        self.spectral_backend = "fft"
+        return compare_decay_batch(images, self.consts["fft_workers"])
+
+    def report(self, db: Any, image_id: Any, image_path: str) -> None:
+        try:
+            number_damaged_pixels = self.sum_smeared_pixels / self.sum_pixels * 100
+            if number_damaged_pixels > self.consts["percentage_threshold_value"]:
+                polygon = create_polygon(self.smeared_squares)
+                add_disruption(db, image_id, Disruptions.SMEAR.value, polygon)
+            logger.info(
+                f"The smoothness map avoided the decay FFTs of {self.avoided_decays} of "
+                f"{self.checked_sub_images} smear sub-images in {image_path}"
+            )
+            logger.info(f"Smear check passed successfully on {image_path}")
+        except Exception:
+            error_log = f"Failing to check smear in the {image_path}"
+            logger.error(error_log, exc_info=True)
+
+
 def smear_disruption(
     db: Any,
     image_path: str,
@@ -29,49 +166,32 @@ def smear_disruption(
 ) -> None:
     try:
         smeared_squares: List[List[Tuple[int, int]]] = []
-        image_folder, file_name = os.path.split(image_path)
-        image_name, extension = os.path.splitext(file_name)
-        image = rasterio.open(image_path)
-        width, height = image.width, image.height
-        image.close()
         if is_smear_image(
-            image_folder,
-            image_name,
-            extension,
-            width,
-            height,
+            kwargs["tile_reader"],
             smeared_squares,
             satellite_name,
-            kwargs["background_mask"],
+            kwargs["background_index"],
         ):
             polygon = create_polygon(smeared_squares)
             add_disruption(db, image_id, Disruptions.SMEAR.value, polygon)
-        logger.info(f"Smear check passed successfully on {image_name}")
+        logger.info(f"Smear check passed successfully on {image_path}")
     except Exception:
-        error_log = f"Failing to check smear in the {image_name}"
+        error_log = f"Failing to check smear in the {image_path}"
         logger.error(error_log, exc_info=True)
 
 
 def is_smear_image(
-    image_folder: str,
-    image_name: str,
-    extension: str,
-    width: int,
-    height: int,
+    tile_reader: TileReader,
     smeared_squares: List[List[Tuple[int, int]]],
     satellite_name: str,
-    background_mask: np.ndarray,
+    background_index: BackgroundIndex,
 ) -> bool:
     consts = get_consts_smear(satellite_name)
     sum_smeared_pixels, sum_pixels = arrange_to_send_smear_test(
         consts,
-        image_folder,
-        image_name,
-        extension,
-        width,
-        height,
+        tile_reader,
         smeared_squares,
-        background_mask,
+        background_index,
     )
     number_damaged_pixels = sum_smeared_pixels / sum_pixels * 100
     return number_damaged_pixels > consts["percentage_threshold_value"]
@@ -79,66 +199,110 @@ def is_smear_image(
 
 def arrange_to_send_smear_test(
     consts: Dict[str, float],
-    image_folder: str,
-    image_name: str,
-    extension: str,
-    width: int,
-    height: int,
+    tile_reader: TileReader,
     smeared_squares: List[List[Tuple[int, int]]],
-    background_mask: np.ndarray,
+    background_index: BackgroundIndex,
 ) -> Tuple[int, int]:
     sum_pixels = 0
     sum_smeared_pixels = 0
-    image_path = os.path.join(image_folder, f"{image_name}{extension}")
-    grid = product(range(0, width, consts["size"]), range(0, height, consts["size"]))
+    consts["size"] = detector_tile_size(
+        consts["size"], consts["snap_to_block"], tile_reader.block_shape
+    )
+    grid = plan_tiles(
+        tile_reader.width, tile_reader.height, consts["size"], tile_reader.block_shape
+    )
+    early_exit = stops_early(consts["decision"])
+    smear_fraction = BoundedFraction(
+        consts["percentage_threshold_value"], tile_reader.width * tile_reader.height
+    )
     for x, y in grid:
         sub_image_pixels, sub_image_smear_pixels = smear_sub_image_algorithm(
-            image_path,
-            width,
-            height,
+            tile_reader,
             x,
             y,
             smeared_squares,
             consts,
-            background_mask,
+            background_index,
         )
         sum_pixels += sub_image_pixels
         sum_smeared_pixels += sub_image_smear_pixels
+        if early_exit:
+            scanned_area = (min(x + consts["size"], tile_reader.width) - x) * (
+                min(y + consts["size"], tile_reader.height) - y
+            )
+            smear_fraction.add(scanned_area, sub_image_pixels, sub_image_smear_pixels)
+            if smear_fraction.decision is not None:
+                break
     return sum_smeared_pixels, sum_pixels
 
 
+def stops_early(decision: str) -> bool:
+    # early_exit stops once the smeared fraction is settled either way; full scans every
+    # tile, so the polygon covers every smeared sub-image.
+    match decision:
+        case "full":
+            return False
+        case "early_exit":
+            return True
+        case _:
+            raise ValueError(f"The smear decision: {decision} is not supported.")
+
+
 def smear_sub_image_algorithm(
-    image_path: str,
-    width: int,
-    height: int,
+    tile_reader: TileReader,
     x: int,
     y: int,
     smeared_squares: List[List[Tuple[int, int]]],
     consts: Dict[str, float],
-    background_mask: np.ndarray,
+    background_index: BackgroundIndex,
 ) -> Tuple[int, int]:
-    width_sub_image = min(x + consts["size"], width) - x
-    height_sub_image = min(y + consts["size"], height) - y
+    width_sub_image = min(x + consts["size"], tile_reader.width) - x
+    height_sub_image = min(y + consts["size"], tile_reader.height) - y
 
-    if is_background_sub_image(background_mask, x, y, width_sub_image, height_sub_image):
+    if is_background_sub_image(background_index, x, y, width_sub_image, height_sub_image):
         return 0, 0
-    sub_image = extract_sub_image_array(
-        image_path,
-        x,
-        y,
-        width_sub_image,
-        height_sub_image,
-    )
+    sub_image = tile_reader.read(x, y, width_sub_image, height_sub_image)
     gray_image = cv2.cvtColor(sub_image, cv2.COLOR_RGB2GRAY)
-    is_smeared = detect_smeared_image(gray_image, consts)
+    return check_smear_sub_image(gray_image, x, y, smeared_squares, consts)
+
+
+def check_smear_sub_image(
+    gray_image: np.ndarray,
+    x: int,
+    y: int,
+    smeared_squares: List[List[Tuple[int, int]]],
+    consts: Dict[str, float],
+    smoothness: Optional[Tuple[float, float, float]] = None,
+    decay: Optional[float] = None,
+) -> Tuple[int, int]:
+    height_sub_image, width_sub_image = gray_image.shape
+    is_smeared = detect_smeared_image(gray_image, consts, smoothness, decay)
     if is_smeared:
         smeared_squares.append([(x, y), (x + width_sub_image, y + height_sub_image)])
         return width_sub_image * height_sub_image, width_sub_image * height_sub_image
     return width_sub_image * height_sub_image, 0
 
 
-def detect_smeared_image(image: np.ndarray, consts: Dict[str, float]) -> bool:
-    decay = compare_decay(image)
-    if (not decay) or is_smooth_region(image, consts):
+def detect_smeared_image(
+    image: np.ndarray,
+    consts: Dict[str, float],
+    smoothness: Optional[Tuple[float, float, float]] = None,
+    decay: Optional[float] = None,
+) -> bool:
+    # smoothness and decay hold the tile's precomputed SmoothnessMap values and decay ratio,
+    # when there are any. Smooth tiles are rejected before the FFTs of compare_decay run.
+    if smoothness is None:
+        is_smooth = is_smooth_region(image, consts)
+    else:
+        is_smooth = decide_if_smooth(*smoothness, consts)
+    if is_smooth:
         return False
-    return decay < consts["threshold_value"]
+    if decay is None:
+        decay = compare_decay(image)
+    return is_smeared_decay(decay, consts["threshold_value"])
+
+
+def is_smooth_tile(
+    smoothness: Optional[Tuple[float, float, float]], consts: Dict[str, float]
+) -> bool:
+    return smoothness is not None and decide_if_smooth(*smoothness, consts)
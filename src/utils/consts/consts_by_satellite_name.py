@@ -1,30 +1,55 @@
 from typing import Any, Dict
 
+from consts.background import (
+    BLACKSKY_BACKGROUND_CELL_SIZE,
+    BLACKSKY_BACKGROUND_MODE,
+    BLACKSKY_BACKGROUND_OVERVIEW_DECIMATION,
+    BLACKSKY_BACKGROUND_REFINE_TILE_SIZE,
+    BLACKSKY_BACKGROUND_STRIP_HEIGHT,
+)
 from consts.blur import (
+    BLACKSKY_BLUR_CASCADE,
+    BLACKSKY_BLUR_CONFIDENCE_Z_SCORE,
+    BLACKSKY_BLUR_DECISION,
+    BLACKSKY_BLUR_ENGINE,
+    BLACKSKY_BLUR_MIN_SAMPLES,
+    BLACKSKY_BLUR_OPERATOR_PRECISION,
     BLACKSKY_BLUR_PERCENTAGE_THRESHOLD_VALUE,
+    BLACKSKY_BLUR_SAMPLING_SEED,
+    BLACKSKY_BLUR_SAMPLING_STRATA,
     BLACKSKY_LAPLACIAN_THRESHOLD_VALUES,
     BLACKSKY_ROBERT_THRESHOLD_VALUES,
     BLACKSKY_SOBEL_THRESHOLD_VALUES,
 )
 from consts.cutting import (
+    BLACKSKY_CUTTING_MASK_DECIMATION,
     BLACKSKY_EPSILON_COEFFICIENT,
     SLOPE_DIFFERENCE_THRESHOLD_VALUE,
 )
-from consts.manage_images import BLACKSKY_SUB_IMAGE_SIZE
+from consts.manage_images import BLACKSKY_SNAP_SUB_IMAGE_TO_BLOCK, BLACKSKY_SUB_IMAGE_SIZE
 from consts.satellites import SATELLITES
 from consts.saturation import (
     BLACKSKY_GRID_SIZE,
     BLACKSKY_SATURATION_DISRUPTION_PERCENT,
+    BLACKSKY_SATURATION_ENGINE,
+    BLACKSKY_SATURATION_MODE,
     BLACKSKY_SATURATION_SQUARE_PERCENT,
+    BLACKSKY_SATURATION_STRIP_HEIGHT,
     BLACKSKY_SATURATION_THRESHOLD_VALUE,
 )
 from consts.smear import (
     BLACKSKY_BLUR_THRESHOLD_VALUE,
     BLACKSKY_LAPLACIAN_THRESHOLD_VALUE,
+    BLACKSKY_SMEAR_DECISION,
+    BLACKSKY_SMEAR_ENGINE,
+    BLACKSKY_SMEAR_FFT_WORKERS,
+    BLACKSKY_SMEAR_PARITY_SAMPLES,
     BLACKSKY_SMEAR_PERCENTAGE_THRESHOLD_VALUE,
+    BLACKSKY_SMEAR_SPECTRAL_BACKEND,
     BLACKSKY_SMEAR_THRESHOLD_VALUE,
     BLACKSKY_SOBEL_THRESHOLD_VALUE,
 )
+from consts.tile_reader import BLACKSKY_TILE_PREFETCH_DEPTH, BLACKSKY_TILE_READER_BACKEND
 from utils.logger.write import get_logger
 
 
@@ -33,10 +58,19 @@ def get_consts_blur(satellite_name: str) -> Dict[str, Any]:
         case "BlackSky":
             return {
                 "sub_image_size": BLACKSKY_SUB_IMAGE_SIZE,
+                "snap_to_block": BLACKSKY_SNAP_SUB_IMAGE_TO_BLOCK,
                 "percentage_threshold_value": BLACKSKY_BLUR_PERCENTAGE_THRESHOLD_VALUE,
                 "laplacian_threshold_values": BLACKSKY_LAPLACIAN_THRESHOLD_VALUES,
                 "robert_threshold_values": BLACKSKY_ROBERT_THRESHOLD_VALUES,
                 "sobel_threshold_values": BLACKSKY_SOBEL_THRESHOLD_VALUES,
+                "engine": BLACKSKY_BLUR_ENGINE,
+                "operator_precision": BLACKSKY_BLUR_OPERATOR_PRECISION,
+                "cascade": BLACKSKY_BLUR_CASCADE,
+                "decision": BLACKSKY_BLUR_DECISION,
+                "sampling_strata": BLACKSKY_BLUR_SAMPLING_STRATA,
+                "sampling_seed": BLACKSKY_BLUR_SAMPLING_SEED,
+                "confidence_z_score": BLACKSKY_BLUR_CONFIDENCE_Z_SCORE,
+                "min_samples": BLACKSKY_BLUR_MIN_SAMPLES,
             }
         case _:
             raise Exception("Unsupported satellite.")
@@ -50,6 +84,9 @@ def get_consts_saturation(satellite_name: str) -> Dict[str, Any]:
                 "disruption_percent": BLACKSKY_SATURATION_DISRUPTION_PERCENT,
                 "square_percent": BLACKSKY_SATURATION_SQUARE_PERCENT,
                 "threshold_value": BLACKSKY_SATURATION_THRESHOLD_VALUE,
+                "engine": BLACKSKY_SATURATION_ENGINE,
+                "mode": BLACKSKY_SATURATION_MODE,
+                "strip_height": BLACKSKY_SATURATION_STRIP_HEIGHT,
             }
         case _:
             raise Exception("Unsupported satellite.")
@@ -60,11 +97,17 @@ def get_consts_smear(satellite_name: str) -> Dict[str, Any]:
         case "BlackSky":
             return {
                 "size": BLACKSKY_SUB_IMAGE_SIZE,
+                "snap_to_block": BLACKSKY_SNAP_SUB_IMAGE_TO_BLOCK,
                 "percentage_threshold_value": BLACKSKY_SMEAR_PERCENTAGE_THRESHOLD_VALUE,
                 "threshold_value": BLACKSKY_SMEAR_THRESHOLD_VALUE,
                 "sobel_value": BLACKSKY_SOBEL_THRESHOLD_VALUE,
                 "laplacian_value": BLACKSKY_LAPLACIAN_THRESHOLD_VALUE,
                 "blur_value": BLACKSKY_BLUR_THRESHOLD_VALUE,
+                "engine": BLACKSKY_SMEAR_ENGINE,
+                "fft_workers": BLACKSKY_SMEAR_FFT_WORKERS,
+                "spectral_backend": BLACKSKY_SMEAR_SPECTRAL_BACKEND,
+                "parity_samples": BLACKSKY_SMEAR_PARITY_SAMPLES,
+                "decision": BLACKSKY_SMEAR_DECISION,
             }
         case _:
             raise Exception("Unsupported satellite.")
@@ -76,6 +119,33 @@ def get_consts_cutting_image(satellite_name: str) -> Dict[str, Any]:
             return {
                 "epsilon_coefficient": BLACKSKY_EPSILON_COEFFICIENT,
                 "slope_difference_threshold_value": SLOPE_DIFFERENCE_THRESHOLD_VALUE,
+                "mask_decimation": BLACKSKY_CUTTING_MASK_DECIMATION,
+            }
+        case _:
+            raise Exception("Unsupported satellite.")
+
+
+def get_consts_background(satellite_name: str) -> Dict[str, Any]:
+    match satellite_name:
+        case "BlackSky":
+            return {
+                "mode": BLACKSKY_BACKGROUND_MODE,
+                "strip_height": BLACKSKY_BACKGROUND_STRIP_HEIGHT,
+                "overview_decimation": BLACKSKY_BACKGROUND_OVERVIEW_DECIMATION,
+                "refine_tile_size": BLACKSKY_BACKGROUND_REFINE_TILE_SIZE,
+                "cell_size": BLACKSKY_BACKGROUND_CELL_SIZE,
+                "snap_to_block": BLACKSKY_SNAP_SUB_IMAGE_TO_BLOCK,
+            }
+        case _:
+            raise Exception("Unsupported satellite.")
+
+
+def get_consts_tile_reader(satellite_name: str) -> Dict[str, Any]:
+    match satellite_name:
+        case "BlackSky":
+            return {
+                "backend": BLACKSKY_TILE_READER_BACKEND,
+                "prefetch_depth": BLACKSKY_TILE_PREFETCH_DEPTH,
             }
         case _:
             raise Exception("Unsupported satellite.")
@@ -1,5 +1,6 @@
 import os
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -8,10 +9,15 @@ class EnvVars:
     azure_container_name: str
     collection_name: str
     days_to_delete_logs: str
+    gdal_cachemax: Optional[str]
+    gdal_disable_readdir_on_open: Optional[str]
+    gdal_num_threads: Optional[str]
     logs_path: str
     mongo_database: str
     mongo_uri: str
     num_workers: int
+    vsi_cache: Optional[str]
+    vsi_cache_size: Optional[str]
 
 
 def get_env() -> EnvVars:
@@ -20,8 +26,13 @@ def get_env() -> EnvVars:
         azure_container_name=os.getenv("AZURE_CONTAINER_NAME"),
         collection_name=os.getenv("IMAGES_COLLECTION_NAME"),
         days_to_delete_logs=int(os.getenv("DAYS_TO_DELETE_LOG", "7")),
+        gdal_cachemax=os.getenv("GDAL_CACHEMAX"),
+        gdal_disable_readdir_on_open=os.getenv("GDAL_DISABLE_READDIR_ON_OPEN"),
+        gdal_num_threads=os.getenv("GDAL_NUM_THREADS"),
         logs_path=os.getenv("LOGS_PATH"),
         mongo_database=os.getenv("MONGODB_DATABASE"),
         mongo_uri=os.getenv("MONGO_URI"),
         num_workers=int(os.getenv("NUM_WORKERS", os.cpu_count() * 3 // 4)),
+        vsi_cache=os.getenv("VSI_CACHE"),
+        vsi_cache_size=os.getenv("VSI_CACHE_SIZE"),
     )
@@ -0,0 +1,103 @@
+import numpy as np
+
+UNPACK_ROWS = 64
+
+
+class BackgroundIndex:
+    # Keeps the background mask bit-packed (one bit per pixel) next to a summed-area
+    # table of background pixels per cell, so tile queries on the cell grid are O(1).
+    def __init__(self, height: int, width: int, cell_size: int) -> None:
+        self.height = height
+        self.width = width
+        self.cell_size = cell_size
+        self.packed_mask = np.zeros((height, -(-width // 8)), dtype=np.uint8)
+        self.cell_counts = np.zeros(
+            (-(-height // cell_size), -(-width // cell_size)), dtype=np.int64
+        )
+        self.summed_area_table = np.zeros(
+            (self.cell_counts.shape[0] + 1, self.cell_counts.shape[1] + 1), dtype=np.int64
+        )
+
+    @classmethod
+    def from_mask(cls, background_mask: np.ndarray, cell_size: int) -> "BackgroundIndex":
+        background_index = cls(background_mask.shape[0], background_mask.shape[1], cell_size)
+        background_index.add_strip(0, background_mask)
+        background_index.build()
+        return background_index
+
+    def add_strip(self, row: int, strip_mask: np.ndarray) -> None:
+        strip_height = strip_mask.shape[0]
+        self.packed_mask[row : row + strip_height] = np.packbits(strip_mask, axis=1)
+        column_starts = np.arange(0, self.width, self.cell_size)
+        row_counts = np.add.reduceat(strip_mask, column_starts, axis=1, dtype=np.int64)
+        rows = row + np.arange(strip_height)
+        segment_starts = np.flatnonzero((rows % self.cell_size == 0) | (rows == row))
+        self.cell_counts[rows[segment_starts] // self.cell_size] += np.add.reduceat(
+            row_counts, segment_starts, axis=0
+        )
+
+    def build(self) -> None:
+        self.summed_area_table[1:, 1:] = self.cell_counts.cumsum(axis=0).cumsum(axis=1)
+
+    def background_pixels(self, x: int, y: int, width_sub_image: int, height_sub_image: int) -> int:
+        if self.is_cell_aligned(x, y, width_sub_image, height_sub_image):
+            return self.cell_background_pixels(x, y, width_sub_image, height_sub_image)
+        return int(np.count_nonzero(self.sub_mask(x, y, width_sub_image, height_sub_image)))
+
+    def touches_background(
+        self, x: int, y: int, width_sub_image: int, height_sub_image: int
+    ) -> bool:
+        return self.background_pixels(x, y, width_sub_image, height_sub_image) > 0
+
+    def background_fraction(
+        self, x: int, y: int, width_sub_image: int, height_sub_image: int
+    ) -> float:
+        width_sub_image = min(x + width_sub_image, self.width) - x
+        height_sub_image = min(y + height_sub_image, self.height) - y
+        if width_sub_image <= 0 or height_sub_image <= 0:
+            return 0
+        background_pixels = self.background_pixels(x, y, width_sub_image, height_sub_image)
+        return background_pixels / (width_sub_image * height_sub_image)
+
+    def is_cell_aligned(self, x: int, y: int, width_sub_image: int, height_sub_image: int) -> bool:
+        return (
+            x % self.cell_size == 0
+            and y % self.cell_size == 0
+            and (width_sub_image % self.cell_size == 0 or x + width_sub_image >= self.width)
+            and (height_sub_image % self.cell_size == 0 or y + height_sub_image >= self.height)
+        )
+
+    def cell_background_pixels(
+        self, x: int, y: int, width_sub_image: int, height_sub_image: int
+    ) -> int:
+        first_row, first_col = y // self.cell_size, x // self.cell_size
+        last_row = -(-min(y + height_sub_image, self.height) // self.cell_size)
+        last_col = -(-min(x + width_sub_image, self.width) // self.cell_size)
+        table = self.summed_area_table
+        return int(
+            table[last_row, last_col]
+            - table[first_row, last_col]
+            - table[last_row, first_col]
+            + table[first_row, first_col]
+        )
+
+    def sub_mask(self, x: int, y: int, width_sub_image: int, height_sub_image: int) -> np.ndarray:
+        first_byte = x // 8
+        last_byte = -(-min(x + width_sub_image, self.width) // 8)
+        bits = np.unpackbits(
+            self.packed_mask[y : y + height_sub_image, first_byte:last_byte], axis=1
+        )
+        return bits[:, x - first_byte * 8 :][:, :width_sub_image].astype(bool)
+
+    def mask(self) -> np.ndarray:
+        return np.unpackbits(self.packed_mask, axis=1, count=self.width).astype(bool)
+
+    def decimated_mask(self, decimation: int) -> np.ndarray:
+        # Every decimation-th pixel of every decimation-th row, unpacked a few rows at a time
+        # so the full-size mask is never built.
+        packed_rows = self.packed_mask[::decimation]
+        decimated = np.empty((packed_rows.shape[0], -(-self.width // decimation)), dtype=bool)
+        for row in range(0, packed_rows.shape[0], UNPACK_ROWS):
+            rows = np.unpackbits(packed_rows[row : row + UNPACK_ROWS], axis=1, count=self.width)
+            decimated[row : row + UNPACK_ROWS] = rows[:, ::decimation]
+        return decimated
@@ -0,0 +1,94 @@
+from typing import Iterator, Tuple
+
+import numpy as np
+from rasterio.windows import Window
+
+from utils.images.background_index import BackgroundIndex
+from utils.images.image_background import fill_border_background
+from utils.images.manage_sub_image import TileReader
+
+
+def create_background_index_by_overview(
+    image: TileReader, decimation: int, refine_tile_size: int, cell_size: int
+) -> BackgroundIndex:
+    background_mask = create_background_image_by_overview(image, decimation, refine_tile_size)
+    return BackgroundIndex.from_mask(background_mask, cell_size)
+
+
+def create_background_image_by_overview(
+    image: TileReader, decimation: int, refine_tile_size: int
+) -> np.ndarray:
+    if refine_tile_size < decimation:
+        raise ValueError("The refine tile size must not be smaller than the decimation.")
+    zero_cells, valid_cells = read_overview_cells(image, decimation)
+    valid_image = np.repeat(
+        np.repeat((~zero_cells).astype(np.uint8), decimation, axis=0), decimation, axis=1
+    )[: image.height, : image.width]
+    mixed_tiles = find_mixed_tiles(
+        find_mixed_cells(zero_cells, valid_cells),
+        decimation,
+        image.width,
+        image.height,
+        refine_tile_size,
+    )
+    for window in refine_windows(mixed_tiles, image.width, image.height, refine_tile_size):
+        row_slice, col_slice = window.toslices()
+        valid_image[row_slice, col_slice] = (
+            image.read_gray(window.col_off, window.row_off, window.width, window.height) != 0
+        )
+    return fill_border_background(valid_image)
+
+
+def read_overview_cells(image: TileReader, decimation: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Marks the cells whose gray pixels are all zero and the cells whose gray pixels are all
+    # valid. An averaged overview can not tell either apart: a thin zero channel barely moves
+    # the mean and a few dim pixels round it to zero. GDAL only resamples with min and max in
+    # warps, which would read the averaged overviews as well, so the cell extremes are reduced
+    # from full-resolution strips one cell row high.
+    rows, cols = -(-image.height // decimation), -(-image.width // decimation)
+    zero_cells = np.empty((rows, cols), dtype=bool)
+    valid_cells = np.empty((rows, cols), dtype=bool)
+    column_starts = np.arange(0, image.width, decimation)
+    for row in range(rows):
+        y = row * decimation
+        gray_strip = image.read_gray(0, y, image.width, min(decimation, image.height - y))
+        zero_cells[row] = np.maximum.reduceat(gray_strip.max(axis=0), column_starts) == 0
+        valid_cells[row] = np.minimum.reduceat(gray_strip.min(axis=0), column_starts) > 0
+    return zero_cells, valid_cells
+
+
+def find_mixed_cells(zero_cells: np.ndarray, valid_cells: np.ndarray) -> np.ndarray:
+    # Every other cell holds both zero and valid pixels and is refined at full resolution.
+    return ~(zero_cells | valid_cells)
+
+
+def find_mixed_tiles(
+    mixed_cells: np.ndarray, decimation: int, width: int, height: int, refine_tile_size: int
+) -> np.ndarray:
+    # A cell is never larger than a refine tile, so it spans at most two tiles on each axis.
+    mixed_tiles = np.zeros(
+        (-(-height // refine_tile_size), -(-width // refine_tile_size)), dtype=bool
+    )
+    cell_rows, cell_cols = np.nonzero(mixed_cells)
+    first_rows, last_rows = cell_tile_range(cell_rows, decimation, height, refine_tile_size)
+    first_cols, last_cols = cell_tile_range(cell_cols, decimation, width, refine_tile_size)
+    for tile_rows in (first_rows, last_rows):
+        for tile_cols in (first_cols, last_cols):
+            mixed_tiles[tile_rows, tile_cols] = True
+    return mixed_tiles
+
+
+def cell_tile_range(
+    cells: np.ndarray, decimation: int, size: int, refine_tile_size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    first_pixels = cells * decimation
+    last_pixels = np.minimum((cells + 1) * decimation, size) - 1
+    return first_pixels // refine_tile_size, last_pixels // refine_tile_size
+
+
+def refine_windows(
+    mixed_tiles: np.ndarray, width: int, height: int, refine_tile_size: int
+) -> Iterator[Window]:
+    for tile_row, tile_col in zip(*np.nonzero(mixed_tiles)):
+        x, y = tile_col * refine_tile_size, tile_row * refine_tile_size
+        yield Window(x, y, min(refine_tile_size, width - x), min(refine_tile_size, height - y))
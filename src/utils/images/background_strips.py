@@ -0,0 +1,108 @@
+from typing import Iterator, List, Tuple
+
+import cv2
+import numpy as np
+
+from utils.images.background_index import BackgroundIndex
+from utils.images.manage_sub_image import TileReader
+
+
+def create_background_image_by_strips(image: TileReader, strip_height: int) -> np.ndarray:
+    background_mask = np.zeros((image.height, image.width), dtype=bool)
+    for row, strip_mask in background_strips(image, strip_height):
+        background_mask[row : row + strip_mask.shape[0]] = strip_mask
+    return background_mask
+
+
+def create_background_index_by_strips(
+    image: TileReader, strip_height: int, cell_size: int
+) -> BackgroundIndex:
+    background_index = BackgroundIndex(image.height, image.width, cell_size)
+    for row, strip_mask in background_strips(image, strip_height):
+        background_index.add_strip(row, strip_mask)
+    background_index.build()
+    return background_index
+
+
+def background_strips(image: TileReader, strip_height: int) -> Iterator[Tuple[int, np.ndarray]]:
+    is_background_label = label_background_strips(image, strip_height)
+    offset = 0
+    for row in range(0, image.height, strip_height):
+        labels, number_of_labels = label_zero_strip(read_gray_strip(image, row, strip_height))
+        strip_lookup = np.zeros(number_of_labels, dtype=bool)
+        strip_lookup[1:] = is_background_label[offset : offset + number_of_labels - 1]
+        offset += number_of_labels - 1
+        yield row, strip_lookup[labels]
+
+
+def label_background_strips(image: TileReader, strip_height: int) -> np.ndarray:
+    seam_edges: List[np.ndarray] = []
+    border_labels: List[np.ndarray] = []
+    previous_row_labels = None
+    offset = 0
+    for row in range(0, image.height, strip_height):
+        labels, number_of_labels = label_zero_strip(read_gray_strip(image, row, strip_height))
+        global_labels = np.where(labels > 0, labels + offset - 1, -1)
+        border_labels.append(strip_border_labels(global_labels, row, strip_height, image.height))
+        if previous_row_labels is not None:
+            seam_edges.append(strip_seam_edges(previous_row_labels, global_labels[0]))
+        previous_row_labels = global_labels[-1]
+        offset += number_of_labels - 1
+    parents = union_seam_edges(offset, seam_edges)
+    is_background_root = np.zeros(offset, dtype=bool)
+    is_background_root[parents[np.concatenate(border_labels)]] = True
+    return is_background_root[parents]
+
+
+def read_gray_strip(image: TileReader, row: int, strip_height: int) -> np.ndarray:
+    return image.read_gray(0, row, image.width, min(strip_height, image.height - row))
+
+
+def label_zero_strip(gray_strip: np.ndarray) -> Tuple[np.ndarray, int]:
+    number_of_labels, labels = cv2.connectedComponents(
+        (gray_strip == 0).astype(np.uint8), connectivity=4, ltype=cv2.CV_32S
+    )
+    return labels, number_of_labels
+
+
+def strip_border_labels(
+    global_labels: np.ndarray, row: int, strip_height: int, height: int
+) -> np.ndarray:
+    border = [global_labels[:, 0], global_labels[:, -1]]
+    if row == 0:
+        border.append(global_labels[0])
+    if row + strip_height >= height:
+        border.append(global_labels[-1])
+    border_labels = np.concatenate(border)
+    return np.unique(border_labels[border_labels >= 0])
+
+
+def strip_seam_edges(upper_row_labels: np.ndarray, lower_row_labels: np.ndarray) -> np.ndarray:
+    connected = (upper_row_labels >= 0) & (lower_row_labels >= 0)
+    edges = np.stack([upper_row_labels[connected], lower_row_labels[connected]], axis=1)
+    return np.unique(edges, axis=0)
+
+
+def union_seam_edges(number_of_labels: int, seam_edges: List[np.ndarray]) -> np.ndarray:
+    parents = np.arange(number_of_labels, dtype=np.int64)
+    for edges in seam_edges:
+        for label_a, label_b in edges:
+            root_a, root_b = find_root(parents, label_a), find_root(parents, label_b)
+            if root_a != root_b:
+                parents[max(root_a, root_b)] = min(root_a, root_b)
+    return resolve_roots(parents)
+
+
+def find_root(parents: np.ndarray, label: int) -> int:
+    while parents[label] != label:
+        parents[label] = parents[parents[label]]
+        label = parents[label]
+    return label
+
+
+def resolve_roots(parents: np.ndarray) -> np.ndarray:
+    while True:
+        grandparents = parents[parents]
+        if np.array_equal(grandparents, parents):
+            return parents
+        parents = grandparents
@@ -0,0 +1,87 @@
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import rasterio
+from rasterio.env import get_gdal_config
+
+from utils.env.get_env import EnvVars, get_env
+from utils.logger.write import get_logger
+
+logger = get_logger()
+
+# Each option is read from the EnvVars field with the same name in lower case.
+GDAL_OPTION_NAMES = (
+    "GDAL_CACHEMAX",
+    "GDAL_DISABLE_READDIR_ON_OPEN",
+    "GDAL_NUM_THREADS",
+    "VSI_CACHE",
+    "VSI_CACHE_SIZE",
+)
+
+MEMORY_UNITS = {"KB": 1024, "MB": 1024**2, "GB": 1024**3, "TB": 1024**4}
+
+
+def get_gdal_options(env: EnvVars) -> Dict[str, str]:
+    options = {name: getattr(env, name.lower()) for name in GDAL_OPTION_NAMES}
+    return {name: value for name, value in options.items() if value}
+
+
+def get_rasterio_options(options: Dict[str, str]) -> Dict[str, Any]:
+    rasterio_options: Dict[str, Any] = dict(options)
+    if "GDAL_CACHEMAX" in options:
+        # rasterio hands GDAL_CACHEMAX to GDALSetCacheMax64, which expects bytes.
+        cachemax_bytes = gdal_cachemax_bytes(options["GDAL_CACHEMAX"])
+        if cachemax_bytes is None:
+            logger.warning(
+                f"Ignoring GDAL_CACHEMAX={options['GDAL_CACHEMAX']}, GDAL keeps its default cache"
+            )
+            del rasterio_options["GDAL_CACHEMAX"]
+        else:
+            rasterio_options["GDAL_CACHEMAX"] = cachemax_bytes
+    return rasterio_options
+
+
+def gdal_cachemax_bytes(cachemax: str) -> Optional[int]:
+    # Follows GDAL's own reading of the option: a percentage of the physical memory, a size
+    # with a KB/MB/GB/TB unit, megabytes below 100000, bytes otherwise. None when the value
+    # is none of these.
+    value = cachemax.strip().upper()
+    try:
+        if value.endswith("%"):
+            physical_memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+            return int(physical_memory * float(value[:-1]) / 100)
+        if value[-2:] in MEMORY_UNITS:
+            return int(float(value[:-2]) * MEMORY_UNITS[value[-2:]])
+        cache_size = int(value)
+    except ValueError:
+        return None
+    if cache_size < 100000:
+        return cache_size * 1024 * 1024
+    return cache_size
+
+
+@contextmanager
+def gdal_env(process_name: str) -> Iterator[Dict[str, str]]:
+    options = get_gdal_options(get_env())
+    with rasterio.Env(**get_rasterio_options(options)):
+        effective_options = {name: get_gdal_config(name) for name in GDAL_OPTION_NAMES}
+        logger.info(f"GDAL settings for {process_name}: {effective_options}")
+        yield options
+
+
+@contextmanager
+def gdal_config_options(options: Dict[str, str]) -> Iterator[None]:
+    # osgeo.gdal keeps its own configuration, so the options rasterio.Env applies are
+    # set there too for the translate and restored afterwards. osgeo is imported here so
+    # only the NTF conversion depends on it.
+    from osgeo import gdal
+
+    previous_options = {name: gdal.GetConfigOption(name) for name in options}
+    for name, value in options.items():
+        gdal.SetConfigOption(name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous_options.items():
+            gdal.SetConfigOption(name, value)
@@ -1,28 +1,48 @@
 from collections import deque
 from typing import Deque, Tuple
 
+import cv2
 import numpy as np
 
+from utils.images.background_index import BackgroundIndex
+
 
 def is_background_sub_image(
-    background_mask: np.ndarray,
+    background_index: BackgroundIndex,
     x: int,
     y: int,
     width_sub_image: int,
     height_sub_image: int,
 ) -> bool:
-    sub = background_mask[y : y + height_sub_image, x : x + width_sub_image]
-    return np.any(sub)
+    return background_index.touches_background(x, y, width_sub_image, height_sub_image)
+
+
+def create_background_image(image: np.ndarray, engine: str = "labeling") -> np.ndarray:
+    match engine:
+        case "labeling":
+            return fill_border_background(image)
+        case "flood_fill":
+            return create_background_image_by_flood_fill(image)
+        case _:
+            raise ValueError(f"The background engine: {engine} is not supported.")
+
+
+def fill_border_background(image: np.ndarray) -> np.ndarray:
+    # A zero frame around the image joins every border-connected zero region to the
+    # corner, so a single 4-connected fill from there marks the whole background.
+    filled_image = np.pad((image != 0).astype(np.uint8), 1, constant_values=0)
+    cv2.floodFill(filled_image, None, (0, 0), 2, 0, 0, 4)
+    return filled_image[1:-1, 1:-1] == 2
 
 
-def create_background_image(image: np.ndarray) -> np.ndarray:
+def create_background_image_by_flood_fill(image: np.ndarray) -> np.ndarray:
     background_mask = np.zeros_like(image, dtype=np.uint8)
     queue: Deque[Tuple[int, int]] = deque()
 
     add_border_background_pixels(image, background_mask, queue)
     flood_fill_background(image, background_mask, queue)
 
-    return background_mask
+    return background_mask == 1
 
 
 def add_border_background_pixels(
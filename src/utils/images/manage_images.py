@@ -1,5 +1,6 @@
 import os
 import re
+from functools import partial
 from typing import Any, Dict, Tuple
 
 import cv2
@@ -8,20 +9,39 @@ from bson.objectid import ObjectId
 from pymongo.database import Database
 
 from db_connections.update_object import add_end_date_value
-from modules.blurring.blur_algorithm import blur_disruption
+from modules.blurring.blur_algorithm import BlurTileDetector, blur_disruption
 from modules.cutting.cutting_algorithm import cutting_disruption
-from modules.saturation.saturation_algorithm import saturation_disruption
-from modules.smearing.smear_algorithm import smear_disruption
-from utils.consts.consts_by_satellite_name import get_satellite_details
+from modules.saturation.saturation_algorithm import SaturationTileDetector
+from modules.smearing.smear_algorithm import SmearTileDetector
+from utils.consts.consts_by_satellite_name import (
+    get_consts_background,
+    get_consts_blur,
+    get_consts_tile_reader,
+    get_satellite_details,
+)
 from utils.files.extract_value import get_company_by_folder_name
 from utils.files.manage_folders import (
     get_metadata_json_file,
     get_ntf_file_and_folder_path,
     remove_file,
 )
-from utils.images.convert_image import convert_image_to_8_bit, convert_ntf_to_tif
+from utils.images.background_index import BackgroundIndex
+from utils.images.background_overview import create_background_index_by_overview
+from utils.images.background_strips import create_background_index_by_strips
+from utils.images.convert_image import (
+    convert_image_to_8_bit,
+    convert_ntf_to_tif,
+)
+from utils.images.gdal_config import gdal_config_options, gdal_env
 from utils.images.image_background import create_background_image
 from utils.images.insert_image import insert_image_to_mongo
+from utils.images.manage_sub_image import TileReader, open_tile_reader
+from utils.images.tile_pipeline import (
+    create_tile_detectors,
+    report_tile_detectors,
+    run_tile_pipeline,
+)
+from utils.images.tile_plan import detector_tile_size
 from utils.logger.write import get_logger
 
 logger = get_logger()
@@ -44,8 +64,10 @@ def convert_ntf_image(folder_path: str) -> Tuple[str, str]:
         else:
             temp_tif_image = os.path.join(folder_path, f"{image_name}-temp.tif")
             output_tif_image = os.path.join(folder_path, f"{image_name}.tif")
-            convert_ntf_to_tif(os.path.join(folder_path, input_ntf_image), temp_tif_image)
-            convert_image_to_8_bit(temp_tif_image, output_tif_image)
+            with gdal_env(f"converting {input_ntf_image}") as gdal_options:
+                with gdal_config_options(gdal_options):
+                    convert_ntf_to_tif(os.path.join(folder_path, input_ntf_image), temp_tif_image)
+                convert_image_to_8_bit(temp_tif_image, output_tif_image)
             remove_file(temp_tif_image)
             return f"{image_name}.tif", output_tif_image
     except Exception as error:
@@ -113,26 +135,71 @@ def send_to_check_disruptions(
     json_file_path: str,
     image_shape: Any,
 ) -> None:
-    image = load_image(image_path)
-    background_mask = create_background_image(image) == 1
-    for disruption in [
-        blur_disruption,
-        smear_disruption,
-        saturation_disruption,
-        cutting_disruption,
-    ]:
-        try:
-            disruption(
+    tile_reader_consts = get_consts_tile_reader(satellite_name)
+    with gdal_env(f"checking {image_path}"):
+        with open_tile_reader(image_path, tile_reader_consts["backend"]) as tile_reader:
+            background_index = create_background_index(image_path, satellite_name, tile_reader)
+            # A sequential blur decision samples tiles in its own order, outside the pipeline.
+            blur_in_pipeline = get_consts_blur(satellite_name)["decision"] == "full"
+            detector_factories = [
+                partial(SmearTileDetector, tile_reader, satellite_name, background_index),
+                partial(SaturationTileDetector, tile_reader, satellite_name),
+            ]
+            if blur_in_pipeline:
+                detector_factories.insert(
+                    0, partial(BlurTileDetector, tile_reader, satellite_name, background_index)
+                )
+            detectors = create_tile_detectors(image_path, detector_factories)
+            try:
+                run_tile_pipeline(tile_reader, detectors, tile_reader_consts["prefetch_depth"])
+                report_tile_detectors(db, mongo_image_id, image_path, detectors)
+            except Exception:
+                error_log = f"Failing to run the tile checks on {image_path}"
+                logger.error(error_log, exc_info=True)
+            if not blur_in_pipeline:
+                blur_disruption(
+                    db,
+                    image_path,
+                    mongo_image_id,
+                    satellite_name,
+                    tile_reader=tile_reader,
+                    background_index=background_index,
+                )
+            cutting_disruption(
                 db,
                 image_path,
                 mongo_image_id,
                 satellite_name,
                 json_file_path,
                 image_shape,
-                background_mask=background_mask,
+                background_index=background_index,
             )
-        except Exception:
-            continue
+
+
+def create_background_index(
+    image_path: str, satellite_name: str, tile_reader: TileReader
+) -> BackgroundIndex:
+    consts = get_consts_background(satellite_name)
+    consts["cell_size"] = detector_tile_size(
+        consts["cell_size"], consts["snap_to_block"], tile_reader.block_shape
+    )
+    match consts["mode"]:
+        case "in_memory":
+            background_mask = create_background_image(load_image(image_path))
+            return BackgroundIndex.from_mask(background_mask, consts["cell_size"])
+        case "strips":
+            return create_background_index_by_strips(
+                tile_reader, consts["strip_height"], consts["cell_size"]
+            )
+        case "overview":
+            return create_background_index_by_overview(
+                tile_reader,
+                consts["overview_decimation"],
+                consts["refine_tile_size"],
+                consts["cell_size"],
+            )
+        case _:
+            raise ValueError(f"The background mode: {consts['mode']} is not supported.")
 
 
 def load_image(image_path: str) -> np.ndarray:
@@ -1,5 +1,11 @@
+from types import TracebackType
+from typing import Optional, Tuple, Type
+
+import cv2
 import numpy as np
 import rasterio
+from rasterio.enums import Interleaving
+from rasterio.io import DatasetReader
 from rasterio.windows import Window
 
 from utils.logger.write import get_logger
@@ -7,16 +13,226 @@ from utils.logger.write import get_logger
 logger = get_logger()
 
 
-def extract_sub_image_array(
-    img_path: str, x: int, y: int, width_size: int, height_size: int
-) -> np.uint8:
-    try:
-        with rasterio.open(img_path) as src_image:
-            window = Window(x, y, width_size, height_size)
-            sub_image = src_image.read([1, 2, 3], window=window)
-            sub_image = np.transpose(sub_image, (1, 2, 0))
-        return sub_image
-    except Exception as error:
-        error_log = "An error occurred when extracting sub-image array"
-        logger.error(error_log, exc_info=True)
-        raise Exception(error_log) from error
+class TileReader:
+    # Holds one open dataset for the whole image check and reads every window into a
+    # reused pixel-interleaved (height, width, band) buffer.
+    def __init__(self, image_path: str, tile_size: int = 0) -> None:
+        self.image_path = image_path
+        self.tile_size = tile_size
+        self.dataset = None
+        self.buffer = np.empty((0, 0, 3), dtype=np.uint8)
+
+    def __enter__(self) -> "TileReader":
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def open(self) -> None:
+        try:
+            self.dataset = rasterio.open(self.image_path)
+            self.buffer = np.empty(
+                (self.tile_size, self.tile_size, 3), dtype=self.dataset.dtypes[0]
+            )
+        except Exception as error:
+            error_log = f"Failed to open {self.image_path} for reading tiles"
+            logger.error(error_log, exc_info=True)
+            raise Exception(error_log) from error
+
+    def close(self) -> None:
+        if self.dataset is not None:
+            self.dataset.close()
+            self.dataset = None
+
+    @property
+    def width(self) -> int:
+        return self.dataset.width
+
+    @property
+    def height(self) -> int:
+        return self.dataset.height
+
+    @property
+    def block_shape(self) -> Tuple[int, int]:
+        return self.dataset.block_shapes[0]
+
+    def read(
+        self,
+        x: int,
+        y: int,
+        width_size: int,
+        height_size: int,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        try:
+            sub_image = self.tile_buffer(width_size, height_size) if out is None else out
+            self.read_window(x, y, width_size, height_size, sub_image)
+            return sub_image
+        except Exception as error:
+            error_log = "An error occurred when extracting sub-image array"
+            logger.error(error_log, exc_info=True)
+            raise Exception(error_log) from error
+
+    def read_window(
+        self, x: int, y: int, width_size: int, height_size: int, sub_image: np.ndarray
+    ) -> None:
+        self.dataset.read(
+            [1, 2, 3],
+            window=Window(x, y, width_size, height_size),
+            out=sub_image.transpose(2, 0, 1),
+        )
+
+    def read_band(self, band: int, x: int, y: int, width_size: int, height_size: int) -> np.ndarray:
+        return self.dataset.read(band, window=Window(x, y, width_size, height_size))
+
+    def read_gray(self, x: int, y: int, width_size: int, height_size: int) -> np.ndarray:
+        if self.dataset.count < 3:
+            return self.read_band(1, x, y, width_size, height_size)
+        return cv2.cvtColor(self.read(x, y, width_size, height_size), cv2.COLOR_RGB2GRAY)
+
+    def tile_buffer(self, width_size: int, height_size: int) -> np.ndarray:
+        if self.buffer.shape[0] < height_size or self.buffer.shape[1] < width_size:
+            self.buffer = np.empty(
+                (
+                    max(self.buffer.shape[0], height_size),
+                    max(self.buffer.shape[1], width_size),
+                    3,
+                ),
+                dtype=self.buffer.dtype,
+            )
+        return self.buffer[:height_size, :width_size]
+
+
+class MemmapTileReader(TileReader):
+    # Serves windows of uncompressed band-interleaved GeoTIFFs, such as the ones
+    # convert_ntf_to_tif writes, straight from the file through np.memmap block views.
+    # Any other layout is read through rasterio by TileReader.
+    def __init__(self, image_path: str, tile_size: int = 0) -> None:
+        super().__init__(image_path, tile_size)
+        self.file_map = None
+        self.block_offsets = None
+        self.block_rows = None
+        self.block_dtype = None
+
+    def open(self) -> None:
+        super().open()
+        try:
+            block_layout = read_block_layout(self.dataset)
+        except Exception:
+            warning_log = f"Failed to map {self.image_path}, reading it through rasterio"
+            logger.warning(warning_log, exc_info=True)
+            block_layout = None
+        if block_layout is not None:
+            self.block_offsets, self.block_rows, self.block_dtype = block_layout
+            self.file_map = np.memmap(self.image_path, dtype=np.uint8, mode="r")
+
+    def close(self) -> None:
+        self.file_map = None
+        self.block_offsets = None
+        self.block_rows = None
+        super().close()
+
+    @property
+    def is_memory_mapped(self) -> bool:
+        return self.file_map is not None
+
+    def block_view(self, band: int, block_row: int, block_col: int) -> np.ndarray:
+        block_width = self.block_shape[1]
+        offset = self.block_offsets[band - 1, block_row, block_col]
+        rows = self.block_rows[band - 1, block_row, block_col]
+        number_of_bytes = rows * block_width * self.block_dtype.itemsize
+        block = self.file_map[offset : offset + number_of_bytes]
+        return block.view(self.block_dtype).reshape(rows, block_width)
+
+    def read_window(
+        self, x: int, y: int, width_size: int, height_size: int, sub_image: np.ndarray
+    ) -> None:
+        if not self.is_memory_mapped:
+            super().read_window(x, y, width_size, height_size, sub_image)
+            return
+        for band in range(1, 4):
+            self.copy_window(band, x, y, width_size, height_size, sub_image[..., band - 1])
+
+    def read_band(self, band: int, x: int, y: int, width_size: int, height_size: int) -> np.ndarray:
+        if not self.is_memory_mapped:
+            return super().read_band(band, x, y, width_size, height_size)
+        block_height, block_width = self.block_shape
+        block_row, block_col = y // block_height, x // block_width
+        if (y + height_size - 1) // block_height == block_row and (
+            x + width_size - 1
+        ) // block_width == block_col:
+            block_y, block_x = y - block_row * block_height, x - block_col * block_width
+            return self.block_view(band, block_row, block_col)[
+                block_y : block_y + height_size, block_x : block_x + width_size
+            ]
+        band_image = np.empty((height_size, width_size), dtype=self.block_dtype)
+        self.copy_window(band, x, y, width_size, height_size, band_image)
+        return band_image
+
+    def copy_window(
+        self, band: int, x: int, y: int, width_size: int, height_size: int, out: np.ndarray
+    ) -> None:
+        block_height, block_width = self.block_shape
+        for block_row in range(y // block_height, (y + height_size - 1) // block_height + 1):
+            first_row = max(y, block_row * block_height)
+            last_row = min(y + height_size, (block_row + 1) * block_height)
+            for block_col in range(x // block_width, (x + width_size - 1) // block_width + 1):
+                first_col = max(x, block_col * block_width)
+                last_col = min(x + width_size, (block_col + 1) * block_width)
+                block = self.block_view(band, block_row, block_col)
+                out[first_row - y : last_row - y, first_col - x : last_col - x] = block[
+                    first_row - block_row * block_height : last_row - block_row * block_height,
+                    first_col - block_col * block_width : last_col - block_col * block_width,
+                ]
+
+
+def open_tile_reader(image_path: str, backend: str, tile_size: int = 0) -> TileReader:
+    match backend:
+        case "rasterio":
+            return TileReader(image_path, tile_size)
+        case "memmap":
+            return MemmapTileReader(image_path, tile_size)
+        case _:
+            raise ValueError(f"The tile reader backend: {backend} is not supported.")
+
+
+def read_block_layout(
+    dataset: DatasetReader,
+) -> Optional[Tuple[np.ndarray, np.ndarray, np.dtype]]:
+    if (
+        dataset.driver != "GTiff"
+        or dataset.compression is not None
+        or len(set(dataset.dtypes)) != 1
+        or len(set(dataset.block_shapes)) != 1
+        or (dataset.count > 1 and dataset.interleaving != Interleaving.band)
+    ):
+        return None
+    with open(dataset.name, "rb") as image_file:
+        byte_order = "<" if image_file.read(2) == b"II" else ">"
+    block_dtype = np.dtype(dataset.dtypes[0]).newbyteorder(byte_order)
+    block_height, block_width = dataset.block_shapes[0]
+    block_shape = (
+        dataset.count,
+        -(-dataset.height // block_height),
+        -(-dataset.width // block_width),
+    )
+    block_offsets = np.zeros(block_shape, dtype=np.int64)
+    block_rows = np.zeros(block_shape, dtype=np.int64)
+    for band, block_row, block_col in np.ndindex(*block_shape):
+        offset = dataset.get_tag_item(
+            f"BLOCK_OFFSET_{block_col}_{block_row}", "TIFF", bidx=band + 1
+        )
+        size = dataset.get_tag_item(f"BLOCK_SIZE_{block_col}_{block_row}", "TIFF", bidx=band + 1)
+        if not offset or not size:
+            return None
+        block_offsets[band, block_row, block_col] = int(offset)
+        block_rows[band, block_row, block_col] = min(
+            int(size) // (block_width * block_dtype.itemsize), block_height
+        )
+    return block_offsets, block_rows, block_dtype
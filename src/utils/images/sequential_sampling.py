@@ -0,0 +1,94 @@
+from math import sqrt
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class SequentialDecision:
+    # Decides whether more than threshold_percent of the tiles are positive from a random
+    # sample. The decision is taken once the Wilson score interval of the sampled fraction lies
+    # entirely above or below the threshold; until then it stays None.
+    def __init__(self, threshold_percent: float, z_score: float, min_samples: int) -> None:
+        self.threshold = threshold_percent / 100
+        self.z_score = z_score
+        self.min_samples = min_samples
+        self.samples = 0
+        self.positives = 0
+
+    def add(self, is_positive: bool) -> None:
+        self.samples += 1
+        self.positives += int(is_positive)
+
+    @property
+    def decision(self) -> Optional[bool]:
+        if self.samples < self.min_samples:
+            return None
+        lower, upper = wilson_interval(self.positives, self.samples, self.z_score)
+        if lower > self.threshold:
+            return True
+        if upper < self.threshold:
+            return False
+        return None
+
+
+class BoundedFraction:
+    # Decides whether more than threshold_percent of an image's pixels are positive while its
+    # tiles are scanned in any order. total_area bounds the pixels still to come, so the
+    # decision is taken as soon as no outcome of the unscanned tiles could change it; until
+    # then it stays None.
+    def __init__(self, threshold_percent: float, total_area: int) -> None:
+        self.threshold_percent = threshold_percent
+        self.remaining_area = total_area
+        self.area = 0
+        self.positive_area = 0
+
+    def add(self, scanned_area: int, area: int, positive_area: int) -> None:
+        # scanned_area is the tile's whole area, area the part of it that counts.
+        self.remaining_area -= scanned_area
+        self.area += area
+        self.positive_area += positive_area
+
+    @property
+    def decision(self) -> Optional[bool]:
+        largest_area = self.area + self.remaining_area
+        if not largest_area:
+            return None
+        if self.positive_area * 100 > self.threshold_percent * largest_area:
+            return True
+        if (self.positive_area + self.remaining_area) * 100 <= (
+            self.threshold_percent * largest_area
+        ):
+            return False
+        return None
+
+
+def wilson_interval(positives: int, samples: int, z_score: float) -> Tuple[float, float]:
+    fraction = positives / samples
+    z_squared = z_score**2
+    denominator = 1 + z_squared / samples
+    center = (fraction + z_squared / (2 * samples)) / denominator
+    margin = (
+        z_score
+        * sqrt(fraction * (1 - fraction) / samples + z_squared / (4 * samples**2))
+        / denominator
+    )
+    return center - margin, center + margin
+
+
+def stratified_order(
+    tiles: Iterable[Tuple[int, int]], width: int, height: int, strata: int, seed: int
+) -> List[Tuple[int, int]]:
+    # Splits the image into strata x strata regions, shuffles the tiles of every region and
+    # takes one tile per region in turn, so any prefix of the order covers the whole image.
+    random_generator = np.random.default_rng(seed)
+    regions: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+    for x, y in tiles:
+        regions.setdefault((y * strata // height, x * strata // width), []).append((x, y))
+    region_tiles = []
+    for region in regions.values():
+        region_tiles.append([region[index] for index in random_generator.permutation(len(region))])
+    random_generator.shuffle(region_tiles)
+    order = []
+    for turn in range(max((len(region) for region in region_tiles), default=0)):
+        order.extend(region[turn] for region in region_tiles if turn < len(region))
+    return order
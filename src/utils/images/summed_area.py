@@ -0,0 +1,43 @@
+from typing import Optional, Union
+
+import cv2
+import numpy as np
+
+Coordinate = Union[int, np.ndarray]
+
+
+class SummedAreaTable:
+    # Sums of an operator response, and optionally of its squares, over every top-left
+    # rectangle. The mean and variance of any window then take four lookups each, whatever
+    # its size or overlap. Coordinates may be arrays to query a whole grid at once.
+    def __init__(self, response: np.ndarray, squared_response: Optional[np.ndarray] = None) -> None:
+        self.sums = cv2.integral(response, sdepth=cv2.CV_64F)
+        self.squared_sums = None
+        if squared_response is not None:
+            self.squared_sums = cv2.integral(squared_response, sdepth=cv2.CV_64F)
+
+    def mean(
+        self, x: Coordinate, y: Coordinate, width_size: int, height_size: int
+    ) -> Union[float, np.ndarray]:
+        return window_sum(self.sums, x, y, width_size, height_size) / (width_size * height_size)
+
+    def variance(
+        self, x: Coordinate, y: Coordinate, width_size: int, height_size: int
+    ) -> Union[float, np.ndarray]:
+        number_of_pixels = width_size * height_size
+        average = window_sum(self.sums, x, y, width_size, height_size) / number_of_pixels
+        squared_average = (
+            window_sum(self.squared_sums, x, y, width_size, height_size) / number_of_pixels
+        )
+        return np.maximum(squared_average - average**2, 0)
+
+
+def window_sum(
+    table: np.ndarray, x: Coordinate, y: Coordinate, width_size: int, height_size: int
+) -> Union[float, np.ndarray]:
+    return (
+        table[y + height_size, x + width_size]
+        - table[y, x + width_size]
+        - table[y + height_size, x]
+        + table[y, x]
+    )
@@ -0,0 +1,56 @@
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+
+class MosaicBuffers:
+    # Float responses for one strip of the mosaic. Writing every operator into the same two
+    # arrays keeps the strip in cache and spares a fresh allocation per operator.
+    def __init__(self, shape: Tuple[int, int], dtype: type = np.float64) -> None:
+        self.first = np.empty(shape, dtype=dtype)
+        self.second = np.empty(shape, dtype=dtype)
+
+    @property
+    def depth(self) -> int:
+        return cv2.CV_32F if self.first.dtype == np.float32 else cv2.CV_64F
+
+
+def padded_tile_mosaic(image: np.ndarray, tile_size: int, border: int = 1) -> np.ndarray:
+    # Every tile gets its own reflect-101 border, the border OpenCV applies when an operator
+    # runs on a single tile, so one pass over the mosaic gives each tile the exact response
+    # it would get on its own. The border must cover the operator's kernel radius.
+    rows, cols = image.shape[0] // tile_size, image.shape[1] // tile_size
+    tiles = image[: rows * tile_size, : cols * tile_size].reshape(rows, tile_size, cols, tile_size)
+    padded_tiles = np.pad(tiles, ((0, 0), (border, border), (0, 0), (border, border)), "reflect")
+    return padded_tiles.reshape(rows * (tile_size + 2 * border), cols * (tile_size + 2 * border))
+
+
+def mosaic_tiles(response: np.ndarray, tile_size: int, border: int = 1) -> np.ndarray:
+    padded_size = tile_size + 2 * border
+    rows, cols = response.shape[0] // padded_size, response.shape[1] // padded_size
+    padded_tiles = response.reshape(rows, padded_size, cols, padded_size)
+    return padded_tiles[:, border:-border, :, border:-border]
+
+
+def tile_statistics(
+    response: np.ndarray, tile_size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Sums run along the contiguous axis first; the variance comes from the sum of squares,
+    # which matches np.var per tile up to float rounding.
+    tiles = mosaic_tiles(response, tile_size)
+    float_tiles = tiles.astype(np.float64, copy=False)
+    number_of_pixels = tile_size * tile_size
+    maximum = tiles.max(axis=3).max(axis=1)
+    average = float_tiles.sum(axis=3).sum(axis=1) / number_of_pixels
+    squared_sums = np.einsum("ijkl,ijkl->ik", float_tiles, float_tiles)
+    variance = np.maximum(squared_sums / number_of_pixels - average**2, 0)
+    return maximum, average, variance
+
+
+def gradient_magnitude(gradient_x: np.ndarray, gradient_y: np.ndarray) -> np.ndarray:
+    # The same sqrt(gx**2 + gy**2) as the per-tile operators, computed in place.
+    np.multiply(gradient_x, gradient_x, out=gradient_x)
+    np.multiply(gradient_y, gradient_y, out=gradient_y)
+    np.add(gradient_x, gradient_y, out=gradient_x)
+    return np.sqrt(gradient_x, out=gradient_x)
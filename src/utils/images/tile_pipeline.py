@@ -0,0 +1,122 @@
+from abc import ABC, abstractmethod
+from functools import reduce
+from math import lcm
+from typing import Any, Callable, Iterator, List, Tuple
+
+import cv2
+import numpy as np
+
+from utils.images.manage_sub_image import TileReader
+from utils.images.tile_plan import plan_tiles
+from utils.images.tile_prefetcher import TilePrefetcher
+from utils.logger.write import get_logger
+
+logger = get_logger()
+
+
+class TileDetector(ABC):
+    # A per-tile check fed by run_tile_pipeline. The pipeline tile is a multiple of every
+    # detector's own tile size, so a detector sees exactly the sub-images it would cut itself.
+    tile_size = 1
+
+    def __init__(self) -> None:
+        self.done = False
+        self.failed = False
+
+    @abstractmethod
+    def check_tile(self, x: int, y: int, color_tile: np.ndarray, gray_tile: np.ndarray) -> None:
+        pass
+
+    @abstractmethod
+    def report(self, db: Any, image_id: Any, image_path: str) -> None:
+        pass
+
+
+def run_tile_pipeline(
+    tile_reader: TileReader, detectors: List[TileDetector], prefetch_depth: int = 0
+) -> None:
+    # A failed read fails only the detectors still waiting for tiles; the ones already done
+    # keep their results.
+    windows = tile_windows(tile_reader, pipeline_tile_size(detectors))
+    active_detectors = list(detectors)
+    tiles = TilePrefetcher(tile_reader, windows, prefetch_depth)
+    try:
+        with tiles:
+            for x, y, color_tile in tiles:
+                check_tile(x, y, color_tile, active_detectors)
+                active_detectors = [
+                    detector
+                    for detector in active_detectors
+                    if not (detector.done or detector.failed)
+                ]
+                if not active_detectors:
+                    break
+    except Exception:
+        logger.error(f"Failed to read the tiles of {tile_reader.image_path}", exc_info=True)
+        for detector in active_detectors:
+            detector.failed = True
+    logger.info(f"Tile pipeline read {tile_reader.image_path}: {tiles.stats}")
+
+
+def check_tile(
+    x: int, y: int, color_tile: np.ndarray, active_detectors: List[TileDetector]
+) -> None:
+    gray_tile = cv2.cvtColor(color_tile, cv2.COLOR_RGB2GRAY)
+    for detector in active_detectors:
+        try:
+            detector.check_tile(x, y, color_tile, gray_tile)
+        except Exception:
+            error_log = f"{type(detector).__name__} failed on the tile at ({x}, {y})"
+            logger.error(error_log, exc_info=True)
+            detector.failed = True
+
+
+def create_tile_detectors(
+    image_path: str, detector_factories: List[Callable[[], TileDetector]]
+) -> List[TileDetector]:
+    detectors = []
+    for detector_factory in detector_factories:
+        try:
+            detectors.append(detector_factory())
+        except Exception:
+            logger.error(f"Failed to set up a tile check on {image_path}", exc_info=True)
+    return detectors
+
+
+def report_tile_detectors(
+    db: Any, image_id: Any, image_path: str, detectors: List[TileDetector]
+) -> None:
+    for detector in detectors:
+        if detector.failed:
+            continue
+        try:
+            detector.report(db, image_id, image_path)
+        except Exception:
+            error_log = f"{type(detector).__name__} failed to report {image_path}"
+            logger.error(error_log, exc_info=True)
+
+
+def tile_windows(tile_reader: TileReader, tile_size: int) -> List[Tuple[int, int, int, int]]:
+    grid = plan_tiles(tile_reader.width, tile_reader.height, tile_size, tile_reader.block_shape)
+    return [
+        (
+            x,
+            y,
+            min(x + tile_size, tile_reader.width) - x,
+            min(y + tile_size, tile_reader.height) - y,
+        )
+        for x, y in grid
+    ]
+
+
+def pipeline_tile_size(detectors: List[TileDetector]) -> int:
+    return reduce(lcm, (detector.tile_size for detector in detectors), 1)
+
+
+def sub_tiles(
+    x: int, y: int, tile: np.ndarray, tile_size: int
+) -> Iterator[Tuple[int, int, np.ndarray]]:
+    height, width = tile.shape[:2]
+    for sub_y in range(0, height, tile_size):
+        for sub_x in range(0, width, tile_size):
+            yield x + sub_x, y + sub_y, tile[sub_y : sub_y + tile_size, sub_x : sub_x + tile_size]
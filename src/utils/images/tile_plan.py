@@ -0,0 +1,39 @@
+from itertools import groupby
+from typing import Iterator, List, Tuple
+
+
+def plan_tiles(
+    width: int, height: int, tile_size: int, block_shape: Tuple[int, int]
+) -> Iterator[Tuple[int, int]]:
+    for tiles in plan_tile_groups(width, height, tile_size, block_shape):
+        yield from tiles
+
+
+def plan_tile_groups(
+    width: int, height: int, tile_size: int, block_shape: Tuple[int, int]
+) -> Iterator[List[Tuple[int, int]]]:
+    # Tiles are visited block by block in the order the blocks are stored, so the tiles
+    # that start inside one block are read while that block is still in GDAL's cache.
+    block_height, block_width = block_shape
+    tiles = sorted(
+        ((x, y) for y in range(0, height, tile_size) for x in range(0, width, tile_size)),
+        key=lambda tile: (tile[1] // block_height, tile[0] // block_width, tile[1], tile[0]),
+    )
+    for _, block_tiles in groupby(
+        tiles, key=lambda tile: (tile[1] // block_height, tile[0] // block_width)
+    ):
+        yield list(block_tiles)
+
+
+def detector_tile_size(tile_size: int, snap_to_block: bool, block_shape: Tuple[int, int]) -> int:
+    block_height, block_width = block_shape
+    if not snap_to_block or block_height != block_width:
+        return tile_size
+    return snap_tile_size(tile_size, block_width)
+
+
+def snap_tile_size(tile_size: int, block_size: int) -> int:
+    if tile_size >= block_size:
+        return max(round(tile_size / block_size), 1) * block_size
+    divisors = [divisor for divisor in range(1, block_size + 1) if block_size % divisor == 0]
+    return min(divisors, key=lambda divisor: (abs(divisor - tile_size), -divisor))
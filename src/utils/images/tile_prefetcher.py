@@ -0,0 +1,155 @@
+from dataclasses import dataclass
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from time import perf_counter
+from types import TracebackType
+from typing import Any, Iterator, List, Optional, Tuple, Type
+
+import numpy as np
+
+from utils.images.manage_sub_image import TileReader
+from utils.logger.write import get_logger
+
+logger = get_logger()
+
+POLL_SECONDS = 0.1
+
+
+@dataclass
+class PrefetchStats:
+    tiles: int = 0
+    read_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    queue_depth_total: int = 0
+    max_queue_depth: int = 0
+
+    @property
+    def mean_queue_depth(self) -> float:
+        if self.tiles == 0:
+            return 0
+        return self.queue_depth_total / self.tiles
+
+    def __str__(self) -> str:
+        return (
+            f"tiles={self.tiles} read_seconds={self.read_seconds:.3f} "
+            f"wait_seconds={self.wait_seconds:.3f} "
+            f"mean_queue_depth={self.mean_queue_depth:.2f} "
+            f"max_queue_depth={self.max_queue_depth}"
+        )
+
+
+class TilePrefetcher:
+    # Reads the next windows on a background thread while the current tile is analysed.
+    # GDAL and NumPy release the GIL while they copy pixels, so the read overlaps the
+    # detectors. Only this thread touches the tile reader until the prefetcher is closed.
+    # A depth of 0 reads every window synchronously on the calling thread.
+    def __init__(
+        self, tile_reader: TileReader, windows: List[Tuple[int, int, int, int]], depth: int
+    ) -> None:
+        self.tile_reader = tile_reader
+        self.windows = windows
+        self.depth = depth
+        self.stats = PrefetchStats()
+        self.stopped = Event()
+        self.ready_tiles: Queue = Queue(maxsize=max(depth, 1))
+        self.free_buffers: Queue = Queue()
+        self.thread = None
+
+    def __enter__(self) -> "TilePrefetcher":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def start(self) -> None:
+        if self.depth <= 0 or not self.windows:
+            return
+        height = max(window[3] for window in self.windows)
+        width = max(window[2] for window in self.windows)
+        for _ in range(self.depth + 2):
+            buffer = np.empty((height, width, 3), dtype=self.tile_reader.buffer.dtype)
+            self.free_buffers.put(buffer)
+        self.thread = Thread(target=self.prefetch, name="tile-prefetcher", daemon=True)
+        self.thread.start()
+
+    def close(self) -> None:
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def __iter__(self) -> Iterator[Tuple[int, int, np.ndarray]]:
+        if self.thread is None:
+            yield from self.read_windows()
+            return
+        buffer = None
+        while True:
+            if buffer is not None:
+                self.free_buffers.put(buffer)
+            queue_depth = self.ready_tiles.qsize()
+            start = perf_counter()
+            item = self.ready_tiles.get()
+            self.stats.wait_seconds += perf_counter() - start
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            x, y, tile, buffer = item
+            self.count_tile(queue_depth)
+            yield x, y, tile
+
+    def read_windows(self) -> Iterator[Tuple[int, int, np.ndarray]]:
+        for x, y, width_size, height_size in self.windows:
+            start = perf_counter()
+            tile = self.tile_reader.read(x, y, width_size, height_size)
+            read_seconds = perf_counter() - start
+            self.stats.read_seconds += read_seconds
+            self.stats.wait_seconds += read_seconds
+            self.count_tile(0)
+            yield x, y, tile
+
+    def count_tile(self, queue_depth: int) -> None:
+        self.stats.tiles += 1
+        self.stats.queue_depth_total += queue_depth
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, queue_depth)
+
+    def prefetch(self) -> None:
+        try:
+            for x, y, width_size, height_size in self.windows:
+                buffer = self.take_free_buffer()
+                if buffer is None:
+                    return
+                start = perf_counter()
+                tile = self.tile_reader.read(
+                    x, y, width_size, height_size, out=buffer[:height_size, :width_size]
+                )
+                self.stats.read_seconds += perf_counter() - start
+                if not self.put_ready_tile((x, y, tile, buffer)):
+                    return
+            self.put_ready_tile(None)
+        except Exception as error:
+            logger.error("Failed to prefetch a tile", exc_info=True)
+            self.put_ready_tile(error)
+
+    def take_free_buffer(self) -> Optional[np.ndarray]:
+        while not self.stopped.is_set():
+            try:
+                return self.free_buffers.get(timeout=POLL_SECONDS)
+            except Empty:
+                continue
+        return None
+
+    def put_ready_tile(self, item: Any) -> bool:
+        while not self.stopped.is_set():
+            try:
+                self.ready_tiles.put(item, timeout=POLL_SECONDS)
+                return True
+            except Full:
+                continue
+        return False
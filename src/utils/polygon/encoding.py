@@ -0,0 +1,111 @@
+import zlib
+from typing import Any, Dict, List, Optional
+
+import bson
+import numpy as np
+import shapely
+from bson.binary import Binary
+from rasterio import features
+from shapely.geometry import shape
+
+from utils.polygon.polygon import multi_polygon_object, polygon_object
+
+
+def encode_polygon(
+    polygon: Dict[str, Any], simplify_tolerance: float, size_budget: int, fallback: str
+) -> Optional[Dict[str, Any]]:
+    # Returns the smallest-effort inline encoding of a create_polygon object whose BSON size
+    # fits the budget: the simplified polygon with integer coordinates first, then the
+    # run-length tile bitmap when the fallback allows it. None means nothing fits inline
+    # and the polygon has to be stored outside the image document.
+    packed_polygon = pack_coordinates(simplify_polygon(polygon, simplify_tolerance))
+    if encoded_size(packed_polygon) <= size_budget:
+        return packed_polygon
+    match fallback:
+        case "rle":
+            bitmap = tile_bitmap(polygon)
+            if encoded_size(bitmap) <= size_budget:
+                return bitmap
+            return None
+        case "gridfs":
+            return None
+        case _:
+            raise ValueError(f"The polygon fallback: {fallback} is not supported.")
+
+
+def encoded_size(value: Any) -> int:
+    return len(bson.encode({"polygon": value}))
+
+
+def simplify_polygon(polygon: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+    if not tolerance:
+        return polygon
+    geometry = shape(polygon).simplify(tolerance, preserve_topology=True)
+    match geometry.geom_type:
+        case "Polygon":
+            return polygon_object(geometry)
+        case "MultiPolygon":
+            return multi_polygon_object(geometry)
+        case _:
+            return polygon
+
+
+def pack_coordinates(polygon: Dict[str, Any]) -> Dict[str, Any]:
+    # The polygon corners lie on pixel edges, so int32 coordinates keep them exactly at half
+    # the size of the doubles shapely returns.
+    return {"type": polygon["type"], "coordinates": round_coordinates(polygon["coordinates"])}
+
+
+def round_coordinates(coordinates: Any) -> Any:
+    if isinstance(coordinates[0], (int, float, np.number)):
+        return [int(round(value)) for value in coordinates]
+    return [round_coordinates(item) for item in coordinates]
+
+
+def tile_bitmap(polygon: Dict[str, Any]) -> Dict[str, Any]:
+    # Rasterizes the polygon into the grid of its own vertex coordinates, one cell between
+    # every two consecutive edges, and stores the row-major cell flags as zlib-compressed
+    # uint32 run lengths that start with a run of empty cells. The size is bounded by the
+    # number of grid cells and not by the length of the polygon outline.
+    geometry = shape(polygon)
+    coordinates = shapely.get_coordinates(geometry)
+    edges_x = np.unique(coordinates[:, 0])
+    edges_y = np.unique(coordinates[:, 1])
+    cell_geometry = shapely.transform(
+        geometry,
+        lambda points: np.column_stack(
+            (np.searchsorted(edges_x, points[:, 0]), np.searchsorted(edges_y, points[:, 1]))
+        ).astype(np.float64),
+    )
+    grid = features.rasterize(
+        [(cell_geometry, 1)], out_shape=(len(edges_y) - 1, len(edges_x) - 1), dtype=np.uint8
+    )
+    return {
+        "type": "TileBitmap",
+        "edges_x": round_coordinates(edges_x.tolist()),
+        "edges_y": round_coordinates(edges_y.tolist()),
+        "runs": Binary(zlib.compress(run_lengths(grid.ravel()).astype("<u4").tobytes())),
+    }
+
+
+def run_lengths(flags: np.ndarray) -> np.ndarray:
+    changes = np.flatnonzero(np.diff(flags)) + 1
+    runs = np.diff(np.concatenate(([0], changes, [flags.size])))
+    if flags.size and flags[0]:
+        return np.concatenate(([0], runs))
+    return runs
+
+
+def tile_bitmap_grid(bitmap: Dict[str, Any]) -> np.ndarray:
+    runs = np.frombuffer(zlib.decompress(bitmap["runs"]), dtype="<u4")
+    flags = np.repeat(np.arange(len(runs)) % 2 == 1, runs)
+    return flags.reshape(len(bitmap["edges_y"]) - 1, len(bitmap["edges_x"]) - 1)
+
+
+def tile_bitmap_squares(bitmap: Dict[str, Any]) -> List[List[List[int]]]:
+    edges_x, edges_y = bitmap["edges_x"], bitmap["edges_y"]
+    rows, cols = np.nonzero(tile_bitmap_grid(bitmap))
+    return [
+        [[edges_x[col], edges_y[row]], [edges_x[col + 1], edges_y[row + 1]]]
+        for row, col in zip(rows.tolist(), cols.tolist())
+    ]
@@ -1,12 +1,18 @@
+from itertools import chain
 from typing import Any, Dict, List, Tuple, Union
 
+import numpy as np
+import shapely
+from rasterio import features
 from shapely.geometry import MultiPolygon, Polygon
 
+from consts.polygon import POLYGON_ENGINE
+
 
 def create_polygon(
     squares: List[Tuple[Tuple[int, int], Tuple[int, int]]],
 ) -> Dict[str, Any]:
-    polygons = combine_all_polygons(squares)
+    polygons = combine_squares(merge_squares(squares), POLYGON_ENGINE)
     match polygons.geom_type:
         case "Polygon":
             return polygon_object(polygons)
@@ -16,6 +22,94 @@ def create_polygon(
             raise Exception("The squares are not divided correctly")
 
 
+def combine_squares(
+    squares: List[Tuple[Tuple[int, int], Tuple[int, int]]], engine: str
+) -> Union[Polygon, MultiPolygon]:
+    match engine:
+        case "union":
+            return combine_all_polygons(squares)
+        case "grid":
+            return grid_polygons(squares)
+        case _:
+            raise ValueError(f"The polygon engine: {engine} is not supported.")
+
+
+def grid_polygons(
+    squares: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+) -> Union[Polygon, MultiPolygon]:
+    # Rasterizes the squares into a boolean grid with one cell between every two consecutive
+    # square edges, so tiles of any size and overlapping squares fit, vectorizes it once with
+    # rasterio and maps the cell corners back to pixels. 4-connectivity splits squares that
+    # only touch at a corner, as the union does.
+    corners = np.asarray(squares, dtype=np.float64).reshape(-1, 4)
+    edges_x = np.unique(corners[:, [0, 2]])
+    edges_y = np.unique(corners[:, [1, 3]])
+    cols = np.searchsorted(edges_x, corners[:, [0, 2]])
+    rows = np.searchsorted(edges_y, corners[:, [1, 3]])
+    coverage = np.zeros((len(edges_y), len(edges_x)), dtype=np.int32)
+    np.add.at(coverage, (rows[:, 0], cols[:, 0]), 1)
+    np.add.at(coverage, (rows[:, 0], cols[:, 1]), -1)
+    np.add.at(coverage, (rows[:, 1], cols[:, 0]), -1)
+    np.add.at(coverage, (rows[:, 1], cols[:, 1]), 1)
+    flagged = coverage.cumsum(axis=0).cumsum(axis=1)[:-1, :-1] > 0
+    rings = []
+    ring_polygons = []
+    for index, (geometry, _) in enumerate(
+        features.shapes(flagged.view(np.uint8), mask=flagged, connectivity=4)
+    ):
+        rings.extend(geometry["coordinates"])
+        ring_polygons.extend([index] * len(geometry["coordinates"]))
+    cells = np.array(list(chain.from_iterable(rings)), dtype=np.intp)
+    pixels = np.column_stack((edges_x[cells[:, 0]], edges_y[cells[:, 1]]))
+    ring_indices = np.repeat(np.arange(len(rings)), [len(ring) for ring in rings])
+    polygons = shapely.polygons(
+        shapely.linearrings(pixels, indices=ring_indices), indices=ring_polygons
+    )
+    if len(polygons) == 1:
+        return polygons[0]
+    return MultiPolygon(list(polygons))
+
+
+def merge_squares(
+    squares: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+) -> List[List[Tuple[int, int]]]:
+    # Compacts the flagged squares before either engine combines them: squares of one row
+    # that touch or overlap become maximal horizontal runs, and runs with the same extent
+    # that touch vertically become rectangles. The rectangles cover exactly the squares.
+    return vertical_rectangles(horizontal_runs(squares))
+
+
+def horizontal_runs(
+    squares: List[Tuple[Tuple[int, int], Tuple[int, int]]],
+) -> List[List[Tuple[int, int]]]:
+    runs: List[List[Tuple[int, int]]] = []
+    row_order = sorted(squares, key=lambda square: (square[0][1], square[1][1], square[0][0]))
+    for (x1, y1), (x2, y2) in row_order:
+        if runs and runs[-1][0][1] == y1 and runs[-1][1][1] == y2 and x1 <= runs[-1][1][0]:
+            runs[-1][1] = (max(x2, runs[-1][1][0]), y2)
+        else:
+            runs.append([(x1, y1), (x2, y2)])
+    return runs
+
+
+def vertical_rectangles(
+    runs: List[List[Tuple[int, int]]],
+) -> List[List[Tuple[int, int]]]:
+    rectangles: List[List[Tuple[int, int]]] = []
+    column_order = sorted(runs, key=lambda run: (run[0][0], run[1][0], run[0][1]))
+    for (x1, y1), (x2, y2) in column_order:
+        if (
+            rectangles
+            and rectangles[-1][0][0] == x1
+            and rectangles[-1][1][0] == x2
+            and y1 <= rectangles[-1][1][1]
+        ):
+            rectangles[-1][1] = (x2, max(y2, rectangles[-1][1][1]))
+        else:
+            rectangles.append([(x1, y1), (x2, y2)])
+    return rectangles
+
+
 def combine_all_polygons(
     squares: List[Tuple[Tuple[int, int], Tuple[int, int]]],
 ) -> Union[Polygon, MultiPolygon]:
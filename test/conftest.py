@@ -0,0 +1,21 @@
+import pytest
+import rasterio
+
+
+@pytest.fixture
+def write_image(tmp_path):
+    # Writes a (band, row, col) array as a GeoTIFF under tmp_path and returns its path.
+    def write(bands, name="image.tif", **profile):
+        path = str(tmp_path / name)
+        profile.update(
+            driver="GTiff",
+            width=bands.shape[2],
+            height=bands.shape[1],
+            count=bands.shape[0],
+            dtype=bands.dtype,
+        )
+        with rasterio.open(path, "w", **profile) as image:
+            image.write(bands)
+        return path
+
+    return write
@@ -6,6 +6,7 @@ from db_connections.update_object import (
     update_mongodb,
     add_end_date_value,
     add_disruption,
+    disruption_value,
 )
 
 
@@ -119,3 +120,22 @@ def test_add_disruption_not_succeed_update_mongodb(
     mock_update_mongodb.assert_called_once_with(
         "db", "images", {"_id": "object_id"}, {"blur": "polygon"}
     )
+
+
+@patch("db_connections.update_object.GridFS")
+@patch("db_connections.update_object.encode_polygon", return_value=None)
+def test_disruption_value_stores_an_oversized_polygon_in_gridfs(mock_encode_polygon, mock_gridfs):
+    mock_gridfs.return_value.put.return_value = "file_id"
+    polygon = {"type": "Polygon", "coordinates": [[(0, 0), (0, 8), (8, 8), (8, 0), (0, 0)]]}
+    assert disruption_value("db", "blur", polygon) == {
+        "type": "GridFSPolygon",
+        "file_id": "file_id",
+    }
+    mock_gridfs.assert_called_once_with("db")
+    assert mock_gridfs.return_value.put.call_args.kwargs == {"filename": "blur"}
+
+
+@patch("db_connections.update_object.encode_polygon")
+def test_disruption_value_keeps_flags(mock_encode_polygon):
+    assert disruption_value("db", "cut_image", True) is True
+    mock_encode_polygon.assert_not_called()
@@ -0,0 +1,74 @@
+import numpy as np
+
+from utils.images.background_index import BackgroundIndex
+
+
+def mock_background_mask():
+    background_mask = np.zeros((10, 13), dtype=bool)
+    background_mask[:2, :] = True
+    background_mask[:, 11:] = True
+    background_mask[7, 3] = True
+    return background_mask
+
+
+def test_from_mask_packs_the_mask():
+    background_index = BackgroundIndex.from_mask(mock_background_mask(), 4)
+    assert background_index.packed_mask.shape == (10, 2)
+    np.testing.assert_array_equal(background_index.mask(), mock_background_mask())
+
+
+def test_cell_counts():
+    background_index = BackgroundIndex.from_mask(mock_background_mask(), 4)
+    np.testing.assert_array_equal(
+        background_index.cell_counts,
+        np.array([[8, 8, 10, 4], [1, 0, 4, 4], [0, 0, 2, 2]]),
+    )
+
+
+def test_add_strip_in_parts():
+    background_index = BackgroundIndex(10, 13, 4)
+    for row in range(0, 10, 3):
+        background_index.add_strip(row, mock_background_mask()[row : row + 3])
+    background_index.build()
+    np.testing.assert_array_equal(
+        background_index.cell_counts,
+        BackgroundIndex.from_mask(mock_background_mask(), 4).cell_counts,
+    )
+
+
+def test_background_pixels_on_cell_grid():
+    background_index = BackgroundIndex.from_mask(mock_background_mask(), 4)
+    assert background_index.background_pixels(0, 4, 4, 4) == 1
+    assert background_index.background_pixels(4, 4, 4, 4) == 0
+    assert background_index.background_pixels(8, 4, 5, 6) == 12
+    assert background_index.background_pixels(0, 0, 13, 10) == 43
+
+
+def test_background_pixels_off_cell_grid():
+    background_index = BackgroundIndex.from_mask(mock_background_mask(), 4)
+    assert background_index.background_pixels(3, 7, 1, 1) == 1
+    assert background_index.background_pixels(2, 5, 9, 5) == 1
+    assert background_index.background_pixels(9, 1, 4, 2) == 6
+
+
+def test_touches_background():
+    background_index = BackgroundIndex.from_mask(mock_background_mask(), 4)
+    assert background_index.touches_background(0, 4, 4, 4)
+    assert not background_index.touches_background(0, 8, 4, 4)
+
+
+def test_background_fraction():
+    background_index = BackgroundIndex.from_mask(mock_background_mask(), 4)
+    assert background_index.background_fraction(0, 0, 4, 4) == 0.5
+    assert background_index.background_fraction(12, 8, 4, 4) == 1
+    assert background_index.background_fraction(0, 8, 4, 4) == 0
+
+
+def test_decimated_mask_samples_the_packed_mask():
+    random_generator = np.random.default_rng(0)
+    background_mask = random_generator.random((150, 37)) < 0.5
+    background_index = BackgroundIndex.from_mask(background_mask, 4)
+    for decimation in (1, 3, 4):
+        np.testing.assert_array_equal(
+            background_index.decimated_mask(decimation), background_mask[::decimation, ::decimation]
+        )
@@ -0,0 +1,109 @@
+import cv2
+import numpy as np
+import pytest
+
+from utils.images.background_overview import (
+    create_background_image_by_overview,
+    create_background_index_by_overview,
+    find_mixed_cells,
+    find_mixed_tiles,
+)
+from utils.images.image_background import create_background_image, fill_border_background
+from utils.images.manage_sub_image import MemmapTileReader, TileReader
+
+
+def mock_footprint(height, width, seed):
+    random_generator = np.random.default_rng(seed)
+    gray = random_generator.integers(1, 256, (height, width), dtype=np.uint8)
+    footprint = np.zeros((height, width), dtype=np.uint8)
+    corners = np.array([[40, 10], [width - 5, 30], [width - 60, height - 1], [0, height - 40]])
+    cv2.fillPoly(footprint, [corners.astype(np.int32)], 1)
+    gray[footprint == 0] = 0
+    gray[100:103, 100:180] = 0
+    return gray
+
+
+def write_gray_image(write_image, gray):
+    return write_image(np.stack([gray, gray, gray]), tiled=True, blockxsize=64, blockysize=64)
+
+
+@pytest.mark.parametrize("decimation, refine_tile_size", [(4, 16), (8, 64), (16, 16)])
+def test_create_background_image_by_overview(write_image, decimation, refine_tile_size):
+    gray = mock_footprint(301, 413, decimation)
+    image_path = write_gray_image(write_image, gray)
+    with TileReader(image_path) as image:
+        background_mask = create_background_image_by_overview(
+            image, decimation, refine_tile_size
+        )
+    np.testing.assert_array_equal(background_mask, fill_border_background(gray))
+
+
+def test_create_background_image_by_overview_when_tile_is_smaller_than_decimation(
+    write_image,
+):
+    image_path = write_gray_image(write_image, mock_footprint(50, 50, 0))
+    with TileReader(image_path) as image:
+        with pytest.raises(ValueError, match="must not be smaller than the decimation"):
+            create_background_image_by_overview(image, 16, 8)
+
+
+def test_create_background_index_by_overview(write_image):
+    gray = mock_footprint(301, 413, 1)
+    image_path = write_gray_image(write_image, gray)
+    with MemmapTileReader(image_path) as image:
+        background_index = create_background_index_by_overview(image, 8, 32, 150)
+    np.testing.assert_array_equal(background_index.mask(), fill_border_background(gray))
+
+
+def test_find_mixed_cells():
+    zero_cells = np.array([[True, False, False], [True, False, False]])
+    valid_cells = np.array([[False, True, False], [False, False, True]])
+    np.testing.assert_array_equal(
+        find_mixed_cells(zero_cells, valid_cells),
+        np.array([[False, False, True], [False, True, False]]),
+    )
+
+
+def test_find_mixed_tiles():
+    mixed_cells = np.zeros((7, 7), dtype=bool)
+    mixed_cells[1, 1] = True
+    mixed_cells[6, 3] = True
+    np.testing.assert_array_equal(
+        find_mixed_tiles(mixed_cells, 5, 32, 32, 16),
+        np.array([[True, False], [True, True]]),
+    )
+
+
+@pytest.mark.parametrize("decimation, refine_tile_size", [(8, 16), (16, 64)])
+def test_create_background_image_by_overview_finds_thin_border_channels(
+    write_image, decimation, refine_tile_size
+):
+    gray = np.full((200, 260), 180, dtype=np.uint8)
+    gray[:120, 37] = 0
+    gray[119, 37:150] = 0
+    gray[150:, 201] = 0
+    image_path = write_gray_image(write_image, gray)
+    with TileReader(image_path) as image:
+        background_mask = create_background_image_by_overview(
+            image, decimation, refine_tile_size
+        )
+    np.testing.assert_array_equal(background_mask, create_background_image(gray))
+    assert background_mask[:120, 37].all()
+
+
+@pytest.mark.parametrize("decimation, refine_tile_size", [(8, 16), (16, 64)])
+def test_create_background_image_by_overview_keeps_dim_pixels_next_to_no_data(
+    write_image, decimation, refine_tile_size
+):
+    gray = np.zeros((200, 260), dtype=np.uint8)
+    gray[40:170, 60:230] = 180
+    gray[100:102, 20:22] = 5
+    gray[150:152, 240:242] = 1
+    gray[60:62, 100:102] = 0
+    image_path = write_gray_image(write_image, gray)
+    with TileReader(image_path) as image:
+        background_mask = create_background_image_by_overview(
+            image, decimation, refine_tile_size
+        )
+    np.testing.assert_array_equal(background_mask, create_background_image(gray))
+    assert not background_mask[100:102, 20:22].any()
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from utils.images.background_strips import (
+    create_background_image_by_strips,
+    create_background_index_by_strips,
+    resolve_roots,
+    strip_seam_edges,
+    union_seam_edges,
+)
+from utils.images.image_background import fill_border_background
+from utils.images.manage_sub_image import MemmapTileReader, TileReader
+
+
+def mock_bands(seed):
+    random_generator = np.random.default_rng(seed)
+    gray = (random_generator.random((97, 61)) > 0.4).astype(np.uint8) * 180
+    gray[10:80, 40:45] = 90
+    gray[10:15, 5:45] = 90
+    return np.stack([gray, gray, gray])
+
+
+@pytest.mark.parametrize("strip_height", [1, 7, 16, 200])
+def test_create_background_image_by_strips(write_image, strip_height):
+    bands = mock_bands(strip_height)
+    image_path = write_image(bands)
+    with TileReader(image_path) as image:
+        background_mask = create_background_image_by_strips(image, strip_height)
+    np.testing.assert_array_equal(background_mask, fill_border_background(bands[0]))
+
+
+def test_create_background_image_by_strips_on_single_band(write_image):
+    bands = mock_bands(3)[:1]
+    image_path = write_image(bands)
+    with MemmapTileReader(image_path) as image:
+        background_mask = create_background_image_by_strips(image, 10)
+    np.testing.assert_array_equal(background_mask, fill_border_background(bands[0]))
+
+
+def test_create_background_index_by_strips(write_image):
+    bands = mock_bands(4)
+    image_path = write_image(bands)
+    background_mask = fill_border_background(bands[0])
+    with MemmapTileReader(image_path) as image:
+        background_index = create_background_index_by_strips(image, 16, 20)
+    np.testing.assert_array_equal(background_index.mask(), background_mask)
+    assert background_index.background_pixels(20, 40, 20, 20) == np.count_nonzero(
+        background_mask[40:60, 20:40]
+    )
+
+
+def test_strip_seam_edges():
+    np.testing.assert_array_equal(
+        strip_seam_edges(np.array([0, 0, -1, 2, 2]), np.array([5, 5, 6, -1, 7])),
+        np.array([[0, 5], [2, 7]]),
+    )
+
+
+def test_union_seam_edges():
+    np.testing.assert_array_equal(
+        union_seam_edges(6, [np.array([[0, 3], [2, 3]]), np.array([[3, 5]])]),
+        np.array([0, 1, 0, 0, 4, 0]),
+    )
+
+
+def test_resolve_roots():
+    np.testing.assert_array_equal(
+        resolve_roots(np.array([0, 0, 1, 2, 4])), np.array([0, 0, 0, 0, 4])
+    )
@@ -1,39 +1,56 @@
 from enum import Enum
 from unittest.mock import patch, call
 
+import cv2
+import numpy as np
+import pytest
+
 from modules.blurring.blur_algorithm import (
+    BlurTileDetector,
     blur_disruption,
+    blur_operators,
     is_blur_image,
     blur_sub_image_algorithm,
     detect_blurred_image,
+    detect_blurred_tiles,
 )
 
 
-class MockOpenImage:
+class MockTileReader:
     def __init__(self, width, height):
         self.width = width
         self.height = height
+        self.block_shape = (256, 256)
+        self.read_calls = []
 
-    def close(self):
-        pass
+    def read(self, x, y, width_size, height_size):
+        self.read_calls.append((x, y, width_size, height_size))
+        return np.zeros((height_size, width_size, 3), dtype=np.uint8)
 
 
 class Disruptions(Enum):
     BLUR = "blur"
 
 
+CONSTS = {
+    "sub_image_size": 100,
+    "snap_to_block": False,
+    "percentage_threshold_value": 10,
+    "laplacian_threshold_values": [3, 5, 7],
+    "robert_threshold_values": [800, 1000, 1299],
+    "sobel_threshold_values": [300, 900, 3888],
+    "engine": "per_tile",
+    "operator_precision": "float64",
+    "cascade": False,
+    "decision": "full",
+    "sampling_strata": 2,
+    "sampling_seed": 0,
+    "confidence_z_score": 2.576,
+    "min_samples": 5,
+}
+
+
 @patch("modules.blurring.blur_algorithm.Disruptions", Disruptions)
-@patch(
-    "modules.blurring.blur_algorithm.os.path.split",
-    return_value=("example/image_folder", "file_name.tiff"),
-)
-@patch(
-    "modules.blurring.blur_algorithm.os.path.splitext",
-    side_effect=[("file_name", ".tiff"), ("file_name", ".tiff")],
-)
-@patch(
-    "modules.blurring.blur_algorithm.rasterio.open", return_value=MockOpenImage(10, 20)
-)
 @patch("modules.blurring.blur_algorithm.is_blur_image", return_value=True)
 @patch(
     "modules.blurring.blur_algorithm.create_polygon",
@@ -44,29 +61,20 @@ def test_blur_disruption_on_image_blur(
     mock_add_disruption,
     mock_create_polygon,
     mock_is_blur_image,
-    mock_open,
-    mock_splitext,
-    mock_split,
 ):
     blur_disruption(
         "db",
         "example/image_folder/file_name.tiff",
         1,
         "example_satellite_name",
-        background_image="background_image",
+        background_index="background_index",
+        tile_reader="tile_reader",
     )
-    mock_split.assert_called_once_with("example/image_folder/file_name.tiff")
-    assert mock_splitext.call_count == 2
-    mock_open.assert_called_once_with("example/image_folder/file_name.tiff")
     mock_is_blur_image.assert_called_once_with(
-        "example/image_folder",
-        "file_name",
-        ".tiff",
-        10,
-        20,
+        "tile_reader",
         [],
         "example_satellite_name",
-        "background_image",
+        "background_index",
     )
     mock_create_polygon.assert_called_once_with([])
     mock_add_disruption.assert_called_once_with(
@@ -75,17 +83,6 @@ def test_blur_disruption_on_image_blur(
 
 
 @patch("modules.blurring.blur_algorithm.Disruptions", Disruptions)
-@patch(
-    "modules.blurring.blur_algorithm.os.path.split",
-    return_value=("example/image_folder", "file_name.tiff"),
-)
-@patch(
-    "modules.blurring.blur_algorithm.os.path.splitext",
-    side_effect=[("file_name", ".tiff"), ("file_name", ".tiff")],
-)
-@patch(
-    "modules.blurring.blur_algorithm.rasterio.open", return_value=MockOpenImage(10, 20)
-)
 @patch("modules.blurring.blur_algorithm.is_blur_image", return_value=False)
 @patch(
     "modules.blurring.blur_algorithm.create_polygon",
@@ -96,426 +93,153 @@ def test_blur_disruption_on_image_not_blur(
     mock_add_disruption,
     mock_create_polygon,
     mock_is_blur_image,
-    mock_open,
-    mock_splitext,
-    mock_split,
 ):
     blur_disruption(
         "db",
         "example/image_folder/file_name.tiff",
         1,
         "example_satellite_name",
-        background_image="background_image",
+        background_index="background_index",
+        tile_reader="tile_reader",
     )
-    mock_split.assert_called_once_with("example/image_folder/file_name.tiff")
-    assert mock_splitext.call_count == 2
-    mock_open.assert_called_once_with("example/image_folder/file_name.tiff")
     mock_is_blur_image.assert_called_once_with(
-        "example/image_folder",
-        "file_name",
-        ".tiff",
-        10,
-        20,
+        "tile_reader",
         [],
         "example_satellite_name",
-        "background_image",
+        "background_index",
     )
     mock_create_polygon.assert_not_called()
     mock_add_disruption.assert_not_called()
 
 
-@patch(
-    "modules.blurring.blur_algorithm.get_consts_blur",
-    return_value={
-        "sub_image_size": 100,
-        "percentage_threshold_value": 10,
-        "laplacian_threshold_values": [3, 5, 7],
-        "robert_threshold_values": [800, 1000, 1299],
-        "sobel_threshold_values": [300, 900, 3888],
-    },
-)
-@patch("modules.blurring.blur_algorithm.create_folder")
-@patch("modules.blurring.blur_algorithm.range", return_value="return from range")
-@patch("modules.blurring.blur_algorithm.product", return_value=[(1, 4), (2, 5), (3, 6)])
+@patch("modules.blurring.blur_algorithm.get_consts_blur", return_value=CONSTS)
 @patch(
     "modules.blurring.blur_algorithm.blur_sub_image_algorithm",
-    side_effect=[(400, 400), (400, 0), (100, 50)],
+    side_effect=[(400, 0), (400, 400), (100, 50)],
 )
-@patch("modules.blurring.blur_algorithm.remove_folder")
-def test_is_blur_image_when_blur(
-    mock_remove_folder,
-    mock_blur_sub_image_algorithm,
-    mock_product,
-    mock_range,
-    mock_create_folder,
-    mock_get_consts_blur,
-):
+def test_is_blur_image_when_blur(mock_blur_sub_image_algorithm, mock_get_consts_blur):
+    tile_reader = MockTileReader(150, 150)
     example_blurred_squares = []
     assert is_blur_image(
-        "example/image_folder",
-        "file_name",
-        ".tif",
-        900,
-        850,
+        tile_reader,
         example_blurred_squares,
         "example_satellite_name",
-        "background_image",
+        "background_index",
     )
     mock_get_consts_blur.assert_called_once_with("example_satellite_name")
-    mock_create_folder.assert_called_once_with("file_name")
-    assert mock_range.call_count == 2
-    mock_range.assert_has_calls(
-        [
-            call(0, 900, 100),
-            call(0, 850, 100),
-        ]
-    )
-    mock_product.assert_called_once_with("return from range", "return from range")
-    assert mock_blur_sub_image_algorithm.call_count == 3
+    assert mock_blur_sub_image_algorithm.call_count == 2
     mock_blur_sub_image_algorithm.assert_has_calls(
         [
-            call(
-                "example/image_folder",
-                "file_name",
-                ".tif",
-                900,
-                850,
-                1,
-                4,
-                example_blurred_squares,
-                {
-                    "sub_image_size": 100,
-                    "percentage_threshold_value": 10,
-                    "laplacian_threshold_values": [3, 5, 7],
-                    "robert_threshold_values": [800, 1000, 1299],
-                    "sobel_threshold_values": [300, 900, 3888],
-                },
-                "background_image",
-            ),
-            call(
-                "example/image_folder",
-                "file_name",
-                ".tif",
-                900,
-                850,
-                2,
-                5,
-                example_blurred_squares,
-                {
-                    "sub_image_size": 100,
-                    "percentage_threshold_value": 10,
-                    "laplacian_threshold_values": [3, 5, 7],
-                    "robert_threshold_values": [800, 1000, 1299],
-                    "sobel_threshold_values": [300, 900, 3888],
-                },
-                "background_image",
-            ),
-            call(
-                "example/image_folder",
-                "file_name",
-                ".tif",
-                900,
-                850,
-                3,
-                6,
-                example_blurred_squares,
-                {
-                    "sub_image_size": 100,
-                    "percentage_threshold_value": 10,
-                    "laplacian_threshold_values": [3, 5, 7],
-                    "robert_threshold_values": [800, 1000, 1299],
-                    "sobel_threshold_values": [300, 900, 3888],
-                },
-                "background_image",
-            ),
+            call(tile_reader, 0, 0, example_blurred_squares, CONSTS, "background_index"),
+            call(tile_reader, 100, 0, example_blurred_squares, CONSTS, "background_index"),
         ]
     )
-    mock_remove_folder.assert_called_once_with("file_name")
 
 
-@patch(
-    "modules.blurring.blur_algorithm.get_consts_blur",
-    return_value={
-        "sub_image_size": 100,
-        "percentage_threshold_value": 10,
-        "laplacian_threshold_values": [3, 5, 7],
-        "robert_threshold_values": [800, 1000, 1299],
-        "sobel_threshold_values": [300, 900, 3888],
-    },
-)
-@patch("modules.blurring.blur_algorithm.create_folder")
-@patch("modules.blurring.blur_algorithm.range", return_value="return from range")
-@patch("modules.blurring.blur_algorithm.product", return_value=[(1, 4), (2, 5), (3, 6)])
+@patch("modules.blurring.blur_algorithm.get_consts_blur", return_value=CONSTS)
 @patch(
     "modules.blurring.blur_algorithm.blur_sub_image_algorithm",
-    side_effect=[(400, 0), (400, 0), (100, 50)],
+    side_effect=[(400, 0), (400, 0), (100, 50), (0, 0)],
 )
-@patch("modules.blurring.blur_algorithm.remove_folder")
-def test_is_blur_image_when_not_blur(
-    mock_remove_folder,
-    mock_blur_sub_image_algorithm,
-    mock_product,
-    mock_range,
-    mock_create_folder,
-    mock_get_consts_blur,
-):
-    example_blurred_squares = []
+def test_is_blur_image_when_not_blur(mock_blur_sub_image_algorithm, mock_get_consts_blur):
+    tile_reader = MockTileReader(150, 150)
     assert not is_blur_image(
-        "example/image_folder",
-        "file_name",
-        ".tif",
-        900,
-        850,
-        example_blurred_squares,
+        tile_reader,
+        [],
         "example_satellite_name",
-        "background_image",
+        "background_index",
     )
-    mock_get_consts_blur.assert_called_once_with("example_satellite_name")
-    mock_create_folder.assert_called_once_with("file_name")
-    assert mock_range.call_count == 2
-    mock_range.assert_has_calls(
-        [
-            call(0, 900, 100),
-            call(0, 850, 100),
-        ]
-    )
-    mock_product.assert_called_once_with("return from range", "return from range")
-    assert mock_blur_sub_image_algorithm.call_count == 3
-    mock_blur_sub_image_algorithm.assert_has_calls(
-        [
-            call(
-                "example/image_folder",
-                "file_name",
-                ".tif",
-                900,
-                850,
-                1,
-                4,
-                example_blurred_squares,
-                {
-                    "sub_image_size": 100,
-                    "percentage_threshold_value": 10,
-                    "laplacian_threshold_values": [3, 5, 7],
-                    "robert_threshold_values": [800, 1000, 1299],
-                    "sobel_threshold_values": [300, 900, 3888],
-                },
-                "background_image",
-            ),
-            call(
-                "example/image_folder",
-                "file_name",
-                ".tif",
-                900,
-                850,
-                2,
-                5,
-                example_blurred_squares,
-                {
-                    "sub_image_size": 100,
-                    "percentage_threshold_value": 10,
-                    "laplacian_threshold_values": [3, 5, 7],
-                    "robert_threshold_values": [800, 1000, 1299],
-                    "sobel_threshold_values": [300, 900, 3888],
-                },
-                "background_image",
-            ),
-            call(
-                "example/image_folder",
-                "file_name",
-                ".tif",
-                900,
-                850,
-                3,
-                6,
-                example_blurred_squares,
-                {
-                    "sub_image_size": 100,
-                    "percentage_threshold_value": 10,
-                    "laplacian_threshold_values": [3, 5, 7],
-                    "robert_threshold_values": [800, 1000, 1299],
-                    "sobel_threshold_values": [300, 900, 3888],
-                },
-                "background_image",
-            ),
-        ]
-    )
-    mock_remove_folder.assert_called_once_with("file_name")
+    assert mock_blur_sub_image_algorithm.call_count == 4
 
 
-@patch("modules.blurring.blur_algorithm.min", side_effect=[400, 400])
 @patch("modules.blurring.blur_algorithm.is_background_sub_image", return_value=True)
-@patch(
-    "modules.blurring.blur_algorithm.create_sub_image",
-    return_value="file_name/file_name_0_0.tif",
-)
 @patch("modules.blurring.blur_algorithm.detect_blurred_image", return_value=False)
-@patch("modules.blurring.blur_algorithm.remove_file")
 def test_blur_sub_image_algorithm_when_is_background(
-    mock_remove_file,
     mock_detect_blurred_image,
-    mock_create_sub_image,
     mock_is_background_sub_image,
-    mock_min,
 ):
+    tile_reader = MockTileReader(900, 850)
     blurred_squares = []
     assert blur_sub_image_algorithm(
-        "example/image_folder",
-        "file_name",
-        ".tif",
-        900,
-        850,
-        0,
-        0,
-        blurred_squares,
-        {
-            "sub_image_size": 400,
-            "percentage_threshold_value": 10,
-            "laplacian_threshold_values": [3, 5, 7],
-            "robert_threshold_values": [800, 1000, 1299],
-            "sobel_threshold_values": [300, 900, 3888],
-        },
-        "background_image",
+        tile_reader, 0, 0, blurred_squares, CONSTS, "background_index"
     ) == (0, 0)
-    assert mock_min.call_count == 2
-    mock_min.assert_has_calls(
-        [
-            call(400, 900),
-            call(400, 850),
-        ]
-    )
-    mock_is_background_sub_image.assert_called_once_with(
-        "background_image", 0, 0, 400, 400
-    )
-    mock_create_sub_image.assert_not_called()
+    mock_is_background_sub_image.assert_called_once_with("background_index", 0, 0, 100, 100)
+    assert tile_reader.read_calls == []
     mock_detect_blurred_image.assert_not_called()
-    mock_remove_file.assert_not_called()
     assert blurred_squares == []
 
 
-@patch("modules.blurring.blur_algorithm.min", side_effect=[900, 850])
 @patch("modules.blurring.blur_algorithm.is_background_sub_image", return_value=False)
-@patch(
-    "modules.blurring.blur_algorithm.create_sub_image",
-    return_value="file_name/file_name_800_800.tif",
-)
 @patch("modules.blurring.blur_algorithm.detect_blurred_image", return_value=True)
-@patch("modules.blurring.blur_algorithm.remove_file")
 def test_blur_sub_image_algorithm_when_is_blurred(
-    mock_remove_file,
     mock_detect_blurred_image,
-    mock_create_sub_image,
     mock_is_background_sub_image,
-    mock_min,
 ):
+    tile_reader = MockTileReader(900, 850)
     blurred_squares = []
     assert blur_sub_image_algorithm(
-        "example/image_folder",
-        "file_name",
-        ".tif",
-        900,
-        850,
-        800,
-        800,
-        blurred_squares,
-        {
-            "sub_image_size": 400,
-            "percentage_threshold_value": 10,
-            "laplacian_threshold_values": [3, 5, 7],
-            "robert_threshold_values": [800, 1000, 1299],
-            "sobel_threshold_values": [300, 900, 3888],
-        },
-        "background_image",
+        tile_reader, 800, 800, blurred_squares, CONSTS, "background_index"
     ) == (5000, 5000)
-    assert mock_min.call_count == 2
-    mock_min.assert_has_calls(
-        [
-            call(1200, 900),
-            call(1200, 850),
-        ]
-    )
     mock_is_background_sub_image.assert_called_once_with(
-        "background_image", 800, 800, 100, 50
-    )
-    mock_create_sub_image.assert_called_once_with(
-        800, 800, "file_name.tif", "example/image_folder", 100, 50
+        "background_index", 800, 800, 100, 50
     )
-    mock_detect_blurred_image.assert_called_once_with(
-        "file_name/file_name_800_800.tif",
-        {
-            "sub_image_size": 400,
-            "percentage_threshold_value": 10,
-            "laplacian_threshold_values": [3, 5, 7],
-            "robert_threshold_values": [800, 1000, 1299],
-            "sobel_threshold_values": [300, 900, 3888],
-        },
-    )
-    mock_remove_file.assert_called_once_with("file_name/file_name_800_800.tif")
+    assert tile_reader.read_calls == [(800, 800, 100, 50)]
+    assert mock_detect_blurred_image.call_args[0][0].shape == (50, 100)
+    assert mock_detect_blurred_image.call_args[0][1] == CONSTS
     assert blurred_squares == [[(800, 800), (900, 850)]]
 
 
-@patch("modules.blurring.blur_algorithm.min", side_effect=[900, 850])
 @patch("modules.blurring.blur_algorithm.is_background_sub_image", return_value=False)
-@patch(
-    "modules.blurring.blur_algorithm.create_sub_image",
-    return_value="file_name/file_name_800_800.tif",
-)
 @patch("modules.blurring.blur_algorithm.detect_blurred_image", return_value=False)
-@patch("modules.blurring.blur_algorithm.remove_file")
 def test_blur_sub_image_algorithm_when_is_not_blurred_and_not_background(
-    mock_remove_file,
     mock_detect_blurred_image,
-    mock_create_sub_image,
     mock_is_background_sub_image,
-    mock_min,
 ):
+    tile_reader = MockTileReader(900, 850)
     blurred_squares = []
     assert blur_sub_image_algorithm(
-        "example/image_folder",
-        "file_name",
-        ".tif",
-        900,
-        850,
-        800,
-        800,
-        blurred_squares,
-        {
-            "sub_image_size": 400,
-            "percentage_threshold_value": 10,
-            "laplacian_threshold_values": [3, 5, 7],
-            "robert_threshold_values": [800, 1000, 1299],
-            "sobel_threshold_values": [300, 900, 3888],
-        },
-        "background_image",
-    ) == (5000, 0)
-    assert mock_min.call_count == 2
-    mock_min.assert_has_calls(
-        [
-            call(1200, 900),
-            call(1200, 850),
-        ]
-    )
-    mock_is_background_sub_image.assert_called_once_with(
-        "background_image", 800, 800, 100, 50
-    )
-    mock_create_sub_image.assert_called_once_with(
-        800, 800, "file_name.tif", "example/image_folder", 100, 50
-    )
-    mock_detect_blurred_image.assert_called_once_with(
-        "file_name/file_name_800_800.tif",
-        {
-            "sub_image_size": 400,
-            "percentage_threshold_value": 10,
-            "laplacian_threshold_values": [3, 5, 7],
-            "robert_threshold_values": [800, 1000, 1299],
-            "sobel_threshold_values": [300, 900, 3888],
-        },
-    )
-    mock_remove_file.assert_called_once_with("file_name/file_name_800_800.tif")
+        tile_reader, 0, 0, blurred_squares, CONSTS, "background_index"
+    ) == (10000, 0)
+    assert tile_reader.read_calls == [(0, 0, 100, 100)]
+    mock_detect_blurred_image.assert_called_once()
     assert blurred_squares == []
 
 
-@patch("modules.blurring.blur_algorithm.cv2.IMREAD_GRAYSCALE", 0)
-@patch("modules.blurring.blur_algorithm.cv2.imread", return_value="image")
+@patch("modules.blurring.blur_algorithm.get_consts_blur", return_value=dict(CONSTS))
+@patch(
+    "modules.blurring.blur_algorithm.is_background_sub_image",
+    side_effect=[True, False, False, False],
+)
+@patch("modules.blurring.blur_algorithm.detect_blurred_image", side_effect=[False, True])
+def test_blur_tile_detector_check_tile(
+    mock_detect_blurred_image, mock_is_background_sub_image, mock_get_consts_blur
+):
+    detector = BlurTileDetector(MockTileReader(900, 850), "example_satellite_name", "index")
+    detector.check_tile(600, 0, "color_tile", np.zeros((150, 200), dtype=np.uint8))
+    mock_is_background_sub_image.assert_any_call("index", 700, 0, 100, 100)
+    mock_is_background_sub_image.assert_any_call("index", 600, 100, 100, 50)
+    assert mock_detect_blurred_image.call_args[0][0].shape == (50, 100)
+    assert (detector.sum_pixels, detector.sum_blurred_pixels) == (15000, 5000)
+    assert detector.blurred_squares == [[(600, 100), (700, 150)]]
+    assert detector.done
+
+
+@patch("modules.blurring.blur_algorithm.Disruptions", Disruptions)
+@patch("modules.blurring.blur_algorithm.get_consts_blur", return_value=dict(CONSTS))
+@patch("modules.blurring.blur_algorithm.create_polygon", return_value=["polygons"])
+@patch("modules.blurring.blur_algorithm.add_disruption")
+def test_blur_tile_detector_report(
+    mock_add_disruption, mock_create_polygon, mock_get_consts_blur
+):
+    detector = BlurTileDetector(MockTileReader(900, 850), "example_satellite_name", "index")
+    detector.sum_pixels, detector.sum_blurred_pixels = 10000, 500
+    detector.report("db", 1, "example/image_folder/file_name.tiff")
+    mock_add_disruption.assert_not_called()
+    detector.sum_blurred_pixels = 5000
+    detector.report("db", 1, "example/image_folder/file_name.tiff")
+    mock_add_disruption.assert_called_once_with("db", 1, "blur", ["polygons"])
+
+
 @patch("modules.blurring.blur_algorithm.laplacian_data", return_value=0)
 @patch("modules.blurring.blur_algorithm.robert_data", return_value=1)
 @patch("modules.blurring.blur_algorithm.sobel_data", return_value=1)
@@ -523,26 +247,13 @@ def test_detect_blurred_image_with_blurred_image(
     mock_sobel_data,
     mock_robert_data,
     mock_laplacian_data,
-    mock_imread,
 ):
-    assert detect_blurred_image(
-        "image_name/image_name_0_0.tif",
-        {
-            "sub_image_size": 400,
-            "percentage_threshold_value": 10,
-            "laplacian_threshold_values": [3, 5, 7],
-            "robert_threshold_values": [800, 1000, 1299],
-            "sobel_threshold_values": [300, 900, 3888],
-        },
-    )
-    mock_imread.assert_called_once_with("image_name/image_name_0_0.tif", 0)
+    assert detect_blurred_image("image", CONSTS)
     mock_laplacian_data.assert_called_once_with("image", [3, 5, 7])
     mock_robert_data.assert_called_once_with("image", [800, 1000, 1299])
     mock_sobel_data.assert_called_once_with("image", [300, 900, 3888])
 
 
-@patch("modules.blurring.blur_algorithm.cv2.IMREAD_GRAYSCALE", 0)
-@patch("modules.blurring.blur_algorithm.cv2.imread", return_value="image")
 @patch("modules.blurring.blur_algorithm.laplacian_data", return_value=0)
 @patch("modules.blurring.blur_algorithm.robert_data", return_value=1)
 @patch("modules.blurring.blur_algorithm.sobel_data", return_value=0)
@@ -550,19 +261,99 @@ def test_detect_blurred_image_with_not_blurred_image(
     mock_sobel_data,
     mock_robert_data,
     mock_laplacian_data,
-    mock_imread,
 ):
-    assert not detect_blurred_image(
-        "image_name/image_name_0_0.tif",
-        {
-            "sub_image_size": 400,
-            "percentage_threshold_value": 10,
-            "laplacian_threshold_values": [3, 5, 7],
-            "robert_threshold_values": [800, 1000, 1299],
-            "sobel_threshold_values": [300, 900, 3888],
-        },
-    )
-    mock_imread.assert_called_once_with("image_name/image_name_0_0.tif", 0)
+    assert not detect_blurred_image("image", CONSTS)
     mock_laplacian_data.assert_called_once_with("image", [3, 5, 7])
     mock_robert_data.assert_called_once_with("image", [800, 1000, 1299])
     mock_sobel_data.assert_called_once_with("image", [300, 900, 3888])
+
+
+def test_detect_blurred_tiles_matches_detect_blurred_image():
+    random_generator = np.random.default_rng(0)
+    gray_image = random_generator.integers(0, 256, (230, 330), dtype=np.uint8)
+    gray_image = cv2.GaussianBlur(gray_image, (0, 0), 0.8)
+    gray_image[:100, 100:300] = cv2.GaussianBlur(gray_image[:100, 100:300], (0, 0), 5)
+    blurred_tiles = detect_blurred_tiles(gray_image, 100, CONSTS)
+    expected = [
+        [
+            detect_blurred_image(gray_image[y : y + 100, x : x + 100], CONSTS)
+            for x in range(0, 330, 100)
+        ]
+        for y in range(0, 230, 100)
+    ]
+    assert blurred_tiles.shape == (3, 4)
+    np.testing.assert_array_equal(blurred_tiles, expected)
+    assert blurred_tiles.any() and not blurred_tiles.all()
+
+
+@patch(
+    "modules.blurring.blur_algorithm.get_consts_blur",
+    return_value=dict(CONSTS, decision="sequential"),
+)
+@patch("modules.blurring.blur_algorithm.blur_sub_image_algorithm", return_value=(10000, 0))
+def test_is_blur_image_sequential_decides_a_clean_image_early(
+    mock_blur_sub_image_algorithm, mock_get_consts_blur
+):
+    tile_reader = MockTileReader(1000, 1000)
+    assert not is_blur_image(tile_reader, [], "example_satellite_name", "background_index")
+    assert mock_blur_sub_image_algorithm.call_count == 60
+    checked_tiles = [
+        call_args[0][1:3] for call_args in mock_blur_sub_image_algorithm.call_args_list
+    ]
+    assert len(set(checked_tiles)) == 60
+    assert {(x // 500, y // 500) for x, y in checked_tiles} == {(0, 0), (0, 1), (1, 0), (1, 1)}
+
+
+@patch(
+    "modules.blurring.blur_algorithm.get_consts_blur",
+    return_value=dict(CONSTS, decision="sequential"),
+)
+@patch("modules.blurring.blur_algorithm.blur_sub_image_algorithm", return_value=(10000, 0))
+def test_is_blur_image_sequential_skips_background_tiles(
+    mock_blur_sub_image_algorithm, mock_get_consts_blur
+):
+    mock_blur_sub_image_algorithm.side_effect = [(0, 0)] * 10 + [(10000, 10000)] * 90
+    assert is_blur_image(
+        MockTileReader(1000, 1000), [], "example_satellite_name", "background_index"
+    )
+    assert mock_blur_sub_image_algorithm.call_count == 15
+
+
+@patch(
+    "modules.blurring.blur_algorithm.get_consts_blur", return_value=dict(CONSTS, decision="other")
+)
+def test_is_blur_image_with_unsupported_decision(mock_get_consts_blur):
+    with pytest.raises(ValueError):
+        is_blur_image(MockTileReader(150, 150), [], "example_satellite_name", "background_index")
+
+
+def test_float32_operators_give_the_same_blur_decisions():
+    consts = dict(
+        CONSTS,
+        laplacian_threshold_values=[1000, 2100, 3000],
+        robert_threshold_values=[800, 3000, 4000],
+        sobel_threshold_values=[250, 500, 1500],
+    )
+    random_generator = np.random.default_rng(0)
+    decisions = []
+    for sigma in [0.3, 0.8, 1.5, 3, 6]:
+        gray_image = random_generator.integers(0, 256, (200, 300), dtype=np.uint8)
+        gray_image = cv2.GaussianBlur(gray_image, (0, 0), sigma)
+        for precision in ["float64", "float32"]:
+            precision_consts = dict(consts, operator_precision=precision)
+            decisions.append(detect_blurred_tiles(gray_image, 100, precision_consts))
+            for y in range(0, 200, 100):
+                for x in range(0, 300, 100):
+                    tile = gray_image[y : y + 100, x : x + 100]
+                    assert detect_blurred_image(tile, precision_consts) == decisions[-1][
+                        y // 100, x // 100
+                    ]
+    for float64_decision, float32_decision in zip(decisions[::2], decisions[1::2]):
+        np.testing.assert_array_equal(float64_decision, float32_decision)
+    assert any(decision.any() for decision in decisions)
+    assert not all(decision.all() for decision in decisions)
+
+
+def test_blur_operators_with_unsupported_precision():
+    with pytest.raises(ValueError):
+        blur_operators("float16")
@@ -0,0 +1,62 @@
+from unittest.mock import Mock
+
+import pytest
+
+from modules.blurring.blur_cascade import BlurCascade, VoterStats
+
+CONSTS = {
+    "laplacian_threshold_values": [3, 5, 7],
+    "robert_threshold_values": [800, 1000, 1299],
+    "sobel_threshold_values": [300, 900, 3888],
+}
+
+
+def mock_cascade(laplacian_vote, robert_vote, sobel_vote):
+    voters = {
+        "laplacian": Mock(return_value=laplacian_vote),
+        "robert": Mock(return_value=robert_vote),
+        "sobel": Mock(return_value=sobel_vote),
+    }
+    return BlurCascade(voters, CONSTS), voters
+
+
+def test_blur_cascade_stops_once_blur_is_certain():
+    cascade, voters = mock_cascade(2, 2, -1)
+    assert cascade.is_blurred("image")
+    voters["laplacian"].assert_called_once_with("image", [3, 5, 7])
+    voters["robert"].assert_called_once_with("image", [800, 1000, 1299])
+    voters["sobel"].assert_not_called()
+    assert cascade.stats["sobel"].skip_rate == 1
+
+
+def test_blur_cascade_stops_once_no_blur_is_certain():
+    cascade, voters = mock_cascade(-1, -1, 2)
+    assert not cascade.is_blurred("image")
+    voters["sobel"].assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "votes",
+    [(0, 1, 1), (1, 1, -1), (2, -1, 0), (2, -1, 1), (0, 0, 2), (1, 0, 0), (-1, 2, 1)],
+)
+def test_blur_cascade_gives_the_sum_of_votes_verdict(votes):
+    cascade, _ = mock_cascade(*votes)
+    assert cascade.is_blurred("image") == (sum(votes) > 1)
+
+
+def test_blur_cascade_runs_the_cheapest_voter_first():
+    cascade, voters = mock_cascade(-1, -1, -1)
+    cascade.stats["laplacian"] = VoterStats("laplacian", calls=1, seconds=3)
+    cascade.stats["robert"] = VoterStats("robert", calls=1, seconds=2)
+    cascade.stats["sobel"] = VoterStats("sobel", calls=1, seconds=1)
+    assert not cascade.is_blurred("image")
+    voters["sobel"].assert_called_once()
+    voters["robert"].assert_called_once()
+    voters["laplacian"].assert_not_called()
+
+
+def test_voter_stats():
+    stats = VoterStats("sobel", calls=3, skips=1, seconds=0.006)
+    assert stats.skip_rate == 0.25
+    assert stats.mean_seconds == pytest.approx(0.002)
+    assert str(stats) == "sobel: calls=3 skip_rate=25.0% mean_ms=2.000"
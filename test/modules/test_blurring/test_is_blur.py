@@ -1,4 +1,6 @@
-from modules.blurring.is_blur import decide_if_blur
+import numpy as np
+
+from modules.blurring.is_blur import decide_if_blur, decide_if_blur_grid, response_statistics
 
 
 def test_decide_if_blur():
@@ -7,3 +9,19 @@ def test_decide_if_blur():
     assert decide_if_blur(90, 60, 50, [500, 1000, 1500]) == 0
     assert decide_if_blur(90, 35, 40, [500, 1000, 1500]) == 1
     assert decide_if_blur(90, 30, 30, [500, 1000, 1500]) == 2
+
+
+def test_decide_if_blur_grid():
+    maximum = np.array([[100, 90, 90], [90, 90, 90]])
+    average = np.array([[100, 80, 60], [35, 30, 50]])
+    variance = np.array([[0, 50, 50], [40, 30, 0]])
+    votes = decide_if_blur_grid(maximum, average, variance, [500, 1000, 1500])
+    np.testing.assert_array_equal(votes, [[0, -1, 0], [1, 2, 0]])
+
+
+def test_response_statistics():
+    response = np.random.default_rng(0).random((20, 30)).astype(np.float32)
+    maximum, average, variance = response_statistics(response)
+    assert maximum == np.max(response)
+    assert np.isclose(average, np.mean(response, dtype=np.float64))
+    assert np.isclose(variance, np.var(response, dtype=np.float64))
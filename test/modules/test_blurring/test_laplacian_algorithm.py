@@ -1,6 +1,9 @@
 from unittest.mock import patch
 
-from modules.blurring.laplacian_algorithm import laplacian_data
+import cv2
+import numpy as np
+
+from modules.blurring.laplacian_algorithm import laplacian_data, laplacian_data_float32
 
 
 @patch("modules.blurring.laplacian_algorithm.cv2.CV_64F", 0)
@@ -40,3 +43,11 @@ def test_laplacian_data(
     mock_mean.assert_called_once_with("laplacian")
     mock_var.assert_called_once_with("laplacian")
     mock_decide_if_blur.assert_called_once_with(12, 6, 18, [100, 200, 300])
+
+
+def test_laplacian_data_float32_votes_like_laplacian_data():
+    random_generator = np.random.default_rng(0)
+    for sigma in [0.5, 1, 2, 4]:
+        image = random_generator.integers(0, 256, (100, 100), dtype=np.uint8)
+        image = cv2.GaussianBlur(image, (0, 0), sigma)
+        assert laplacian_data_float32(image, [1000, 2100, 3000]) == laplacian_data(image, [1000, 2100, 3000])
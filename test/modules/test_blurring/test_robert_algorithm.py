@@ -1,7 +1,8 @@
+import cv2
 import numpy as np
 from unittest.mock import patch, call, Mock
 
-from modules.blurring.robert_algorithm import robert_data
+from modules.blurring.robert_algorithm import robert_data, robert_data_float32
 
 
 @patch("modules.blurring.robert_algorithm.cv2.CV_64F", 0)
@@ -41,3 +42,11 @@ def test_robert_data(
     mock_mean.assert_called_once_with("robert_result")
     mock_var.assert_called_once_with("robert_result")
     mock_decide_if_blur.assert_called_once_with(12, 6, 18, [100, 200, 300])
+
+
+def test_robert_data_float32_votes_like_robert_data():
+    random_generator = np.random.default_rng(0)
+    for sigma in [0.5, 1, 2, 4]:
+        image = random_generator.integers(0, 256, (100, 100), dtype=np.uint8)
+        image = cv2.GaussianBlur(image, (0, 0), sigma)
+        assert robert_data_float32(image, [800, 3000, 4000]) == robert_data(image, [800, 3000, 4000])
@@ -1,7 +1,8 @@
+import cv2
 import numpy as np
 from unittest.mock import patch, call
 
-from modules.blurring.sobel_algorithm import sobel_data
+from modules.blurring.sobel_algorithm import sobel_data, sobel_data_float32
 
 
 @patch("modules.blurring.sobel_algorithm.cv2.CV_64F", 0)
@@ -34,3 +35,11 @@ def test_sobel_data(
     mock_mean.assert_called_once_with("sobel_result")
     mock_var.assert_called_once_with("sobel_result")
     mock_decide_if_blur.assert_called_once_with(12, 6, 18, [100, 200, 300])
+
+
+def test_sobel_data_float32_votes_like_sobel_data():
+    random_generator = np.random.default_rng(0)
+    for sigma in [0.5, 1, 2, 4]:
+        image = random_generator.integers(0, 256, (100, 100), dtype=np.uint8)
+        image = cv2.GaussianBlur(image, (0, 0), sigma)
+        assert sobel_data_float32(image, [250, 500, 1500]) == sobel_data(image, [250, 500, 1500])
@@ -1,5 +1,7 @@
 from enum import Enum
 from unittest.mock import patch, call
+import cv2
+import numpy as np
 import pytest
 
 from modules.cutting.cutting_algorithm import (
@@ -7,6 +9,7 @@ from modules.cutting.cutting_algorithm import (
     is_cut,
     is_not_polygon,
 )
+from utils.images.background_index import BackgroundIndex
 
 
 class Disruptions(Enum):
@@ -242,3 +245,21 @@ def test_is_not_polygon_when_get_value_by_keys_raise_exception(mock_get_value_by
     ):
         is_not_polygon("metad.json")
     mock_get_value_by_keys.assert_called_once_with("metad.json", ["geometry", "type"])
+
+
+@pytest.mark.parametrize(
+    "corners, expected",
+    [
+        ([(300, 100), (1700, 250), (1500, 1300), (100, 1150)], False),
+        ([(300, 100), (1700, 250), (1500, 1300), (500, 700)], True),
+    ],
+)
+@patch("modules.cutting.cutting_algorithm.is_not_polygon", return_value=False)
+def test_is_cut_on_a_decimated_mask(mock_is_not_polygon, corners, expected):
+    valid_area = np.zeros((1400, 1800), dtype=np.uint8)
+    cv2.fillPoly(valid_area, [np.array(corners, dtype=np.int32)], 1)
+    background_index = BackgroundIndex.from_mask(valid_area == 0, 300)
+    consts = {"epsilon_coefficient": 0.01, "slope_difference_threshold_value": 0.25}
+    for decimation in (1, 4):
+        background_mask = background_index.decimated_mask(decimation)
+        assert is_cut(background_mask, "json_file_path", "parallelogram", consts) == expected
@@ -0,0 +1,85 @@
+from unittest.mock import patch
+
+import pytest
+from rasterio.env import get_gdal_config
+
+from utils.env.get_env import EnvVars
+from utils.images.gdal_config import (
+    gdal_cachemax_bytes,
+    gdal_env,
+    get_gdal_options,
+    get_rasterio_options,
+)
+
+
+def mock_env(**gdal_options):
+    env = {
+        "azure_connection_string": None,
+        "azure_container_name": None,
+        "collection_name": None,
+        "days_to_delete_logs": 7,
+        "gdal_cachemax": None,
+        "gdal_disable_readdir_on_open": None,
+        "gdal_num_threads": None,
+        "logs_path": None,
+        "mongo_database": None,
+        "mongo_uri": None,
+        "num_workers": 1,
+        "vsi_cache": None,
+        "vsi_cache_size": None,
+    }
+    env.update(gdal_options)
+    return EnvVars(**env)
+
+
+def test_get_gdal_options():
+    env = mock_env(gdal_num_threads="ALL_CPUS", gdal_disable_readdir_on_open="EMPTY_DIR")
+    assert get_gdal_options(env) == {
+        "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+        "GDAL_NUM_THREADS": "ALL_CPUS",
+    }
+    assert get_gdal_options(mock_env()) == {}
+
+
+@pytest.mark.parametrize(
+    "cachemax, expected",
+    [
+        ("512", 512 * 1024 * 1024),
+        ("268435456", 268435456),
+        ("512MB", 512 * 1024 * 1024),
+        ("2gb", 2 * 1024 * 1024 * 1024),
+        ("512 MiB", None),
+        ("large", None),
+    ],
+)
+def test_gdal_cachemax_bytes(cachemax, expected):
+    assert gdal_cachemax_bytes(cachemax) == expected
+
+
+@patch("utils.images.gdal_config.os.sysconf", side_effect=[4096, 1000])
+def test_gdal_cachemax_bytes_as_percentage(mock_sysconf):
+    assert gdal_cachemax_bytes("25%") == 1024000
+
+
+def test_get_rasterio_options():
+    assert get_rasterio_options({"GDAL_CACHEMAX": "64", "VSI_CACHE": "TRUE"}) == {
+        "GDAL_CACHEMAX": 64 * 1024 * 1024,
+        "VSI_CACHE": "TRUE",
+    }
+
+
+def test_get_rasterio_options_with_invalid_cachemax():
+    assert get_rasterio_options({"GDAL_CACHEMAX": "large", "VSI_CACHE": "TRUE"}) == {
+        "VSI_CACHE": "TRUE"
+    }
+
+
+@patch(
+    "utils.images.gdal_config.get_env",
+    return_value=mock_env(gdal_num_threads="2", vsi_cache_size="1000000"),
+)
+def test_gdal_env(mock_get_env):
+    with gdal_env("test") as options:
+        assert options == {"GDAL_NUM_THREADS": "2", "VSI_CACHE_SIZE": "1000000"}
+        assert get_gdal_config("GDAL_NUM_THREADS") == 2
+    assert get_gdal_config("GDAL_NUM_THREADS") is None
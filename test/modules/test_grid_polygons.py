@@ -0,0 +1,56 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from shapely.geometry import shape
+
+from utils.polygon.polygon import (
+    combine_all_polygons,
+    combine_squares,
+    create_polygon,
+    grid_polygons,
+)
+
+
+def test_grid_polygons_keeps_holes_and_corner_contacts_apart():
+    flagged = np.zeros((5, 6), dtype=bool)
+    flagged[1:4, 1:5] = True
+    flagged[2, 2] = False
+    flagged[4, 5] = True
+    squares = [[(col, row), (col + 1, row + 1)] for row, col in zip(*np.nonzero(flagged))]
+    polygons = grid_polygons(squares)
+    assert polygons.geom_type == "MultiPolygon"
+    assert sorted(len(polygon.interiors) for polygon in polygons.geoms) == [0, 1]
+    assert polygons.symmetric_difference(combine_all_polygons(squares)).area == 0
+
+
+def test_grid_polygons_matches_the_union_of_uneven_squares():
+    random_generator = np.random.default_rng(0)
+    squares = []
+    for _ in range(60):
+        x, y = random_generator.integers(0, 900, 2).tolist()
+        width, height = random_generator.integers(1, 150, 2).tolist()
+        squares.append([(x, y), (x + width, y + height)])
+    polygons = grid_polygons(squares)
+    assert polygons.symmetric_difference(combine_all_polygons(squares)).area == 0
+
+
+@patch("utils.polygon.polygon.POLYGON_ENGINE", "grid")
+def test_create_polygon_with_the_grid_engine():
+    squares = [[(0, 0), (150, 150)], [(150, 0), (300, 150)], [(0, 150), (150, 250)]]
+    exterior = [(0, 0), (0, 250), (150, 250), (150, 150), (300, 150), (300, 0), (0, 0)]
+    assert create_polygon(squares) == {"type": "Polygon", "coordinates": [exterior]}
+    assert shape(create_polygon(squares)).area == 150 * 300 + 150 * 100
+
+
+@patch("utils.polygon.polygon.POLYGON_ENGINE", "grid")
+@patch("utils.polygon.polygon.grid_polygons", wraps=grid_polygons)
+def test_create_polygon_merges_the_squares_for_the_grid_engine(mock_grid_polygons):
+    squares = [[(x, y), (x + 8, y + 8)] for y in range(0, 64, 8) for x in range(0, 64, 8)]
+    assert shape(create_polygon(squares)).area == 64 * 64
+    mock_grid_polygons.assert_called_once_with([[(0, 0), (64, 64)]])
+
+
+def test_combine_squares_with_an_unknown_engine():
+    with pytest.raises(ValueError):
+        combine_squares([[(0, 0), (1, 1)]], "raster")
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from utils.images.background_index import BackgroundIndex
+from utils.images.image_background import (
+    create_background_image,
+    fill_border_background,
+    is_background_sub_image,
+)
+
+
+def mock_image():
+    image = np.array(
+        [
+            [0, 0, 0, 0, 0, 0, 0],
+            [0, 5, 5, 5, 5, 5, 0],
+            [0, 5, 0, 0, 5, 5, 0],
+            [0, 5, 0, 0, 5, 0, 0],
+            [0, 5, 5, 5, 5, 5, 0],
+            [7, 0, 7, 7, 7, 7, 7],
+            [7, 7, 0, 7, 7, 7, 7],
+        ],
+        dtype=np.uint8,
+    )
+    return image
+
+
+def test_fill_border_background():
+    np.testing.assert_array_equal(
+        fill_border_background(mock_image()),
+        np.array(
+            [
+                [True, True, True, True, True, True, True],
+                [True, False, False, False, False, False, True],
+                [True, False, False, False, False, False, True],
+                [True, False, False, False, False, True, True],
+                [True, False, False, False, False, False, True],
+                [False, False, False, False, False, False, False],
+                [False, False, True, False, False, False, False],
+            ]
+        ),
+    )
+
+
+def test_create_background_image_returns_boolean_mask():
+    background_mask = create_background_image(mock_image())
+    assert background_mask.dtype == bool
+    assert background_mask.shape == (7, 7)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_create_background_image_parity_with_flood_fill(seed):
+    random_generator = np.random.default_rng(seed)
+    image = (random_generator.random((120, 90)) > 0.45).astype(np.uint8) * 200
+    image[30:90, 20:70] = 100
+    np.testing.assert_array_equal(
+        create_background_image(image, "labeling"),
+        create_background_image(image, "flood_fill"),
+    )
+
+
+def test_create_background_image_when_engine_is_not_supported():
+    with pytest.raises(ValueError, match="The background engine: bfs is not supported."):
+        create_background_image(mock_image(), "bfs")
+
+
+def test_is_background_sub_image():
+    background_mask = fill_border_background(mock_image())
+    background_index = BackgroundIndex.from_mask(background_mask, 2)
+    assert is_background_sub_image(background_index, 0, 0, 2, 2)
+    assert not is_background_sub_image(background_index, 1, 1, 3, 3)
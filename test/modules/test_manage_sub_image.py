@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from utils.images.manage_sub_image import MemmapTileReader, TileReader, open_tile_reader
+
+
+@pytest.fixture
+def image_path(write_image):
+    bands = np.arange(3 * 40 * 50, dtype=np.uint32).reshape(3, 40, 50).astype(np.uint8)
+    return write_image(bands), bands
+
+
+def test_tile_reader_reads_pixel_interleaved_windows(image_path):
+    path, bands = image_path
+    with TileReader(path, 16) as tile_reader:
+        assert (tile_reader.width, tile_reader.height) == (50, 40)
+        sub_image = tile_reader.read(48, 32, 2, 8)
+        np.testing.assert_array_equal(sub_image, bands[:, 32:40, 48:50].transpose(1, 2, 0))
+        assert sub_image.shape == (8, 2, 3)
+
+
+def test_tile_reader_reuses_its_buffer(image_path):
+    path, bands = image_path
+    with TileReader(path, 16) as tile_reader:
+        first_sub_image = tile_reader.read(0, 0, 16, 16)
+        second_sub_image = tile_reader.read(16, 0, 16, 16)
+        assert np.shares_memory(first_sub_image, second_sub_image)
+        np.testing.assert_array_equal(second_sub_image, bands[:, :16, 16:32].transpose(1, 2, 0))
+
+
+def test_tile_reader_grows_its_buffer(image_path):
+    path, bands = image_path
+    with TileReader(path, 16) as tile_reader:
+        sub_image = tile_reader.read(0, 0, 30, 20)
+        np.testing.assert_array_equal(sub_image, bands[:, :20, :30].transpose(1, 2, 0))
+
+
+def test_tile_reader_reads_into_out(image_path):
+    path, bands = image_path
+    out = np.empty((10, 10, 3), dtype=np.uint8)
+    with TileReader(path, 16) as tile_reader:
+        assert tile_reader.read(5, 5, 10, 10, out) is out
+    np.testing.assert_array_equal(out, bands[:, 5:15, 5:15].transpose(1, 2, 0))
+
+
+def test_tile_reader_closes_the_dataset(image_path):
+    path, _ = image_path
+    with TileReader(path, 16) as tile_reader:
+        pass
+    assert tile_reader.dataset is None
+
+
+def test_tile_reader_when_image_does_not_exist(tmp_path):
+    with pytest.raises(Exception, match="for reading tiles"):
+        TileReader(str(tmp_path / "missing.tif")).open()
+
+
+def test_tile_reader_read_when_closed(image_path):
+    path, _ = image_path
+    tile_reader = TileReader(path, 16)
+    with pytest.raises(Exception, match="An error occurred when extracting sub-image array"):
+        tile_reader.read(0, 0, 16, 16)
+
+
+def mock_bands(dtype):
+    random_generator = np.random.default_rng(0)
+    return random_generator.integers(0, 256, (3, 70, 90)).astype(dtype)
+
+
+@pytest.mark.parametrize(
+    "profile",
+    [
+        {"tiled": True, "blockxsize": 32, "blockysize": 16, "interleave": "band"},
+        {"blockysize": 8, "interleave": "band"},
+    ],
+)
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16])
+def test_memmap_tile_reader_matches_tile_reader(write_image, profile, dtype):
+    bands = mock_bands(dtype)
+    path = write_image(bands, **profile)
+    with MemmapTileReader(path) as memmap_reader, TileReader(path) as tile_reader:
+        assert memmap_reader.is_memory_mapped
+        for x, y, width_size, height_size in [(0, 0, 90, 70), (30, 14, 37, 21), (85, 66, 5, 4)]:
+            np.testing.assert_array_equal(
+                memmap_reader.read(x, y, width_size, height_size),
+                tile_reader.read(x, y, width_size, height_size),
+            )
+            np.testing.assert_array_equal(
+                memmap_reader.read_gray(x, y, width_size, height_size),
+                tile_reader.read_gray(x, y, width_size, height_size),
+            )
+
+
+def test_memmap_tile_reader_returns_block_views(write_image):
+    bands = mock_bands(np.uint8)
+    path = write_image(bands, tiled=True, blockxsize=32, blockysize=16, interleave="band")
+    with MemmapTileReader(path) as tile_reader:
+        band_image = tile_reader.read_band(2, 34, 17, 20, 10)
+        assert np.shares_memory(band_image, tile_reader.file_map)
+        np.testing.assert_array_equal(band_image, bands[1, 17:27, 34:54])
+        np.testing.assert_array_equal(tile_reader.block_view(3, 4, 2)[:6, :26], bands[2, 64:70, 64:90])
+
+
+def test_memmap_tile_reader_falls_back_on_compressed_images(write_image):
+    bands = mock_bands(np.uint8)
+    path = write_image(bands, tiled=True, blockxsize=32, blockysize=32, compress="deflate")
+    with MemmapTileReader(path) as tile_reader:
+        assert not tile_reader.is_memory_mapped
+        np.testing.assert_array_equal(
+            tile_reader.read(10, 20, 40, 30), bands[:, 20:50, 10:50].transpose(1, 2, 0)
+        )
+
+
+def test_open_tile_reader(image_path):
+    path, _ = image_path
+    assert type(open_tile_reader(path, "rasterio")) is TileReader
+    assert type(open_tile_reader(path, "memmap")) is MemmapTileReader
+    with pytest.raises(ValueError, match="backend: other is not supported"):
+        open_tile_reader(path, "other")
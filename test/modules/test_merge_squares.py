@@ -0,0 +1,51 @@
+import numpy as np
+from shapely.geometry import shape
+from shapely.ops import unary_union
+
+from utils.polygon.polygon import (
+    convert_square_to_polygon,
+    create_polygon,
+    horizontal_runs,
+    merge_squares,
+    vertical_rectangles,
+)
+
+
+def grid_squares(flagged, size):
+    return [
+        [(col * size, row * size), ((col + 1) * size, (row + 1) * size)]
+        for row, col in zip(*np.nonzero(flagged))
+    ]
+
+
+def test_horizontal_runs():
+    squares = [[(16, 0), (24, 8)], [(0, 0), (8, 8)], [(8, 0), (16, 8)], [(0, 8), (8, 16)]]
+    assert horizontal_runs(squares) == [[(0, 0), (24, 8)], [(0, 8), (8, 16)]]
+
+
+def test_vertical_rectangles():
+    runs = [[(0, 0), (24, 8)], [(0, 8), (24, 16)], [(0, 16), (8, 24)], [(0, 30), (24, 40)]]
+    assert vertical_rectangles(runs) == [
+        [(0, 16), (8, 24)],
+        [(0, 0), (24, 16)],
+        [(0, 30), (24, 40)],
+    ]
+
+
+def test_merge_squares_merges_overlapping_squares():
+    assert merge_squares([[(0, 0), (10, 10)], [(5, 0), (12, 10)], [(0, 10), (12, 20)]]) == [
+        [(0, 0), (12, 20)]
+    ]
+
+
+def test_merge_squares_covers_the_same_area():
+    random_generator = np.random.default_rng(0)
+    flagged = random_generator.random((40, 50)) < 0.6
+    flagged[10:30, 5:45] = True
+    squares = grid_squares(flagged, 8)
+    rectangles = merge_squares(squares)
+    assert len(rectangles) < len(squares) / 2
+    expected = unary_union([convert_square_to_polygon(square) for square in squares])
+    merged = unary_union([convert_square_to_polygon(rectangle) for rectangle in rectangles])
+    assert merged.symmetric_difference(expected).area == 0
+    assert shape(create_polygon(squares)).symmetric_difference(expected).area == 0
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from shapely.geometry import shape
+
+from utils.polygon.encoding import (
+    encode_polygon,
+    encoded_size,
+    pack_coordinates,
+    run_lengths,
+    tile_bitmap,
+    tile_bitmap_grid,
+    tile_bitmap_squares,
+)
+from utils.polygon.polygon import create_polygon
+
+
+def checkerboard_squares(size):
+    return [
+        [(col * 8, row * 8), (col * 8 + 8, row * 8 + 8)]
+        for row in range(size)
+        for col in range(size)
+        if (row + col) % 2 == 0 or row % 3 == 0
+    ]
+
+
+def test_pack_coordinates_keeps_the_polygon_with_int_coordinates():
+    polygon = create_polygon(checkerboard_squares(6))
+    packed_polygon = pack_coordinates(polygon)
+    assert shape(packed_polygon).equals(shape(polygon))
+    assert encoded_size(packed_polygon) < encoded_size(polygon)
+
+
+def test_run_lengths_starts_with_an_empty_run():
+    assert run_lengths(np.array([1, 1, 0, 1], dtype=np.uint8)).tolist() == [0, 2, 1, 1]
+    assert run_lengths(np.array([0, 0, 1], dtype=np.uint8)).tolist() == [2, 1]
+
+
+def test_tile_bitmap_round_trips_the_squares():
+    squares = checkerboard_squares(12)
+    bitmap = tile_bitmap(create_polygon(squares))
+    assert tile_bitmap_grid(bitmap).sum() == len(squares)
+    assert shape(create_polygon(tile_bitmap_squares(bitmap))).equals(
+        shape(create_polygon(squares))
+    )
+
+
+def test_encode_polygon_falls_back_by_size():
+    polygon = create_polygon(checkerboard_squares(40))
+    inline_size = encoded_size(pack_coordinates(polygon))
+    bitmap_size = encoded_size(tile_bitmap(polygon))
+    assert bitmap_size < inline_size
+    assert encode_polygon(polygon, 0, inline_size, "rle")["type"] == "MultiPolygon"
+    assert encode_polygon(polygon, 0, bitmap_size, "rle")["type"] == "TileBitmap"
+    assert encode_polygon(polygon, 0, bitmap_size - 1, "rle") is None
+    assert encode_polygon(polygon, 0, bitmap_size, "gridfs") is None
+    with pytest.raises(ValueError):
+        encode_polygon(polygon, 0, bitmap_size, "tiles")
+
+
+def test_encode_polygon_simplifies_with_the_tolerance():
+    polygon = {
+        "type": "Polygon",
+        "coordinates": [[(0, 0), (0, 10), (5, 10.4), (10, 10), (10, 0), (0, 0)]],
+    }
+    simplified_polygon = encode_polygon(polygon, 1, 1024, "rle")
+    assert simplified_polygon["coordinates"] == [[[0, 0], [0, 10], [10, 10], [10, 0], [0, 0]]]
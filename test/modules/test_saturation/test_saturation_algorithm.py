@@ -1,11 +1,17 @@
 import numpy as np
+import pytest
 from unittest.mock import patch
 from enum import Enum
 
 from modules.saturation.saturation_algorithm import (
+    SaturationTileDetector,
     saturation_disruption,
     saturation_check,
+    saturation_check_by_strips,
     saturation_check_use_grid,
+    saturation_engine,
+    saturation_grid,
+    saturation_mask,
     calculate_saturation,
     saturated_square,
     is_saturation_image,
@@ -17,6 +23,21 @@ class Disruptions(Enum):
     SATURATION = "saturation"
 
 
+class MockTileReader:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+
+CONSTS = {
+    "grid_size": 8,
+    "disruption_percent": 10,
+    "square_percent": 25,
+    "threshold_value": [240, 250, 200],
+    "engine": "per_square",
+}
+
+
 def mock_image():
     return np.zeros((100, 100, 3), dtype=np.uint8)
 
@@ -32,7 +53,12 @@ def mock_image():
     return_value=[True, ["points"]],
 )
 @patch("modules.saturation.saturation_algorithm.cv2.imread", return_value="image")
+@patch(
+    "modules.saturation.saturation_algorithm.get_consts_saturation",
+    return_value=dict(CONSTS, mode="in_memory"),
+)
 def test_saturation_disruption(
+    mock_get_consts_saturation,
     mock_imread,
     mock_saturation_check,
     mock_create_polygon,
@@ -51,7 +77,10 @@ def test_saturation_disruption(
     "modules.saturation.saturation_algorithm.saturation_check_use_grid",
     return_value=[100, []],
 )
-@patch("modules.saturation.saturation_algorithm.get_consts_saturation")
+@patch(
+    "modules.saturation.saturation_algorithm.get_consts_saturation",
+    return_value=dict(CONSTS),
+)
 def test_saturation_check(
     mock_get_consts_saturation, mock_saturated_pixels_use_grid, mock_percent
 ):
@@ -128,3 +157,152 @@ def test_is_saturation_image():
 def test_percent():
     assert percent(100, 400) == 25
     assert percent(5, 0) == 0
+
+
+@pytest.mark.parametrize("engine", ["per_square", "grid"])
+def test_saturation_tile_detector_matches_saturation_check(engine):
+    bgr_image = np.zeros((50, 70, 3), dtype=np.uint8)
+    bgr_image[5:30, 10:60] = [245, 255, 210]
+    bgr_image[40:, 60:] = [255, 255, 255]
+    bgr_image[0:8, 0:8] = [255, 240, 255]
+    rgb_image = np.ascontiguousarray(bgr_image[..., ::-1])
+    consts = dict(CONSTS, engine=engine)
+    with patch(
+        "modules.saturation.saturation_algorithm.get_consts_saturation", return_value=consts
+    ):
+        detector = SaturationTileDetector(MockTileReader(70, 50), "example_satellite_name")
+        detector.check_tile(0, 0, rgb_image[:, :40], "gray_tile")
+        detector.check_tile(40, 0, rgb_image[:, 40:], "gray_tile")
+        saturated_image, saturated_squares = saturation_check(
+            bgr_image, "example_satellite_name"
+        )
+    assert saturated_image
+    assert sorted(detector.saturated_squares) == sorted(saturated_squares)
+    assert detector.sum_saturated_pixels == saturation_check_use_grid(bgr_image, CONSTS)[0]
+
+
+@patch("modules.saturation.saturation_algorithm.Disruptions", Disruptions)
+@patch("modules.saturation.saturation_algorithm.get_consts_saturation", return_value=CONSTS)
+@patch("modules.saturation.saturation_algorithm.create_polygon", return_value=["polygons"])
+@patch("modules.saturation.saturation_algorithm.add_disruption")
+def test_saturation_tile_detector_report(
+    mock_add_disruption, mock_create_polygon, mock_get_consts_saturation
+):
+    detector = SaturationTileDetector(MockTileReader(10, 10), "example_satellite_name")
+    detector.sum_saturated_pixels = 10
+    detector.saturated_squares = [[(0, 0), (8, 8)]]
+    detector.report("db", 5, "test/mock_img.png")
+    mock_create_polygon.assert_called_once_with([[(0, 0), (8, 8)]])
+    mock_add_disruption.assert_called_once_with("db", 5, "saturation", ["polygons"])
+
+
+def random_saturation_image(dtype, largest_value):
+    random_generator = np.random.default_rng(0)
+    image = random_generator.integers(0, largest_value + 1, (61, 83, 3)).astype(dtype)
+    image[10:40, 20:70] = largest_value - random_generator.integers(0, 20, (30, 50, 3))
+    return image
+
+
+@pytest.mark.parametrize(
+    "dtype, largest_value, threshold_value",
+    [
+        (np.uint8, 255, 245),
+        (np.uint8, 255, [240, 250, 200]),
+        (np.uint8, 255, 245.5),
+        (np.uint8, 255, 2550),
+        (np.uint16, 4095, 4080),
+        (np.float32, 1.0, 0.9),
+    ],
+)
+def test_saturation_grid_matches_saturation_check_use_grid(
+    dtype, largest_value, threshold_value
+):
+    image = random_saturation_image(dtype, largest_value)
+    consts = dict(CONSTS, threshold_value=threshold_value)
+    assert saturation_grid(image, consts) == saturation_check_use_grid(image, consts)
+
+
+def test_saturation_grid_places_the_squares_in_the_scene():
+    image = np.full((10, 12, 3), 255, dtype=np.uint8)
+    saturated_pixels, saturated_squares = saturation_grid(image, CONSTS, 16, 8)
+    assert saturated_pixels == 120
+    assert saturated_squares == [
+        [(16, 8), (24, 16)],
+        [(24, 8), (32, 16)],
+        [(16, 16), (24, 24)],
+        [(24, 16), (32, 24)],
+    ]
+
+
+def test_saturation_mask():
+    image = np.array([[[246, 255, 255], [245, 255, 255], [255, 255, 255]]], dtype=np.uint8)
+    np.testing.assert_array_equal(saturation_mask(image, 245), [[1, 0, 1]])
+    np.testing.assert_array_equal(saturation_mask(image, [240, 250, 255]), [[0, 0, 0]])
+
+
+def test_saturation_engine():
+    assert saturation_engine("per_square") is saturation_check_use_grid
+    assert saturation_engine("grid") is saturation_grid
+    with pytest.raises(ValueError):
+        saturation_engine("per_pixel")
+
+
+class MockStripReader(MockTileReader):
+    def __init__(self, rgb_image):
+        super().__init__(rgb_image.shape[1], rgb_image.shape[0])
+        self.rgb_image = rgb_image
+        self.read_calls = []
+
+    def read(self, x, y, width_size, height_size):
+        self.read_calls.append((x, y, width_size, height_size))
+        return self.rgb_image[y : y + height_size, x : x + width_size]
+
+
+@pytest.mark.parametrize("engine", ["per_square", "grid"])
+@pytest.mark.parametrize("strip_height", [8, 20, 1024])
+def test_saturation_check_by_strips_matches_saturation_check(strip_height, engine):
+    bgr_image = random_saturation_image(np.uint8, 255)
+    tile_reader = MockStripReader(np.ascontiguousarray(bgr_image[..., ::-1]))
+    consts = dict(CONSTS, engine=engine, strip_height=strip_height)
+    with patch(
+        "modules.saturation.saturation_algorithm.get_consts_saturation", return_value=consts
+    ):
+        expected = saturation_check(bgr_image, "example_satellite_name")
+    assert saturation_check_by_strips(tile_reader, consts) == expected
+    assert all(height <= max(strip_height // 8 * 8, 8) for *_, height in tile_reader.read_calls)
+
+
+@patch("modules.saturation.saturation_algorithm.Disruptions", Disruptions)
+@patch("modules.saturation.saturation_algorithm.add_disruption")
+@patch("modules.saturation.saturation_algorithm.create_polygon", return_value=["polygons"])
+@patch(
+    "modules.saturation.saturation_algorithm.saturation_check_by_strips",
+    return_value=(True, ["points"]),
+)
+@patch("modules.saturation.saturation_algorithm.open_tile_reader")
+@patch(
+    "modules.saturation.saturation_algorithm.get_consts_tile_reader",
+    return_value={"backend": "memmap", "prefetch_depth": 2},
+)
+@patch("modules.saturation.saturation_algorithm.cv2.imread")
+@patch(
+    "modules.saturation.saturation_algorithm.get_consts_saturation",
+    return_value=dict(CONSTS, mode="strips"),
+)
+def test_saturation_disruption_by_strips(
+    mock_get_consts_saturation,
+    mock_imread,
+    mock_get_consts_tile_reader,
+    mock_open_tile_reader,
+    mock_saturation_check_by_strips,
+    mock_create_polygon,
+    mock_add_disruption,
+):
+    saturation_disruption("db", "test/mock_img.png", 5, "example_satellite_name")
+    mock_imread.assert_not_called()
+    mock_get_consts_tile_reader.assert_called_once_with("example_satellite_name")
+    mock_open_tile_reader.assert_called_once_with("test/mock_img.png", "memmap")
+    mock_saturation_check_by_strips.assert_called_once_with(
+        mock_open_tile_reader.return_value.__enter__.return_value, dict(CONSTS, mode="strips")
+    )
+    mock_add_disruption.assert_called_once_with("db", 5, "saturation", ["polygons"])
@@ -0,0 +1,65 @@
+import pytest
+
+from utils.images.sequential_sampling import (
+    BoundedFraction,
+    SequentialDecision,
+    stratified_order,
+    wilson_interval,
+)
+
+
+def test_wilson_interval():
+    lower, upper = wilson_interval(10, 20, 1.96)
+    assert lower == pytest.approx(0.2993, abs=1e-4)
+    assert upper == pytest.approx(0.7007, abs=1e-4)
+    assert wilson_interval(0, 20, 1.96)[0] == pytest.approx(0)
+
+
+def test_sequential_decision_waits_for_min_samples():
+    decision = SequentialDecision(20, 1.96, 20)
+    for _ in range(19):
+        decision.add(False)
+    assert decision.decision is None
+    decision.add(False)
+    assert decision.decision is False
+
+
+def test_sequential_decision_above_threshold():
+    decision = SequentialDecision(20, 1.96, 5)
+    for _ in range(10):
+        decision.add(True)
+    assert decision.decision is True
+
+
+def test_sequential_decision_stays_undecided_near_threshold():
+    decision = SequentialDecision(20, 1.96, 5)
+    for index in range(50):
+        decision.add(index % 5 == 0)
+    assert decision.decision is None
+
+
+def test_stratified_order_visits_every_region_first():
+    tiles = [(x, y) for y in range(0, 400, 100) for x in range(0, 400, 100)]
+    order = stratified_order(tiles, 400, 400, 2, 0)
+    assert sorted(order) == sorted(tiles)
+    assert {(x // 200, y // 200) for x, y in order[:4]} == {(0, 0), (0, 1), (1, 0), (1, 1)}
+    assert order == stratified_order(tiles, 400, 400, 2, 0)
+
+
+def test_bounded_fraction_decides_once_the_outcome_is_settled():
+    fraction = BoundedFraction(20, 1000)
+    fraction.add(100, 100, 100)
+    assert fraction.decision is None
+    fraction.add(150, 150, 150)
+    assert fraction.decision
+    fraction = BoundedFraction(20, 1000)
+    fraction.add(700, 700, 0)
+    assert fraction.decision is None
+    fraction.add(150, 0, 0)
+    assert fraction.decision is False
+
+
+def test_bounded_fraction_without_area():
+    fraction = BoundedFraction(20, 100)
+    fraction.add(100, 0, 0)
+    assert fraction.decision is None
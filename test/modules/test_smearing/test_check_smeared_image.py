@@ -1,9 +1,18 @@
 from PIL import Image
+import cv2
 import numpy as np
+import pytest
 from unittest.mock import patch, call, Mock
 
 from modules.smearing.check_smeared_image import (
     compare_decay,
+    DecayParityCheck,
+    compare_decay_batch,
+    compare_decay_rfft,
+    compare_decay_rfft_batch,
+    decay_batch_function,
+    decay_weights,
+    half_decay_weights,
     general_decay,
     spectrogram_FFT,
     vertical_decay,
@@ -105,8 +114,10 @@ def test_spectrogram_FFT(mock_abs, mock_fftshift, mock_fft2):
     ],
 )
 def test_vertical_decay(mock_fftfreq):
+    decay_weights.cache_clear()
     spectrogram = np.array([[1, 2, 3, 4, 5, 6], [7, 8, 9, 10, 11, 12]])
     result = vertical_decay(spectrogram)
+    decay_weights.cache_clear()
     mock_fftfreq.assert_has_calls(
         [
             call(2),
@@ -118,6 +129,19 @@ def test_vertical_decay(mock_fftfreq):
     assert isinstance(result, np.ndarray)
 
 
+def test_vertical_decay_reuses_the_weights_of_a_shape():
+    decay_weights.cache_clear()
+    spectrogram = np.arange(12, dtype=np.float64).reshape(2, 6)
+    first_result = vertical_decay(spectrogram)
+    with patch("modules.smearing.check_smeared_image.np.fft.fftfreq") as mock_fftfreq:
+        second_result = vertical_decay(spectrogram)
+        batch_result = vertical_decay(np.stack([spectrogram, spectrogram]))
+    mock_fftfreq.assert_not_called()
+    np.testing.assert_array_equal(first_result, second_result)
+    np.testing.assert_array_equal(batch_result[1], first_result)
+    assert not decay_weights(2, 6, 0.01).flags.writeable
+
+
 @patch("modules.smearing.check_smeared_image.COORDINATES_OF_BLOCK", (0, 0))
 @patch("modules.smearing.check_smeared_image.BLOCK_SIZE", (1, 1))
 @patch(
@@ -161,3 +185,79 @@ def test_block_decay_with_small_sub_image(
     mock_spectrogram_FFT.assert_not_called()
     mock_resize.assert_not_called()
     mock_vertical_decay.assert_not_called()
+
+
+def test_compare_decay_batch_matches_compare_decay():
+    random_generator = np.random.default_rng(0)
+    images = random_generator.integers(0, 256, (3, 160, 170), dtype=np.uint8)
+    images[1] = np.repeat(images[1, :1], 160, axis=0)
+    decay_ratios = compare_decay_batch(images, 1)
+    np.testing.assert_allclose(decay_ratios, [compare_decay(image) for image in images])
+
+
+@patch("modules.smearing.check_smeared_image.COORDINATES_OF_BLOCK", (50, 50))
+def test_compare_decay_batch_without_a_block():
+    images = np.zeros((2, 40, 80), dtype=np.uint8)
+    assert compare_decay_batch(images, 1) == [None, None]
+
+
+def smeared_tiles():
+    random_generator = np.random.default_rng(0)
+    tiles = random_generator.normal(128, 30, (6, 150, 150))
+    for index, size in enumerate(range(1, 30, 5)):
+        tiles[index] = cv2.blur(cv2.GaussianBlur(tiles[index], (0, 0), 2), (1, size))
+    return np.clip(tiles, 0, 255).astype(np.uint8)
+
+
+def test_compare_decay_rfft_batch_is_close_to_compare_decay():
+    tiles = smeared_tiles()
+    decay_ratios = compare_decay_rfft_batch(tiles, 1)
+    np.testing.assert_allclose(
+        decay_ratios, [compare_decay(tile) for tile in tiles], rtol=0.1
+    )
+    assert compare_decay_rfft(tiles[2]) == pytest.approx(decay_ratios[2])
+
+
+@patch("modules.smearing.check_smeared_image.COORDINATES_OF_BLOCK", (50, 50))
+def test_compare_decay_rfft_batch_without_a_block():
+    images = np.zeros((2, 40, 80), dtype=np.uint8)
+    assert compare_decay_rfft_batch(images, 1) == [None, None]
+
+
+@pytest.mark.parametrize("rows, cols", [(150, 150), (151, 97)])
+def test_half_decay_weights_sum_to_the_mean_weight(rows, cols):
+    assert half_decay_weights(rows, cols, 0.01).sum() == pytest.approx(
+        decay_weights(rows, cols, 0.01).mean(), rel=1e-3
+    )
+
+
+def test_decay_batch_function():
+    assert decay_batch_function("fft") is compare_decay_batch
+    assert decay_batch_function("rfft") is compare_decay_rfft_batch
+    with pytest.raises(ValueError):
+        decay_batch_function("dct")
+
+
+def test_decay_parity_check_hands_back_the_reference_ratios():
+    tiles = smeared_tiles()
+    parity_check = DecayParityCheck(2, 500)
+    decay_ratios = compare_decay_rfft_batch(tiles[:3], 1)
+    checked_ratios = parity_check.check(tiles[:3], decay_ratios)
+    assert checked_ratios[:2] == [compare_decay(tile) for tile in tiles[:2]]
+    assert checked_ratios[2] == decay_ratios[2]
+    assert parity_check.samples_left == 0
+    assert not parity_check.failed
+    assert parity_check.check(tiles[3:], [1.0, 2.0, 3.0]) == [1.0, 2.0, 3.0]
+
+
+def test_decay_parity_check_fails_when_a_decision_flips():
+    tiles = smeared_tiles()
+    reference = compare_decay(tiles[0])
+    parity_check = DecayParityCheck(8, reference * 2)
+    parity_check.check(tiles[:1], [reference * 1.5])
+    assert not parity_check.failed
+    assert parity_check.max_difference == pytest.approx(0.5)
+    parity_check = DecayParityCheck(8, reference * 1.2)
+    parity_check.check(tiles[:1], [reference * 1.5])
+    assert parity_check.failed
+    assert parity_check.flipped_decisions == 1
@@ -1,7 +1,10 @@
 from unittest.mock import patch
+import cv2
 import numpy as np
 
 from modules.smearing.check_smooth import (
+    SmoothnessMap,
+    decide_if_smooth,
     is_smooth_region,
     gradient_energy,
     variance_of_laplacian,
@@ -175,3 +178,32 @@ def test_gaussian_blur_difference(mock_mean, mock_abs, mock_gaussian_blur):
         mock_abs.call_args[0][0],
     )
     mock_mean.assert_called_once_with("return from np.abs.")
+
+
+def test_decide_if_smooth():
+    consts = {"sobel_value": 400, "laplacian_value": 50, "blur_value": 1.7}
+    assert decide_if_smooth(350, 60, 2, consts)
+    assert not decide_if_smooth(900, 40, 1, consts)
+    assert decide_if_smooth(500, 40, 1.6, consts)
+    assert not decide_if_smooth(500, 60, 1.8, consts)
+    assert decide_if_smooth(500, 60, 1.6, consts)
+
+
+def test_smoothness_map_matches_the_tile_functions():
+    random_generator = np.random.default_rng(0)
+    gray_image = random_generator.integers(0, 256, (60, 75), dtype=np.uint8)
+    gray_image = cv2.GaussianBlur(gray_image, (0, 0), 1)
+    smoothness_map = SmoothnessMap(gray_image, 25)
+    for y in range(0, 50, 25):
+        for x in range(0, 75, 25):
+            tile = gray_image[y : y + 25, x : x + 25]
+            np.testing.assert_allclose(
+                smoothness_map.values(x, y),
+                (
+                    gradient_energy(tile),
+                    variance_of_laplacian(tile),
+                    gaussian_blur_difference(tile),
+                ),
+                rtol=1e-6,
+            )
+    assert smoothness_map.values(0, 50) is None
@@ -1,40 +1,53 @@
 from enum import Enum
 from unittest.mock import patch, call
 
+import numpy as np
+import pytest
+
 from modules.smearing.smear_algorithm import (
+    SmearTileDetector,
     smear_disruption,
     arrange_to_send_smear_test,
     is_smear_image,
     smear_sub_image_algorithm,
     detect_smeared_image,
+    stops_early,
 )
 
 
-class MockOpenImage:
+class MockTileReader:
     def __init__(self, width, height):
         self.width = width
         self.height = height
+        self.block_shape = (256, 256)
+        self.read_calls = []
 
-    def close(self):
-        pass
+    def read(self, x, y, width_size, height_size):
+        self.read_calls.append((x, y, width_size, height_size))
+        return np.zeros((height_size, width_size, 3), dtype=np.uint8)
 
 
 class Disruptions(Enum):
     SMEAR = "smear"
 
 
+CONSTS = {
+    "size": 100,
+    "snap_to_block": False,
+    "percentage_threshold_value": 20,
+    "threshold_value": 500,
+    "sobel_value": 500,
+    "laplacian_value": 50,
+    "blur_value": 1.8,
+    "engine": "per_tile",
+    "fft_workers": 1,
+    "spectral_backend": "fft",
+    "parity_samples": 0,
+    "decision": "full",
+}
+
+
 @patch("modules.smearing.smear_algorithm.Disruptions", Disruptions)
-@patch(
-    "modules.smearing.smear_algorithm.os.path.split",
-    return_value=("example/image_folder", "file_name.tiff"),
-)
-@patch(
-    "modules.smearing.smear_algorithm.os.path.splitext",
-    side_effect=[("file_name", ".tiff"), ("file_name", ".tiff")],
-)
-@patch(
-    "modules.smearing.smear_algorithm.rasterio.open", return_value=MockOpenImage(10, 20)
-)
 @patch("modules.smearing.smear_algorithm.is_smear_image", return_value=True)
 @patch(
     "modules.smearing.smear_algorithm.create_polygon",
@@ -45,29 +58,20 @@ def test_smear_disruption_on_smeared_image(
     mock_add_disruption,
     mock_create_polygon,
     mock_is_smear_image,
-    mock_open,
-    mock_splitext,
-    mock_split,
 ):
     smear_disruption(
         "db",
         "example/image_folder/file_name.tiff",
         1,
         "example_satellite_name",
-        background_image="background_image",
+        background_index="background_index",
+        tile_reader="tile_reader",
     )
-    mock_split.assert_called_once_with("example/image_folder/file_name.tiff")
-    assert mock_splitext.call_count == 2
-    mock_open.assert_called_once_with("example/image_folder/file_name.tiff")
     mock_is_smear_image.assert_called_once_with(
-        "example/image_folder",
-        "file_name",
-        ".tiff",
-        10,
-        20,
+        "tile_reader",
         [],
         "example_satellite_name",
-        "background_image",
+        "background_index",
     )
     mock_create_polygon.assert_called_once_with([])
     mock_add_disruption.assert_called_once_with(
@@ -76,416 +80,291 @@ def test_smear_disruption_on_smeared_image(
 
 
 @patch("modules.smearing.smear_algorithm.Disruptions", Disruptions)
-@patch(
-    "modules.smearing.smear_algorithm.os.path.split",
-    return_value=("example/image_folder", "file_name.tiff"),
-)
-@patch(
-    "modules.smearing.smear_algorithm.os.path.splitext",
-    side_effect=[("file_name", ".tiff"), ("file_name", ".tiff")],
-)
-@patch(
-    "modules.smearing.smear_algorithm.rasterio.open", return_value=MockOpenImage(10, 20)
-)
 @patch("modules.smearing.smear_algorithm.is_smear_image", return_value=False)
-@patch(
-    "modules.smearing.smear_algorithm.create_polygon",
-    return_value=[[(0, 100), (100, 100), (100, 0), (0, 0), (0, 100)]],
-)
+@patch("modules.smearing.smear_algorithm.create_polygon")
 @patch("modules.smearing.smear_algorithm.add_disruption")
 def test_smear_disruption_on_not_smeared_image(
     mock_add_disruption,
     mock_create_polygon,
     mock_is_smear_image,
-    mock_open,
-    mock_splitext,
-    mock_split,
 ):
     smear_disruption(
         "db",
         "example/image_folder/file_name.tiff",
         1,
         "example_satellite_name",
-        background_image="background_image",
-    )
-    mock_split.assert_called_once_with("example/image_folder/file_name.tiff")
-    assert mock_splitext.call_count == 2
-    mock_open.assert_called_once_with("example/image_folder/file_name.tiff")
-    mock_is_smear_image.assert_called_once_with(
-        "example/image_folder",
-        "file_name",
-        ".tiff",
-        10,
-        20,
-        [],
-        "example_satellite_name",
-        "background_image",
+        background_index="background_index",
+        tile_reader="tile_reader",
     )
+    mock_is_smear_image.assert_called_once()
     mock_create_polygon.assert_not_called()
     mock_add_disruption.assert_not_called()
 
 
-@patch(
-    "modules.smearing.smear_algorithm.get_consts_smear",
-    return_value={
-        "size": 100,
-        "percentage_threshold_value": 10,
-        "threshold_value": 1200,
-    },
-)
-@patch("modules.smearing.smear_algorithm.create_folder")
+@patch("modules.smearing.smear_algorithm.get_consts_smear", return_value=CONSTS)
 @patch(
     "modules.smearing.smear_algorithm.arrange_to_send_smear_test",
-    return_value=(8000, 10000),
+    return_value=(300, 1000),
 )
-@patch("modules.smearing.smear_algorithm.remove_folder")
-def test_is_smear_image_when_smear(
-    mock_remove_folder,
-    mock_arrange_to_send_smear_test,
-    mock_create_folder,
-    mock_get_consts_smear,
-):
-    example_smeared_squares = []
+def test_is_smear_image_when_smear(mock_arrange_to_send_smear_test, mock_get_consts_smear):
+    smeared_squares = []
     assert is_smear_image(
-        "example/image_folder",
-        "file_name",
-        ".tif",
-        900,
-        850,
-        example_smeared_squares,
-        "example_satellite_name",
-        "background_image",
+        "tile_reader", smeared_squares, "example_satellite_name", "background_index"
     )
     mock_get_consts_smear.assert_called_once_with("example_satellite_name")
-    mock_create_folder.assert_called_once_with("file_name")
     mock_arrange_to_send_smear_test.assert_called_once_with(
-        {"size": 100, "percentage_threshold_value": 10, "threshold_value": 1200},
-        "example/image_folder",
-        "file_name",
-        ".tif",
-        900,
-        850,
-        example_smeared_squares,
-        "background_image",
+        CONSTS, "tile_reader", smeared_squares, "background_index"
     )
-    mock_remove_folder.assert_called_once_with("file_name")
 
 
-@patch(
-    "modules.smearing.smear_algorithm.get_consts_smear",
-    return_value={
-        "size": 100,
-        "percentage_threshold_value": 10,
-        "threshold_value": 1200,
-    },
-)
-@patch("modules.smearing.smear_algorithm.create_folder")
+@patch("modules.smearing.smear_algorithm.get_consts_smear", return_value=CONSTS)
 @patch(
     "modules.smearing.smear_algorithm.arrange_to_send_smear_test",
-    return_value=(10, 10000),
+    return_value=(100, 1000),
 )
-@patch("modules.smearing.smear_algorithm.remove_folder")
 def test_is_smear_image_when_not_smear(
-    mock_remove_folder,
-    mock_arrange_to_send_smear_test,
-    mock_create_folder,
-    mock_get_consts_smear,
+    mock_arrange_to_send_smear_test, mock_get_consts_smear
 ):
-    example_smeared_squares = []
     assert not is_smear_image(
-        "example/image_folder",
-        "file_name",
-        ".tif",
-        900,
-        850,
-        example_smeared_squares,
-        "example_satellite_name",
-        "background_image",
+        "tile_reader", [], "example_satellite_name", "background_index"
     )
-    mock_get_consts_smear.assert_called_once_with("example_satellite_name")
-    mock_create_folder.assert_called_once_with("file_name")
-    mock_arrange_to_send_smear_test.assert_called_once_with(
-        {"size": 100, "percentage_threshold_value": 10, "threshold_value": 1200},
-        "example/image_folder",
-        "file_name",
-        ".tif",
-        900,
-        850,
-        example_smeared_squares,
-        "background_image",
-    )
-    mock_remove_folder.assert_called_once_with("file_name")
 
 
-@patch("modules.smearing.smear_algorithm.range", return_value="return from range")
-@patch(
-    "modules.smearing.smear_algorithm.product", return_value=[(1, 4), (2, 5), (3, 6)]
-)
 @patch(
     "modules.smearing.smear_algorithm.smear_sub_image_algorithm",
-    side_effect=[(400, 400), (400, 0), (100, 50)],
+    side_effect=[(400, 0), (400, 400), (100, 50), (0, 0)],
 )
-def test_arrange_to_send_smear_test(
-    mock_smear_sub_image_algorithm,
-    mock_product,
-    mock_range,
-):
+def test_arrange_to_send_smear_test(mock_smear_sub_image_algorithm):
+    tile_reader = MockTileReader(150, 150)
+    smeared_squares = []
     assert arrange_to_send_smear_test(
-        {"size": 100},
-        "example/image_folder",
-        "file_name",
-        ".tif",
-        900,
-        850,
-        "example_smeared_squares",
-        "background_image",
-    )
-    assert mock_range.call_count == 2
-    mock_range.assert_has_calls(
-        [
-            call(0, 900, 100),
-            call(0, 850, 100),
-        ]
-    )
-    mock_product.assert_called_once_with("return from range", "return from range")
-    assert mock_smear_sub_image_algorithm.call_count == 3
+        CONSTS, tile_reader, smeared_squares, "background_index"
+    ) == (450, 900)
     mock_smear_sub_image_algorithm.assert_has_calls(
         [
-            call(
-                "example/image_folder",
-                "file_name",
-                ".tif",
-                900,
-                850,
-                1,
-                4,
-                "example_smeared_squares",
-                {"size": 100},
-                "background_image",
-            ),
-            call(
-                "example/image_folder",
-                "file_name",
-                ".tif",
-                900,
-                850,
-                2,
-                5,
-                "example_smeared_squares",
-                {"size": 100},
-                "background_image",
-            ),
-            call(
-                "example/image_folder",
-                "file_name",
-                ".tif",
-                900,
-                850,
-                3,
-                6,
-                "example_smeared_squares",
-                {"size": 100},
-                "background_image",
-            ),
+            call(tile_reader, 0, 0, smeared_squares, CONSTS, "background_index"),
+            call(tile_reader, 100, 0, smeared_squares, CONSTS, "background_index"),
+            call(tile_reader, 0, 100, smeared_squares, CONSTS, "background_index"),
+            call(tile_reader, 100, 100, smeared_squares, CONSTS, "background_index"),
         ]
     )
 
 
-@patch("modules.smearing.smear_algorithm.min", side_effect=[400, 400])
 @patch("modules.smearing.smear_algorithm.is_background_sub_image", return_value=True)
-@patch(
-    "modules.smearing.smear_algorithm.create_sub_image",
-    return_value="file_name/file_name_0_0.tif",
-)
-@patch("modules.smearing.smear_algorithm.detect_smeared_image", return_value=False)
-@patch("modules.smearing.smear_algorithm.remove_file")
+@patch("modules.smearing.smear_algorithm.detect_smeared_image")
 def test_smear_sub_image_algorithm_when_is_background(
-    mock_remove_file,
     mock_detect_smeared_image,
-    mock_create_sub_image,
     mock_is_background_sub_image,
-    mock_min,
 ):
+    tile_reader = MockTileReader(900, 850)
     smeared_squares = []
     assert smear_sub_image_algorithm(
-        "example/image_folder",
-        "file_name",
-        ".tif",
-        900,
-        850,
-        0,
-        0,
-        smeared_squares,
-        {"size": 100, "threshold_value": 1200},
-        "background_image",
+        tile_reader, 0, 0, smeared_squares, CONSTS, "background_index"
     ) == (0, 0)
-    assert mock_min.call_count == 2
-    mock_min.assert_has_calls(
-        [
-            call(100, 900),
-            call(100, 850),
-        ]
-    )
-    mock_is_background_sub_image.assert_called_once_with(
-        "background_image", 0, 0, 400, 400
-    )
-    mock_create_sub_image.assert_not_called()
+    mock_is_background_sub_image.assert_called_once_with("background_index", 0, 0, 100, 100)
+    assert tile_reader.read_calls == []
     mock_detect_smeared_image.assert_not_called()
-    mock_remove_file.assert_not_called()
     assert smeared_squares == []
 
 
-@patch("modules.smearing.smear_algorithm.min", side_effect=[900, 850])
 @patch("modules.smearing.smear_algorithm.is_background_sub_image", return_value=False)
-@patch(
-    "modules.smearing.smear_algorithm.create_sub_image",
-    return_value="file_name/file_name_800_800.tif",
-)
 @patch("modules.smearing.smear_algorithm.detect_smeared_image", return_value=True)
-@patch("modules.smearing.smear_algorithm.remove_file")
 def test_smear_sub_image_algorithm_when_is_smeared(
-    mock_remove_file,
     mock_detect_smeared_image,
-    mock_create_sub_image,
     mock_is_background_sub_image,
-    mock_min,
 ):
+    tile_reader = MockTileReader(900, 850)
     smeared_squares = []
     assert smear_sub_image_algorithm(
-        "example/image_folder",
-        "file_name",
-        ".tif",
-        900,
-        850,
-        800,
-        800,
-        smeared_squares,
-        {"size": 100, "threshold_value": 1200},
-        "background_image",
+        tile_reader, 800, 800, smeared_squares, CONSTS, "background_index"
     ) == (5000, 5000)
-    assert mock_min.call_count == 2
-    mock_min.assert_has_calls(
-        [
-            call(900, 900),
-            call(900, 850),
-        ]
-    )
-    mock_is_background_sub_image.assert_called_once_with(
-        "background_image", 800, 800, 100, 50
-    )
-    mock_create_sub_image.assert_called_once_with(
-        800, 800, "file_name.tif", "example/image_folder", 100, 50
-    )
-    mock_detect_smeared_image.assert_called_once_with(
-        "file_name/file_name_800_800.tif", {"size": 100, "threshold_value": 1200}
-    )
-    mock_remove_file.assert_called_once_with("file_name/file_name_800_800.tif")
+    assert tile_reader.read_calls == [(800, 800, 100, 50)]
+    assert mock_detect_smeared_image.call_args[0][0].shape == (50, 100)
     assert smeared_squares == [[(800, 800), (900, 850)]]
 
 
-@patch("modules.smearing.smear_algorithm.min", side_effect=[900, 850])
 @patch("modules.smearing.smear_algorithm.is_background_sub_image", return_value=False)
-@patch(
-    "modules.smearing.smear_algorithm.create_sub_image",
-    return_value="file_name/file_name_800_800.tif",
-)
 @patch("modules.smearing.smear_algorithm.detect_smeared_image", return_value=False)
-@patch("modules.smearing.smear_algorithm.remove_file")
 def test_smear_sub_image_algorithm_when_is_not_smeared_and_not_background(
-    mock_remove_file,
     mock_detect_smeared_image,
-    mock_create_sub_image,
     mock_is_background_sub_image,
-    mock_min,
 ):
+    tile_reader = MockTileReader(900, 850)
     smeared_squares = []
     assert smear_sub_image_algorithm(
-        "example/image_folder",
-        "file_name",
-        ".tif",
-        900,
-        850,
-        800,
-        800,
-        smeared_squares,
-        {"size": 100, "threshold_value": 1200},
-        "background_image",
-    ) == (5000, 0)
-    assert mock_min.call_count == 2
-    mock_min.assert_has_calls(
-        [
-            call(900, 900),
-            call(900, 850),
-        ]
-    )
-    mock_is_background_sub_image.assert_called_once_with(
-        "background_image", 800, 800, 100, 50
-    )
-    mock_create_sub_image.assert_called_once_with(
-        800, 800, "file_name.tif", "example/image_folder", 100, 50
-    )
-    mock_detect_smeared_image.assert_called_once_with(
-        "file_name/file_name_800_800.tif", {"size": 100, "threshold_value": 1200}
-    )
-    mock_remove_file.assert_called_once_with("file_name/file_name_800_800.tif")
+        tile_reader, 0, 0, smeared_squares, CONSTS, "background_index"
+    ) == (10000, 0)
     assert smeared_squares == []
 
 
-@patch("modules.smearing.smear_algorithm.cv2.imread", return_value="image")
+@patch("modules.smearing.smear_algorithm.get_consts_smear", return_value=dict(CONSTS))
+@patch("modules.smearing.smear_algorithm.is_background_sub_image", side_effect=[False, False])
+@patch("modules.smearing.smear_algorithm.detect_smeared_image", side_effect=[True, False])
+def test_smear_tile_detector_check_tile(
+    mock_detect_smeared_image, mock_is_background_sub_image, mock_get_consts_smear
+):
+    detector = SmearTileDetector(MockTileReader(900, 850), "example_satellite_name", "index")
+    detector.check_tile(800, 700, "color_tile", np.zeros((150, 100), dtype=np.uint8))
+    mock_is_background_sub_image.assert_any_call("index", 800, 800, 100, 50)
+    assert (detector.sum_pixels, detector.sum_smeared_pixels) == (15000, 10000)
+    assert detector.smeared_squares == [[(800, 700), (900, 800)]]
+    assert not detector.done
+
+
+@patch("modules.smearing.smear_algorithm.Disruptions", Disruptions)
+@patch("modules.smearing.smear_algorithm.get_consts_smear", return_value=dict(CONSTS))
+@patch("modules.smearing.smear_algorithm.create_polygon", return_value=["polygons"])
+@patch("modules.smearing.smear_algorithm.add_disruption")
+def test_smear_tile_detector_report(
+    mock_add_disruption, mock_create_polygon, mock_get_consts_smear
+):
+    detector = SmearTileDetector(MockTileReader(900, 850), "example_satellite_name", "index")
+    detector.sum_pixels, detector.sum_smeared_pixels = 10000, 3000
+    detector.smeared_squares = [[(0, 0), (100, 100)]]
+    detector.report("db", 1, "example/image_folder/file_name.tiff")
+    mock_create_polygon.assert_called_once_with([[(0, 0), (100, 100)]])
+    mock_add_disruption.assert_called_once_with("db", 1, "smear", ["polygons"])
+
+
 @patch("modules.smearing.smear_algorithm.compare_decay", return_value=1100)
 @patch("modules.smearing.smear_algorithm.is_smooth_region", return_value=True)
-def test_detect_smooth_image(
-    mock_is_smooth_region,
-    mock_compare_decay,
-    mock_imread,
-):
-    assert not detect_smeared_image("image_name/image_name_0_0.tif", 1200)
-    mock_imread.assert_called_once_with("image_name/image_name_0_0.tif", 0)
-    mock_compare_decay.assert_called_once_with("image")
-    mock_is_smooth_region.assert_called_once_with("image", 1200)
+def test_detect_smooth_image(mock_is_smooth_region, mock_compare_decay):
+    assert not detect_smeared_image("image", {"threshold_value": 1200})
+    mock_compare_decay.assert_not_called()
+    mock_is_smooth_region.assert_called_once_with("image", {"threshold_value": 1200})
 
 
-@patch("modules.smearing.smear_algorithm.cv2.imread", return_value="image")
 @patch("modules.smearing.smear_algorithm.compare_decay", return_value=None)
-@patch("modules.smearing.smear_algorithm.is_smooth_region")
-def test_detect_small_image(
-    mock_is_smooth_region,
-    mock_compare_decay,
-    mock_imread,
-):
-    assert not detect_smeared_image("image_name/image_name_0_0.tif", 1200)
-    mock_imread.assert_called_once_with("image_name/image_name_0_0.tif", 0)
+@patch("modules.smearing.smear_algorithm.is_smooth_region", return_value=False)
+def test_detect_small_image(mock_is_smooth_region, mock_compare_decay):
+    assert not detect_smeared_image("image", {"threshold_value": 1200})
     mock_compare_decay.assert_called_once_with("image")
-    mock_is_smooth_region.assert_not_called()
+    mock_is_smooth_region.assert_called_once_with("image", {"threshold_value": 1200})
 
 
-@patch("modules.smearing.smear_algorithm.cv2.imread", return_value="image")
 @patch("modules.smearing.smear_algorithm.compare_decay", return_value=1100)
 @patch("modules.smearing.smear_algorithm.is_smooth_region", return_value=False)
-def test_detect_smear_image(
-    mock_is_smooth_region,
-    mock_compare_decay,
-    mock_imread,
-):
-    assert detect_smeared_image(
-        "image_name/image_name_0_0.tif", {"threshold_value": 1200}
-    )
-    mock_imread.assert_called_once_with("image_name/image_name_0_0.tif", 0)
+def test_detect_smear_image(mock_is_smooth_region, mock_compare_decay):
+    assert detect_smeared_image("image", {"threshold_value": 1200})
     mock_compare_decay.assert_called_once_with("image")
     mock_is_smooth_region.assert_called_once_with("image", {"threshold_value": 1200})
 
 
-@patch("modules.smearing.smear_algorithm.cv2.imread", return_value="image")
 @patch("modules.smearing.smear_algorithm.compare_decay", return_value=1300)
 @patch("modules.smearing.smear_algorithm.is_smooth_region", return_value=False)
-def test_detect_not_smear_image(
-    mock_is_smooth_region,
-    mock_compare_decay,
-    mock_imread,
-):
-    assert not detect_smeared_image(
-        "image_name/image_name_0_0.tif", {"threshold_value": 1200}
-    )
-    mock_imread.assert_called_once_with("image_name/image_name_0_0.tif", 0)
+def test_detect_not_smear_image(mock_is_smooth_region, mock_compare_decay):
+    assert not detect_smeared_image("image", {"threshold_value": 1200})
     mock_compare_decay.assert_called_once_with("image")
     mock_is_smooth_region.assert_called_once_with("image", {"threshold_value": 1200})
+
+
+@patch("modules.smearing.smear_algorithm.compare_decay", return_value=1100)
+@patch("modules.smearing.smear_algorithm.is_smooth_region")
+@patch("modules.smearing.smear_algorithm.decide_if_smooth", return_value=False)
+def test_detect_smear_image_with_smoothness(
+    mock_decide_if_smooth, mock_is_smooth_region, mock_compare_decay
+):
+    consts = {"threshold_value": 1200}
+    assert detect_smeared_image("image", consts, (600, 40, 1.5))
+    mock_decide_if_smooth.assert_called_once_with(600, 40, 1.5, consts)
+    mock_is_smooth_region.assert_not_called()
+
+
+@patch(
+    "modules.smearing.smear_algorithm.get_consts_smear",
+    return_value=dict(CONSTS, engine="batched"),
+)
+@patch("modules.smearing.smear_algorithm.is_background_sub_image", return_value=False)
+@patch("modules.smearing.smear_algorithm.compare_decay_batch", return_value=[300.0, 700.0])
+@patch("modules.smearing.smear_algorithm.detect_smeared_image", return_value=False)
+def test_smear_tile_detector_check_tile_batches_full_sub_images(
+    mock_detect_smeared_image,
+    mock_compare_decay_batch,
+    mock_is_background_sub_image,
+    mock_get_consts_smear,
+):
+    detector = SmearTileDetector(MockTileReader(900, 850), "example_satellite_name", "index")
+    random_generator = np.random.default_rng(0)
+    gray_tile = random_generator.integers(0, 256, (150, 200), dtype=np.uint8)
+    detector.check_tile(700, 700, "color_tile", gray_tile)
+    assert mock_compare_decay_batch.call_args[0][0].shape == (2, 100, 100)
+    decays = [call_args[0][3] for call_args in mock_detect_smeared_image.call_args_list]
+    assert decays == [300.0, 700.0, None, None]
+
+
+
+@patch(
+    "modules.smearing.smear_algorithm.get_consts_smear",
+    return_value=dict(CONSTS, engine="batched", spectral_backend="rfft", parity_samples=1),
+)
+@patch("modules.smearing.smear_algorithm.compare_decay_batch", return_value=[300.0, 700.0])
+@patch("modules.smearing.smear_algorithm.decay_batch_function")
+def test_smear_tile_detector_falls_back_to_fft_when_parity_fails(
+    mock_decay_batch_function, mock_compare_decay_batch, mock_get_consts_smear
+):
+    mock_decay_batch_function.return_value.return_value = [100.0, 700.0]
+    detector = SmearTileDetector(MockTileReader(900, 850), "example_satellite_name", "index")
+    random_generator = np.random.default_rng(0)
+    image = random_generator.integers(0, 256, (100, 100), dtype=np.uint8)
+    decays = detector.batch_decays([(0, 0, image), (100, 0, image)])
+    mock_decay_batch_function.assert_called_once_with("rfft")
+    assert decays == {(0, 0): 300.0, (100, 0): 700.0}
+    assert detector.parity_check.failed
+    assert detector.spectral_backend == "fft"
+
+
+@patch(
+    "modules.smearing.smear_algorithm.get_consts_smear",
+    return_value=dict(CONSTS, engine="batched"),
+)
+@patch("modules.smearing.smear_algorithm.is_background_sub_image", return_value=False)
+@patch("modules.smearing.smear_algorithm.compare_decay_batch", return_value=[300.0])
+@patch("modules.smearing.smear_algorithm.compare_decay")
+def test_smear_tile_detector_check_tile_skips_the_ffts_of_smooth_sub_images(
+    mock_compare_decay,
+    mock_compare_decay_batch,
+    mock_is_background_sub_image,
+    mock_get_consts_smear,
+):
+    detector = SmearTileDetector(MockTileReader(900, 850), "example_satellite_name", "index")
+    random_generator = np.random.default_rng(0)
+    gray_tile = np.full((100, 200), 128, dtype=np.uint8)
+    gray_tile[:, 100:] = random_generator.integers(0, 256, (100, 100), dtype=np.uint8)
+    detector.check_tile(0, 0, "color_tile", gray_tile)
+    assert mock_compare_decay_batch.call_args[0][0].shape == (1, 100, 100)
+    mock_compare_decay.assert_not_called()
+    assert (detector.checked_sub_images, detector.avoided_decays) == (2, 1)
+    assert detector.smeared_squares == [[(100, 0), (200, 100)]]
+
+
+@patch("modules.smearing.smear_algorithm.smear_sub_image_algorithm", return_value=(10000, 10000))
+def test_arrange_to_send_smear_test_stops_once_settled(mock_smear_sub_image_algorithm):
+    consts = dict(CONSTS, decision="early_exit")
+    assert arrange_to_send_smear_test(
+        consts, MockTileReader(400, 400), [], "background_index"
+    ) == (40000, 40000)
+    assert mock_smear_sub_image_algorithm.call_count == 4
+
+
+def test_stops_early():
+    assert stops_early("early_exit")
+    assert not stops_early("full")
+    with pytest.raises(ValueError):
+        stops_early("sequential")
+
+
+@patch(
+    "modules.smearing.smear_algorithm.get_consts_smear",
+    return_value=dict(CONSTS, decision="early_exit"),
+)
+@patch("modules.smearing.smear_algorithm.is_background_sub_image", return_value=False)
+@patch("modules.smearing.smear_algorithm.detect_smeared_image", return_value=False)
+def test_smear_tile_detector_is_done_once_the_smear_cannot_pass_the_threshold(
+    mock_detect_smeared_image, mock_is_background_sub_image, mock_get_consts_smear
+):
+    detector = SmearTileDetector(MockTileReader(250, 200), "example_satellite_name", "index")
+    detector.check_tile(0, 0, "color_tile", np.zeros((100, 100), dtype=np.uint8))
+    assert not detector.done
+    detector.check_tile(100, 0, "color_tile", np.zeros((200, 150), dtype=np.uint8))
+    assert detector.done
+    assert (detector.sum_pixels, detector.sum_smeared_pixels) == (40000, 0)
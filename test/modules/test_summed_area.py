@@ -0,0 +1,26 @@
+import numpy as np
+
+from utils.images.summed_area import SummedAreaTable
+
+
+def mock_response():
+    random_generator = np.random.default_rng(0)
+    return random_generator.random((20, 30))
+
+
+def test_summed_area_table_window_statistics():
+    response = mock_response()
+    table = SummedAreaTable(response, response**2)
+    window = response[3:10, 5:17]
+    assert np.isclose(table.mean(5, 3, 12, 7), np.mean(window))
+    assert np.isclose(table.variance(5, 3, 12, 7), np.var(window))
+
+
+def test_summed_area_table_grid_of_windows():
+    response = mock_response()
+    table = SummedAreaTable(response)
+    y = np.arange(0, 20, 10).reshape(-1, 1)
+    x = np.arange(0, 30, 10).reshape(1, -1)
+    means = table.mean(x, y, 10, 10)
+    expected = response.reshape(2, 10, 3, 10).mean(axis=(1, 3))
+    np.testing.assert_allclose(means, expected)
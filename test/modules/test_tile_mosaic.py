@@ -0,0 +1,53 @@
+import cv2
+import numpy as np
+
+from utils.images.tile_mosaic import (
+    gradient_magnitude,
+    mosaic_tiles,
+    padded_tile_mosaic,
+    tile_statistics,
+)
+
+
+def mock_image():
+    random_generator = np.random.default_rng(0)
+    return random_generator.integers(0, 256, (25, 35), dtype=np.uint8)
+
+
+def test_padded_tile_mosaic_gives_every_tile_its_own_response():
+    image = mock_image()
+    mosaic = padded_tile_mosaic(image, 10)
+    assert mosaic.shape == (24, 36)
+    tiles = mosaic_tiles(cv2.Laplacian(mosaic, cv2.CV_64F), 10)
+    for row in range(2):
+        for col in range(3):
+            tile = image[row * 10 : (row + 1) * 10, col * 10 : (col + 1) * 10]
+            np.testing.assert_array_equal(tiles[row, :, col], cv2.Laplacian(tile, cv2.CV_64F))
+
+
+def test_padded_tile_mosaic_with_a_wider_border():
+    image = mock_image()
+    mosaic = padded_tile_mosaic(image, 10, 2)
+    assert mosaic.shape == (28, 42)
+    tiles = mosaic_tiles(cv2.Sobel(mosaic, cv2.CV_64F, 1, 0, ksize=5), 10, 2)
+    tile = image[10:20, 20:30]
+    np.testing.assert_array_equal(tiles[1, :, 2], cv2.Sobel(tile, cv2.CV_64F, 1, 0, ksize=5))
+
+
+def test_tile_statistics():
+    response = np.random.default_rng(1).random((24, 36))
+    maximum, average, variance = tile_statistics(response, 10)
+    tiles = mosaic_tiles(response, 10)
+    assert maximum.shape == (2, 3)
+    for row in range(2):
+        for col in range(3):
+            tile = tiles[row, :, col]
+            assert maximum[row, col] == np.max(tile)
+            assert np.isclose(average[row, col], np.mean(tile))
+            assert np.isclose(variance[row, col], np.var(tile))
+
+
+def test_gradient_magnitude():
+    gradient_x = np.array([3.0, 5.0])
+    gradient_y = np.array([4.0, 12.0])
+    np.testing.assert_array_equal(gradient_magnitude(gradient_x, gradient_y), [5, 13])
@@ -0,0 +1,155 @@
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from utils.images.tile_pipeline import (
+    TileDetector,
+    create_tile_detectors,
+    pipeline_tile_size,
+    report_tile_detectors,
+    run_tile_pipeline,
+    sub_tiles,
+)
+
+
+class MockTileReader:
+    def __init__(self, image, fail_after=None):
+        self.image = image
+        self.image_path = "image_path"
+        self.buffer = np.empty((0, 0, 3), dtype=image.dtype)
+        self.height, self.width = image.shape[:2]
+        self.block_shape = (1, self.width)
+        self.read_calls = []
+        self.fail_after = fail_after
+
+    def read(self, x, y, width_size, height_size, out=None):
+        if len(self.read_calls) == self.fail_after:
+            raise OSError("read failed")
+        self.read_calls.append((x, y, width_size, height_size))
+        tile = self.image[y : y + height_size, x : x + width_size]
+        if out is None:
+            return tile
+        out[:] = tile
+        return out
+
+
+class RecordingDetector(TileDetector):
+    def __init__(self, tile_size, stop_after=None, fail_after=None):
+        super().__init__()
+        self.tile_size = tile_size
+        self.stop_after = stop_after
+        self.fail_after = fail_after
+        self.tiles = []
+
+    def check_tile(self, x, y, color_tile, gray_tile):
+        if self.fail_after is not None and len(self.tiles) == self.fail_after:
+            raise ValueError("check failed")
+        assert gray_tile.shape == color_tile.shape[:2]
+        self.tiles.append((x, y, gray_tile.shape))
+        if self.stop_after is not None and len(self.tiles) == self.stop_after:
+            self.done = True
+
+    def report(self, db, image_id, image_path):
+        pass
+
+
+def mock_image():
+    random_generator = np.random.default_rng(0)
+    return random_generator.integers(0, 256, (50, 70, 3), dtype=np.uint8)
+
+
+def test_tile_detector_requires_check_tile_and_report():
+    with pytest.raises(TypeError):
+        TileDetector()
+
+
+def test_pipeline_tile_size():
+    assert pipeline_tile_size([RecordingDetector(150), RecordingDetector(8)]) == 600
+    assert pipeline_tile_size([RecordingDetector(10), RecordingDetector(5)]) == 10
+
+
+def test_sub_tiles():
+    tile = np.arange(5 * 7).reshape(5, 7)
+    squares = list(sub_tiles(10, 20, tile, 3))
+    assert [(x, y) for x, y, _ in squares] == [
+        (10, 20),
+        (13, 20),
+        (16, 20),
+        (10, 23),
+        (13, 23),
+        (16, 23),
+    ]
+    np.testing.assert_array_equal(squares[5][2], tile[3:5, 6:7])
+
+
+@pytest.mark.parametrize("prefetch_depth", [0, 2])
+def test_run_tile_pipeline_reads_every_tile_once(prefetch_depth):
+    tile_reader = MockTileReader(mock_image())
+    first_detector = RecordingDetector(10)
+    second_detector = RecordingDetector(15)
+    run_tile_pipeline(tile_reader, [first_detector, second_detector], prefetch_depth)
+    assert tile_reader.read_calls == [
+        (0, 0, 30, 30),
+        (30, 0, 30, 30),
+        (60, 0, 10, 30),
+        (0, 30, 30, 20),
+        (30, 30, 30, 20),
+        (60, 30, 10, 20),
+    ]
+    assert first_detector.tiles == second_detector.tiles
+    assert first_detector.tiles[-1] == (60, 30, (20, 10))
+
+
+def test_run_tile_pipeline_stops_when_every_detector_is_done():
+    tile_reader = MockTileReader(mock_image())
+    first_detector = RecordingDetector(30, stop_after=1)
+    second_detector = RecordingDetector(30, stop_after=2)
+    run_tile_pipeline(tile_reader, [first_detector, second_detector])
+    assert len(first_detector.tiles) == 1
+    assert len(second_detector.tiles) == 2
+    assert len(tile_reader.read_calls) == 2
+
+
+def test_run_tile_pipeline_isolates_a_failing_detector():
+    tile_reader = MockTileReader(mock_image())
+    failing_detector = RecordingDetector(30, fail_after=1)
+    detector = RecordingDetector(30)
+    run_tile_pipeline(tile_reader, [failing_detector, detector])
+    assert failing_detector.failed
+    assert len(failing_detector.tiles) == 1
+    assert len(detector.tiles) == 6
+
+
+@pytest.mark.parametrize("prefetch_depth", [0, 2])
+def test_run_tile_pipeline_keeps_finished_detectors_when_a_read_fails(prefetch_depth):
+    tile_reader = MockTileReader(mock_image(), fail_after=2)
+    finished_detector = RecordingDetector(30, stop_after=1)
+    detector = RecordingDetector(30)
+    run_tile_pipeline(tile_reader, [finished_detector, detector], prefetch_depth)
+    assert finished_detector.done and not finished_detector.failed
+    assert detector.failed
+    assert len(detector.tiles) == 2
+
+
+def test_create_tile_detectors_skips_a_failing_detector():
+    def failing_factory():
+        raise ValueError("no consts")
+
+    detector = RecordingDetector(30)
+    assert create_tile_detectors("image_path", [failing_factory, lambda: detector]) == [detector]
+
+
+def test_report_tile_detectors_skips_failed_detectors():
+    detector = MagicMock(failed=False)
+    failed_detector = MagicMock(failed=True)
+    report_tile_detectors("db", 1, "image_path", [detector, failed_detector])
+    detector.report.assert_called_once_with("db", 1, "image_path")
+    failed_detector.report.assert_not_called()
+
+
+def test_report_tile_detectors_isolates_a_failing_report():
+    failing_detector = MagicMock(failed=False)
+    failing_detector.report.side_effect = ValueError("report failed")
+    detector = MagicMock(failed=False)
+    report_tile_detectors("db", 1, "image_path", [failing_detector, detector])
+    detector.report.assert_called_once_with("db", 1, "image_path")
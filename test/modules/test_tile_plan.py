@@ -0,0 +1,50 @@
+import pytest
+
+from utils.images.tile_plan import (
+    detector_tile_size,
+    plan_tile_groups,
+    plan_tiles,
+    snap_tile_size,
+)
+
+
+def test_plan_tiles_is_row_major_inside_one_block():
+    assert list(plan_tiles(250, 150, 100, (256, 256))) == [
+        (0, 0),
+        (100, 0),
+        (200, 0),
+        (0, 100),
+        (100, 100),
+        (200, 100),
+    ]
+
+
+def test_plan_tile_groups_follows_block_order():
+    assert list(plan_tile_groups(400, 400, 100, (200, 200))) == [
+        [(0, 0), (100, 0), (0, 100), (100, 100)],
+        [(200, 0), (300, 0), (200, 100), (300, 100)],
+        [(0, 200), (100, 200), (0, 300), (100, 300)],
+        [(200, 200), (300, 200), (200, 300), (300, 300)],
+    ]
+
+
+def test_plan_tiles_on_striped_image_visits_every_tile_once():
+    tiles = list(plan_tiles(1000, 700, 300, (1, 1000)))
+    assert sorted(tiles) == sorted(
+        (x, y) for x in range(0, 1000, 300) for y in range(0, 700, 300)
+    )
+    assert tiles == sorted(tiles, key=lambda tile: (tile[1], tile[0]))
+
+
+@pytest.mark.parametrize(
+    "tile_size, block_size, expected",
+    [(300, 256, 256), (400, 256, 512), (512, 512, 512), (100, 256, 128), (60, 256, 64)],
+)
+def test_snap_tile_size(tile_size, block_size, expected):
+    assert snap_tile_size(tile_size, block_size) == expected
+
+
+def test_detector_tile_size():
+    assert detector_tile_size(300, False, (256, 256)) == 300
+    assert detector_tile_size(300, True, (1, 8000)) == 300
+    assert detector_tile_size(300, True, (256, 256)) == 256
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from utils.images.manage_sub_image import TileReader
+from utils.images.tile_prefetcher import PrefetchStats, TilePrefetcher
+
+
+@pytest.fixture
+def image_path(write_image):
+    random_generator = np.random.default_rng(0)
+    bands = random_generator.integers(0, 256, (3, 50, 70), dtype=np.uint8)
+    return write_image(bands), bands
+
+
+WINDOWS = [
+    (x, y, min(20, 70 - x), min(20, 50 - y)) for y in range(0, 50, 20) for x in range(0, 70, 20)
+]
+
+
+@pytest.mark.parametrize("depth", [0, 1, 3])
+def test_tile_prefetcher_yields_every_window_in_order(image_path, depth):
+    path, bands = image_path
+    with TileReader(path) as tile_reader:
+        with TilePrefetcher(tile_reader, WINDOWS, depth) as tiles:
+            for (x, y, tile), (window_x, window_y, width, height) in zip(tiles, WINDOWS):
+                assert (x, y) == (window_x, window_y)
+                np.testing.assert_array_equal(
+                    tile, bands[:, y : y + height, x : x + width].transpose(1, 2, 0)
+                )
+    assert tiles.stats.tiles == len(WINDOWS)
+    assert tiles.stats.max_queue_depth <= depth
+
+
+def test_tile_prefetcher_stops_when_closed_early(image_path):
+    path, _ = image_path
+    with TileReader(path) as tile_reader:
+        with TilePrefetcher(tile_reader, WINDOWS, 1) as tiles:
+            next(iter(tiles))
+        assert tiles.thread is None
+    assert tiles.stats.tiles == 1
+
+
+def test_tile_prefetcher_raises_read_errors(image_path):
+    path, _ = image_path
+    tile_reader = TileReader(path)
+    with pytest.raises(Exception, match="An error occurred when extracting sub-image array"):
+        with TilePrefetcher(tile_reader, WINDOWS, 2) as tiles:
+            list(tiles)
+
+
+def test_prefetch_stats():
+    stats = PrefetchStats(tiles=4, queue_depth_total=6, max_queue_depth=2)
+    assert stats.mean_queue_depth == 1.5
+    assert "max_queue_depth=2" in str(stats)
+    assert PrefetchStats().mean_queue_depth == 0